@@ -0,0 +1,248 @@
+# aggregates.py
+# This file contains the materialized dashboard aggregates for the Ticket Apprentice application
+# Functionality includes:
+# - Summary tables for per-user ticket count/spend and per-event revenue
+# - Incremental maintenance from the ticket insert, update and delete paths
+# - A full rebuild (run `python aggregates.py --rebuild`)
+#
+# Only purchased tickets (purchased_by IS NOT NULL) count towards the aggregates,
+# matching the WHERE clause of the original dashboard queries.
+
+import argparse
+
+from db_pool import get_connection
+
+
+# Summary tables, also created by populate_tables.sql
+CREATE_AGGREGATE_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS UserTicketStats (
+        user_id INT,
+        ticket_count INT NOT NULL,
+        total_spent DOUBLE NOT NULL,
+        PRIMARY KEY (user_id),
+        INDEX (ticket_count),
+        INDEX (total_spent)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS EventRevenueStats (
+        event_name VARCHAR(100),
+        tickets_sold INT NOT NULL,
+        total_revenue DOUBLE NOT NULL,
+        PRIMARY KEY (event_name),
+        INDEX (total_revenue)
+    )
+    ''',
+]
+
+
+def _add_purchase(cursor, event_name, purchased_by, price, sign):
+    # sign is 1 for a ticket entering the aggregates and -1 for one leaving them
+    cursor.execute(
+        "INSERT INTO UserTicketStats (user_id, ticket_count, total_spent) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE ticket_count = ticket_count + VALUES(ticket_count), total_spent = total_spent + VALUES(total_spent)",
+        (purchased_by, sign, sign * price))
+    cursor.execute(
+        "INSERT INTO EventRevenueStats (event_name, tickets_sold, total_revenue) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE tickets_sold = tickets_sold + VALUES(tickets_sold), total_revenue = total_revenue + VALUES(total_revenue)",
+        (event_name, sign, sign * price))
+
+    if sign < 0:
+        # Drop rows that no longer have any purchased tickets behind them
+        cursor.execute("DELETE FROM UserTicketStats WHERE user_id = %s AND ticket_count <= 0", (purchased_by,))
+        cursor.execute("DELETE FROM EventRevenueStats WHERE event_name = %s AND tickets_sold <= 0", (event_name,))
+
+
+def record_ticket_change(cursor, old_ticket, new_ticket):
+    """
+    Apply one ticket insert, update or delete to the summary tables.
+    Call with the same cursor, before the commit of the ticket write, so both land in one transaction.
+
+    Args:
+        cursor: Cursor of the connection performing the ticket write.
+        old_ticket (tuple): (event_name, purchased_by, price) before the write, or None for an insert.
+        new_ticket (tuple): (event_name, purchased_by, price) after the write, or None for a delete.
+
+    Returns:
+        None
+    """
+    if old_ticket is not None and new_ticket is not None:
+        old_event, old_user, old_price = old_ticket
+        new_event, new_user, new_price = new_ticket
+        # Nothing the aggregates care about changed
+        if old_event == new_event and old_user == new_user and float(old_price) == float(new_price):
+            return
+
+    if old_ticket is not None and old_ticket[1] is not None:
+        event_name, purchased_by, price = old_ticket
+        _add_purchase(cursor, event_name, purchased_by, float(price), -1)
+
+    if new_ticket is not None and new_ticket[1] is not None:
+        event_name, purchased_by, price = new_ticket
+        _add_purchase(cursor, event_name, purchased_by, float(price), 1)
+
+
+def record_tickets_inserted(cursor, tickets):
+    """
+    Add many new tickets to the summary tables with one batched upsert per table.
+    Call with the same cursor, before the commit of the ticket inserts.
+
+    Args:
+        cursor: Cursor of the connection inserting the tickets.
+        tickets (iterable): (event_name, purchased_by, price) tuples; unsold tickets are skipped.
+
+    Returns:
+        None
+    """
+    by_user = {}
+    by_event = {}
+    for event_name, purchased_by, price in tickets:
+        if purchased_by is None:
+            continue
+        count, total = by_user.get(purchased_by, (0, 0.0))
+        by_user[purchased_by] = (count + 1, total + float(price))
+        count, total = by_event.get(event_name, (0, 0.0))
+        by_event[event_name] = (count + 1, total + float(price))
+
+    if by_user:
+        cursor.executemany(
+            "INSERT INTO UserTicketStats (user_id, ticket_count, total_spent) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE ticket_count = ticket_count + VALUES(ticket_count), total_spent = total_spent + VALUES(total_spent)",
+            [(user_id, count, total) for user_id, (count, total) in by_user.items()])
+    if by_event:
+        cursor.executemany(
+            "INSERT INTO EventRevenueStats (event_name, tickets_sold, total_revenue) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE tickets_sold = tickets_sold + VALUES(tickets_sold), total_revenue = total_revenue + VALUES(total_revenue)",
+            [(event_name, count, total) for event_name, (count, total) in by_event.items()])
+
+
+def record_event_tickets_deleted(cursor, event_name):
+    """
+    Remove every ticket of an event from the summary tables.
+    Call before the event's tickets are deleted, in the same transaction.
+
+    Args:
+        cursor: Cursor of the connection deleting the event.
+        event_name (str): The event whose tickets are about to be deleted.
+
+    Returns:
+        None
+    """
+    cursor.execute('''
+        UPDATE UserTicketStats s
+        JOIN (
+            SELECT purchased_by, COUNT(*) AS ticket_count, SUM(price) AS total_spent
+            FROM Tickets
+            WHERE event_name = %s AND purchased_by IS NOT NULL
+            GROUP BY purchased_by
+        ) AS removed ON removed.purchased_by = s.user_id
+        SET s.ticket_count = s.ticket_count - removed.ticket_count,
+            s.total_spent = s.total_spent - removed.total_spent
+    ''', (event_name,))
+    cursor.execute("DELETE FROM UserTicketStats WHERE ticket_count <= 0")
+    cursor.execute("DELETE FROM EventRevenueStats WHERE event_name = %s", (event_name,))
+
+
+def record_tickets_deleted(cursor, condition, values):
+    """
+    Remove the tickets matching a condition from the summary tables, with one grouped update per table.
+    Call before those tickets are deleted, in the same transaction.
+
+    Args:
+        cursor: Cursor of the connection deleting the tickets.
+        condition (str): SQL condition on Tickets selecting the tickets (ex. "event_name IN (%s, %s)").
+        values (tuple): Parameters of the condition.
+
+    Returns:
+        None
+    """
+    for table, key, count, total, group_by in (('UserTicketStats', 'user_id', 'ticket_count', 'total_spent', 'purchased_by'),
+                                               ('EventRevenueStats', 'event_name', 'tickets_sold', 'total_revenue', 'event_name')):
+        cursor.execute(f'''
+            UPDATE {table} s
+            JOIN (
+                SELECT {group_by} AS group_key, COUNT(*) AS removed_count, SUM(price) AS removed_total
+                FROM Tickets
+                WHERE ({condition}) AND purchased_by IS NOT NULL
+                GROUP BY {group_by}
+            ) AS removed ON removed.group_key = s.{key}
+            SET s.{count} = s.{count} - removed.removed_count,
+                s.{total} = s.{total} - removed.removed_total
+        ''', tuple(values))
+        cursor.execute(f"DELETE FROM {table} WHERE {count} <= 0")
+
+
+def rebuild_aggregates(conn):
+    """
+    Recompute both summary tables from Tickets in a single transaction.
+
+    Args:
+        conn: Database connection.
+
+    Returns:
+        tuple: (number of user rows, number of event rows)
+    """
+    cursor = conn.cursor()
+    try:
+        for statement in CREATE_AGGREGATE_TABLES:
+            cursor.execute(statement)
+
+        # One grouped pass over the purchased tickets (a covering read of idx_tickets_event_purchased_by)
+        # gives per (event, buyer) totals; both summary tables are rolled up from that much smaller set
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS EventUserTotals")
+        cursor.execute('''
+            CREATE TEMPORARY TABLE EventUserTotals AS
+            SELECT event_name, purchased_by, COUNT(*) AS ticket_count, SUM(price) AS total_price
+            FROM Tickets
+            WHERE purchased_by IS NOT NULL
+            GROUP BY event_name, purchased_by
+        ''')
+
+        cursor.execute("DELETE FROM UserTicketStats")
+        cursor.execute('''
+            INSERT INTO UserTicketStats (user_id, ticket_count, total_spent)
+            SELECT purchased_by, SUM(ticket_count), SUM(total_price)
+            FROM EventUserTotals
+            GROUP BY purchased_by
+        ''')
+        user_rows = cursor.rowcount
+
+        cursor.execute("DELETE FROM EventRevenueStats")
+        cursor.execute('''
+            INSERT INTO EventRevenueStats (event_name, tickets_sold, total_revenue)
+            SELECT event_name, SUM(ticket_count), SUM(total_price)
+            FROM EventUserTotals
+            GROUP BY event_name
+        ''')
+        event_rows = cursor.rowcount
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS EventUserTotals")
+
+        conn.commit()
+        return user_rows, event_rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the Admin Dashboard summary tables.")
+    parser.add_argument('--rebuild', action='store_true', help="recompute the summary tables from Tickets")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    conn = get_connection()
+    try:
+        user_rows, event_rows = rebuild_aggregates(conn)
+        print(f"Rebuilt UserTicketStats ({user_rows} rows) and EventRevenueStats ({event_rows} rows)")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# autocomplete.py
+# This file contains the autocomplete fields of the Ticket Apprentice entry forms
+# Functionality includes:
+# - A combobox for a key column (event, venue, group, stage name or user ID) that suggests
+#   matching keys as the user types
+# - Inline completion of the first match, with the completed tail selected so typing on replaces it
+#
+# Suggestions come from the prefix index of the reference key cache (see key_cache.py), so no
+# keystroke waits on the database. When a table is not cached the field behaves like a plain Entry.
+
+import tkinter.ttk as ttk
+
+from key_cache import reference_keys, DEFAULT_SUGGESTIONS
+
+
+# Keys that move around the field or the list rather than change the text
+NAVIGATION_KEYS = {'Up', 'Down', 'Left', 'Right', 'Home', 'End', 'Return', 'KP_Enter', 'Tab', 'Escape',
+                   'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R'}
+
+# Keys after which the text is not completed again (the user is removing the completion)
+ERASE_KEYS = {'BackSpace', 'Delete'}
+
+
+class KeyCombobox(ttk.Combobox):
+    """
+    Combobox for a key of one of the cached tables. Its drop-down list holds the keys starting
+    with the typed text; with complete=True the first match is also filled in inline.
+
+    Use it wherever an Entry naming an existing row was used; get() and destroy() work the same.
+    """
+
+    def __init__(self, master, table, complete=True, limit=DEFAULT_SUGGESTIONS, cache=reference_keys, **kwargs):
+        """
+        Args:
+            master: Parent widget (the form's tab).
+            table (str): Table whose keys are suggested, one of key_cache.REFERENCE_KEYS.
+            complete (bool): Fill in the first match inline as the user types.
+            limit (int): Most suggestions in the drop-down list.
+            cache (ReferenceKeyCache): Where the suggestions come from.
+        """
+        super().__init__(master, **kwargs)
+        self.table = table
+        self.complete = complete
+        self.limit = limit
+        self.cache = cache
+        self.bind('<KeyRelease>', self._on_key_release, add='+')
+
+    def _on_key_release(self, event):
+        if event.keysym in NAVIGATION_KEYS:
+            return
+        text = self.get()
+        cursor = self.index('insert')
+        typed = text[:cursor]
+        suggestions = self.cache.suggest(self.table, typed, self.limit) if typed.strip() else []
+        self['values'] = suggestions
+
+        # Only complete at the end of the text, never after the user erased part of it
+        if not (self.complete and suggestions and event.keysym not in ERASE_KEYS and cursor == len(text)):
+            return
+        first = suggestions[0]
+        if len(first) > len(typed):
+            self.delete(0, 'end')
+            self.insert(0, first)
+            self.icursor(len(typed))
+            self.select_range(len(typed), 'end')
@@ -0,0 +1,526 @@
+# benchmark.py
+# This file contains the headless benchmark suite for the Ticket Apprentice data-access paths
+# Functionality includes:
+# - Replaying the statements of every ticket_utils.py path (inserts, updates, deletes, searches,
+#   Search All paging, the dashboard reports) without opening a window
+# - Seeding the database with generate_data.py at several dataset sizes
+# - Throughput, p50/p95/p99 latency and round trips per operation
+# - Saving the results as JSON and comparing them with an earlier run
+#
+# Usage: python benchmark.py --sizes 10000,100000,1000000 --replace --out results.json
+#        python benchmark.py --iterations 200 --compare results.json
+#
+# Round trips are read from the server's Questions counter, so run it against a local
+# database nobody else is using. --sizes wipes and reloads every table.
+
+import argparse
+import datetime
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+
+from db_pool import get_connection, pool_stats, get_pool
+from generate_data import DEFAULT_CONFIG, SyntheticData, clear_tables, load_database
+from bulk_tickets import generate_tickets
+from dashboard import dashboard_query
+from deletes import load_delete_preview, delete_previewed
+from writes import (insert_lookups, update_lookups, insert_entry, insert_ticket_entry, load_entry, update_entry,
+                    update_ticket_entry)
+from pagination import KeysetPager, DEFAULT_PAGE_SIZE
+from queries import build_ticket_search_query, city_list_query, ticket_info_query
+from streaming import QueryStream
+from ticket_ids import ticket_ids
+from ticket_index import configure_ticket_index, ticket_index, tickets_changed
+from key_cache import configure_reference_keys, reference_keys
+from validation import keys_exist
+
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_SEED = 7
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class RoundTripCounter:
+    """
+    Counts statements with the server's global Questions counter, read on a connection of its own.
+    The read itself is a statement, so the cost of one read is measured once and subtracted.
+    """
+
+    def __init__(self):
+        self._conn = get_connection()
+        self._cursor = self._conn.cursor()
+        first = self.read()
+        self._overhead = self.read() - first
+
+    def read(self):
+        self._cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        return int(self._cursor.fetchone()[1])
+
+    def since(self, start):
+        return max(0, self.read() - start - self._overhead)
+
+    def close(self):
+        self._cursor.close()
+        self._conn.close()
+
+
+class OperationStats:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.statements = 0
+        self.checkouts = 0
+        self.rows = 0
+
+    def summary(self, validate_on_checkout):
+        count = len(self.latencies)
+        ordered = sorted(self.latencies)
+        total = sum(ordered)
+        # A validated checkout pings the server, which is a round trip the Questions counter does not see
+        round_trips = self.statements + (self.checkouts if validate_on_checkout else 0)
+        return {
+            'iterations': count,
+            'ops_per_sec': count / total if total else None,
+            'mean_ms': total / count * 1000 if count else None,
+            'p50_ms': percentile(ordered, 0.50) * 1000 if count else None,
+            'p95_ms': percentile(ordered, 0.95) * 1000 if count else None,
+            'p99_ms': percentile(ordered, 0.99) * 1000 if count else None,
+            'round_trips_per_op': round_trips / count if count else None,
+            'checkouts_per_op': self.checkouts / count if count else None,
+            'rows_per_op': self.rows / count if count else None,
+        }
+
+
+class BenchmarkRun:
+    """
+    Times operations one at a time and attributes statements and pool checkouts to each.
+    """
+
+    def __init__(self):
+        self.counter = RoundTripCounter()
+        self.operations = {}
+
+    def measure(self, name, operation, *args):
+        """
+        Run operation(*args) once and record it under name.
+
+        Returns:
+            The operation's result. Read operations return the number of rows (an int) or the rows (a list).
+        """
+        stats = self.operations.setdefault(name, OperationStats(name))
+        checkouts = pool_stats()['checkouts']
+        questions = self.counter.read()
+        started = time.perf_counter()
+        result = operation(*args)
+        stats.latencies.append(time.perf_counter() - started)
+        stats.statements += self.counter.since(questions)
+        stats.checkouts += pool_stats()['checkouts'] - checkouts
+        if isinstance(result, list):
+            stats.rows += len(result)
+        elif isinstance(result, int) and not isinstance(result, bool):
+            stats.rows += result
+        return result
+
+    def results(self):
+        validate = get_pool().validate_on_checkout
+        return {name: stats.summary(validate) for name, stats in self.operations.items()}
+
+    def close(self):
+        self.counter.close()
+
+
+# Read paths
+
+def fetch_rows(query, values=()):
+    # ticket_utils.fetch_query_results (dashboard reports, ticket info)
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, values)
+        rows = cursor.fetchall()
+        cursor.close()
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def stream_rows(query, values=()):
+    # ticket_utils.run_ticket_search without the index (streaming.stream_into_tree)
+    rows = 0
+    with QueryStream(query, values) as stream:
+        for batch in stream.batches():
+            rows += len(batch)
+    return rows
+
+
+def search_index(filters):
+    # ticket_utils.run_ticket_search with [ticket_index] enabled
+    return sum(len(batch) for batch in ticket_index.search_batches(filters, 1000))
+
+
+def page_through(pager, pages):
+    # ticket_utils.search_all_entries followed by search_all_next_page
+    page = pager.first_page()
+    pager.show(page)
+    rows = len(page.rows)
+    for _ in range(pages - 1):
+        page = pager.next_page()
+        if page is None:
+            break
+        pager.show(page)
+        rows += len(page.rows)
+    return rows
+
+
+# Write paths, through the same functions as the insert_pick_table, update_pick_table and delete_pick_table forms
+
+def insert_row(table, row):
+    """
+    Run an insert form's existence checks, then its insert, then commit, on one pooled connection.
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        keys_exist(cursor, insert_lookups(table, row))
+        insert_entry(cursor, table, tuple(row.values()))
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def update_row(table, keys, row):
+    """
+    Run an update form's read of the shown row, its existence checks and its update, then commit.
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        load_entry(cursor, table, keys)
+        keys_exist(cursor, update_lookups(table, row))
+        update_entry(cursor, table, keys, tuple(row.values()))
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def insert_ticket(event_name, purchased_by, price, created):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        keys_exist(cursor, insert_lookups('Tickets', {'event_name': event_name, 'purchased_by': purchased_by}))
+        new_id = insert_ticket_entry(cursor, event_name, purchased_by, price)
+        conn.commit()
+        cursor.close()
+        tickets_changed(event_name)
+        created.append(new_id)
+    finally:
+        conn.close()
+
+
+def update_ticket(ticket_id, event_name, purchased_by, price):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        ticket_info = load_entry(cursor, 'Tickets', (ticket_id, event_name))
+        keys_exist(cursor, update_lookups('Tickets', {'purchased_by': purchased_by}))
+        update_ticket_entry(cursor, ticket_info, purchased_by, price)
+        conn.commit()
+        cursor.close()
+        tickets_changed(event_name)
+    finally:
+        conn.close()
+
+
+def delete_entity(table, keys):
+    # Same path as the Delete Entries tab: one preview query, then one DELETE
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        preview = load_delete_preview(cursor, table, keys)
+        delete_previewed(cursor, preview)
+        conn.commit()
+        cursor.close()
+        if table in ('Tickets', 'Events'):
+            tickets_changed(keys[-1] if table == 'Tickets' else keys[0])
+    finally:
+        conn.close()
+
+
+def bulk_generate(event_name, count):
+    conn = get_connection()
+    try:
+        return generate_tickets(conn, event_name, [(100.0, None)], count)
+    finally:
+        conn.close()
+
+
+def write_lifecycle(run, tag, user_id, bulk_count):
+    """
+    Create, update and delete one row of every table through the same functions as the UI forms,
+    leaving the database as it was apart from the event's TicketSequences row.
+    """
+    venue, event, group, stage = f"bench venue {tag}", f"bench event {tag}", f"bench group {tag}", f"bench stage {tag}"
+
+    # Rows in the column order of bulk_import.TABLE_SPECS, as the forms pass them
+    run.measure('insert_venue', insert_row, 'Venue', {'venue_name': venue, 'city': 'Benchmark City', 'capacity': 100000})
+    run.measure('insert_event', insert_row, 'Events',
+                {'event_name': event, 'venue_name': venue, 'event_date': '2030-01-01', 'start_time': '20:00:00'})
+    run.measure('insert_user', insert_row, 'Users',
+                {'id': user_id, 'user_name': f"bench user {tag}", 'phone_number': 5550000000, 'date_of_birth': '1990-01-01'})
+    run.measure('insert_group', insert_row, 'Groups', {'group_name': group, 'founded': '2000-01-01'})
+    run.measure('insert_individual_performer', insert_row, 'IndividualPerformers',
+                {'stage_name': stage, 'individual_name': 'Bench', 'age': 30})
+    run.measure('insert_membership', insert_row, 'Memberships', {'stage_name': stage, 'group_name': group})
+    run.measure('insert_performance', insert_row, 'PerformanceList', {'event_name': event, 'group_name': group})
+
+    created = []
+    run.measure('insert_ticket', insert_ticket, event, user_id, 50.0, created)
+    ticket_id = created[0]
+    if bulk_count:
+        run.measure('bulk_generate_tickets', bulk_generate, event, bulk_count)
+
+    # Rows in the column order of writes.UPDATE_COLUMNS
+    run.measure('update_user_info', update_row, 'Users', (user_id,),
+                {'user_name': f"bench user {tag}", 'phone_number': 5550000001, 'date_of_birth': '1990-01-02'})
+    run.measure('update_venue_info', update_row, 'Venue', (venue,), {'city': 'Benchmark City', 'capacity': 90000})
+    run.measure('update_event', update_row, 'Events', (event,),
+                {'venue_name': venue, 'event_date': '2030-01-02', 'start_time': '21:00:00'})
+    run.measure('update_group', update_row, 'Groups', (group,), {'founded': '2001-01-01'})
+    run.measure('update_individual_performer', update_row, 'IndividualPerformers', (stage,),
+                {'individual_name': 'Bench', 'age': 31})
+    run.measure('update_ticket', update_ticket, ticket_id, event, user_id, 75.0)
+
+    run.measure('delete_ticket', delete_entity, 'Tickets', (ticket_id, event))
+    run.measure('delete_performance', delete_entity, 'PerformanceList', (event, group))
+    run.measure('delete_membership', delete_entity, 'Memberships', (stage, group))
+    run.measure('delete_individual_performer', delete_entity, 'IndividualPerformers', (stage,))
+    run.measure('delete_group', delete_entity, 'Groups', (group,))
+    run.measure('delete_event', delete_entity, 'Events', (event,))
+    run.measure('delete_user', delete_entity, 'Users', (user_id,))
+    run.measure('delete_venue', delete_entity, 'Venue', (venue,))
+
+
+def search_filters(rng, cities):
+    """
+    A mix of Search Tickets filters: price bands, unsold only, one or two cities.
+    """
+    low = rng.choice([20, 50, 100, 200])
+    chosen = rng.sample(cities, min(len(cities), rng.choice([1, 2]))) if cities else []
+    return rng.choice([
+        (low, low + 10, False, []),
+        (low, low + 50, True, []),
+        (0, None, True, chosen),
+        (low, None, False, chosen),
+    ])
+
+
+def run_benchmark(iterations, rng, use_index=False, pages=10, bulk_count=1000):
+    """
+    Drive every data-access path against the current database contents.
+
+    Args:
+        iterations (int): Repetitions of every operation.
+        rng (random.Random): Source of the filters and ticket IDs, for repeatable runs.
+        use_index (bool): Also time Search Tickets through the in-memory ticket index.
+        pages (int): Search All pages read per paging operation.
+        bulk_count (int): Tickets per bulk_generate_tickets call, 0 to skip it.
+
+    Returns:
+        dict: Operation name -> summary (see OperationStats.summary).
+    """
+    run = BenchmarkRun()
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Users")
+            next_user_id = cursor.fetchone()[0] + 1
+            cursor.execute("SELECT COALESCE(MAX(id), 1) FROM Tickets")
+            max_ticket_id = cursor.fetchone()[0]
+            cursor.close()
+        finally:
+            conn.close()
+
+        # refresh_tab5 fills the city listbox
+        cities = [row[0] for row in run.measure('city_list', _fetch_all, city_list_query)]
+
+        if use_index:
+            configure_ticket_index(enabled=True)
+            tickets_changed()
+            run.measure('ticket_index_build', lambda: len(ticket_index.refresh()))
+
+        # The autocomplete fields read the prefix index of the reference key cache
+        configure_reference_keys(enabled=True)
+        run.measure('reference_keys_load', lambda: len(reference_keys.refresh(force=True)))
+        prefix_letters = 'abcdefghijklmnopqrstuvwxyz'
+
+        tag_base = datetime.datetime.now().strftime('%H%M%S')
+        for i in range(iterations):
+            run.measure('dashboard_all_reports', fetch_rows, dashboard_query())
+
+            filters = search_filters(rng, cities)
+            run.measure('search_tickets', stream_rows, *build_ticket_search_query(*filters))
+            if use_index:
+                run.measure('search_tickets_index', search_index, filters)
+            run.measure('show_ticket_info', fetch_rows, ticket_info_query, (rng.randint(1, max_ticket_id),))
+            run.measure('autocomplete_event', reference_keys.suggest, 'Events', rng.choice(prefix_letters) + rng.choice(prefix_letters))
+            run.measure('autocomplete_user', reference_keys.suggest, 'Users', str(rng.randint(1, 99)))
+
+            run.measure('search_all_tickets', page_through, KeysetPager('Tickets', DEFAULT_PAGE_SIZE), pages)
+            run.measure('search_all_users', page_through, KeysetPager('Users', DEFAULT_PAGE_SIZE), pages)
+
+            write_lifecycle(run, f"{tag_base}-{i}", next_user_id + i, bulk_count)
+
+        return run.results()
+    finally:
+        run.close()
+        configure_reference_keys(enabled=False)
+        if use_index:
+            configure_ticket_index(enabled=False)
+
+
+def _fetch_all(query, values=()):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, values)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+    finally:
+        conn.close()
+
+
+def scaled_config(tickets, seed=DEFAULT_CONFIG.seed):
+    """
+    generate_data.py settings for a dataset of about this many tickets, scaling the other
+    tables with it in the proportions of the default configuration.
+    """
+    ratio = tickets / DEFAULT_CONFIG.tickets
+    return DEFAULT_CONFIG._replace(
+        seed=seed,
+        tickets=tickets,
+        users=max(100, round(DEFAULT_CONFIG.users * ratio)),
+        venues=max(10, round(DEFAULT_CONFIG.venues * ratio)),
+        groups=max(20, round(DEFAULT_CONFIG.groups * ratio)),
+        performers=max(50, round(DEFAULT_CONFIG.performers * ratio)),
+        events=max(20, round(DEFAULT_CONFIG.events * ratio)),
+    )
+
+
+def seed_database(config, progress=None):
+    """
+    Replace the contents of every table with synthetic data.
+
+    Returns:
+        dict: Table name -> rows inserted.
+    """
+    # Planned first: a size that does not fit the venues fails before anything is deleted
+    data = SyntheticData(config)
+    conn = get_connection()
+    try:
+        clear_tables(conn)
+        counts = load_database(data, conn, progress=progress)
+    finally:
+        conn.close()
+    # IDs cached for the old events must not be handed out against the new ones
+    ticket_ids.forget()
+    tickets_changed()
+    return counts
+
+
+def table_counts():
+    counts = {}
+    for table in ('Users', 'Venue', 'Events', 'Tickets'):
+        counts[table] = _fetch_all(f"SELECT COUNT(*) FROM {table}")[0][0]
+    return counts
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(label, operations, previous=None):
+    print(f"\n== {label} ==")
+    print(f"{'operation':32} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'trips':>6} {'rows':>9}")
+    for name, result in operations.items():
+        line = (f"{name:32} {result['ops_per_sec'] or 0:9.1f} {result['p50_ms'] or 0:9.2f} {result['p95_ms'] or 0:9.2f} "
+                f"{result['p99_ms'] or 0:9.2f} {result['round_trips_per_op'] or 0:6.1f} {result['rows_per_op'] or 0:9.0f}")
+        before = (previous or {}).get(name)
+        if before and before.get('p50_ms') and result['p50_ms']:
+            line += f"  p50 {(result['p50_ms'] / before['p50_ms'] - 1) * 100:+.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Ticket Apprentice data-access paths.")
+    parser.add_argument('--sizes', help="comma separated ticket counts to seed and benchmark (ex. 10000,100000); "
+                                        "without it the current database contents are used")
+    parser.add_argument('--replace', action='store_true', help="required with --sizes: every table is emptied and reloaded")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help="repetitions of every operation")
+    parser.add_argument('--pages', type=int, default=10, help="Search All pages per paging operation")
+    parser.add_argument('--bulk-count', type=int, default=1000, help="tickets per bulk generation, 0 to skip")
+    parser.add_argument('--index', action='store_true', help="also benchmark the in-memory ticket index (needs NumPy)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="seed for filters, IDs and generated data")
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="an earlier JSON result to compare p50 latencies with")
+    args = parser.parse_args()
+
+    if args.sizes and not args.replace:
+        parser.exit(1, "Error: --sizes deletes every row in the database; pass --replace to confirm\n")
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = {run['label']: run['operations'] for run in json.load(f)['runs']}
+
+    report = {
+        'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'settings': {'iterations': args.iterations, 'pages': args.pages, 'bulk_count': args.bulk_count,
+                     'index': args.index, 'seed': args.seed, 'pool': get_pool().stats()['pool_size']},
+        'runs': [],
+    }
+
+    sizes = [int(size) for size in args.sizes.split(',')] if args.sizes else [None]
+    for size in sizes:
+        if size is None:
+            label = 'current'
+        else:
+            label = f"{size}"
+            print(f"Seeding {size:,} tickets...")
+            seed_database(scaled_config(size, args.seed),
+                          progress=lambda table, count: print(f"{table}: {count:,} rows", end='\r'))
+            print()
+
+        rows = table_counts()
+        operations = run_benchmark(args.iterations, random.Random(args.seed), args.index, args.pages, args.bulk_count)
+        report['runs'].append({'label': label, 'rows': rows, 'operations': operations})
+        print_results(f"{label} ({rows['Tickets']:,} tickets)", operations, previous.get(label))
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
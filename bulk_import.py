@@ -0,0 +1,495 @@
+# bulk_import.py
+# This file contains the CSV bulk importer for the Ticket Apprentice application
+# Functionality includes:
+# - Reading one CSV file per table in chunks, with a header row naming the table's columns
+# - Validating every row with the same rules as the Add Entries forms
+# - Checking duplicates and foreign keys with one query per chunk instead of one per row
+# - Loading tables in foreign key order with batched executemany inserts
+# - Progress reporting and a per-row rejection report
+# - Rejecting tickets beyond their venue's capacity (see inventory.py)
+#
+# Usage: python bulk_import.py Venue=venues.csv Events=events.csv ...
+#        python bulk_import.py --dir exports/      (loads <Table>.csv for every table found)
+#
+# Each chunk is committed on its own. Rows that already exist are rejected rather than
+# overwritten, so a failed import can simply be run again.
+
+import argparse
+import csv
+import os
+from collections import namedtuple
+from datetime import datetime
+
+from db_pool import get_connection
+from validation import is_valid_date_format
+from ticket_ids import CREATE_SEQUENCE_TABLE, reserve_ticket_ids_in, sync_ticket_sequences, ticket_ids
+from aggregates import record_tickets_inserted
+from inventory import lock_inventory, issue_inserted_tickets
+
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Parents before children, so every foreign key can see the rows it refers to
+IMPORT_ORDER = ['Venue', 'Users', 'Groups', 'IndividualPerformers', 'Events', 'Memberships', 'PerformanceList', 'Tickets']
+
+# columns: CSV/table columns in insert order
+# key: columns that identify a row (duplicates are rejected)
+# foreign_keys: (column, referenced table, referenced column, message when missing)
+# convert: function(row dict) -> tuple of values in `columns` order, raises ValueError for a bad row
+TableSpec = namedtuple('TableSpec', ['columns', 'key', 'foreign_keys', 'convert', 'exists_message'])
+
+ImportResult = namedtuple('ImportResult', ['table', 'read', 'inserted', 'rejected'])
+
+
+def _require(row, columns):
+    values = [row.get(column, '').strip() for column in columns]
+    if any(value == '' for value in values):
+        raise ValueError("All Fields are required")
+    return values
+
+
+def _convert_venue(row):
+    venue_name, city, capacity = _require(row, ['venue_name', 'city', 'capacity'])
+    try:
+        capacity = int(capacity)
+        if capacity <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("Capacity must be a positive whole number")
+    return venue_name, city, capacity
+
+
+def _convert_user(row):
+    id, name, phone, dob = _require(row, ['id', 'user_name', 'phone_number', 'date_of_birth'])
+    if not is_valid_date_format(dob):
+        raise ValueError("Invalid date format or invalid values. Please use YYYY-MM-DD.")
+    try:
+        return int(id), name, int(phone), dob
+    except ValueError:
+        raise ValueError("ID and phone number must be whole numbers")
+
+
+def _convert_group(row):
+    group_name, founded = _require(row, ['group_name', 'founded'])
+    if not is_valid_date_format(founded):
+        raise ValueError("Invalid founded date format. Please use YYYY-MM-DD.")
+    return group_name, founded
+
+
+def _convert_individual_performer(row):
+    stage_name, individual_name, age = _require(row, ['stage_name', 'individual_name', 'age'])
+    try:
+        age = int(age)
+        if not 0 <= age <= 120:
+            raise ValueError
+    except ValueError:
+        raise ValueError("Age must be a valid integer between 0 and 120")
+    return stage_name, individual_name, age
+
+
+def _convert_event(row):
+    event_name, venue_name, event_date, start_time = _require(row, ['event_name', 'venue_name', 'event_date', 'start_time'])
+    try:
+        datetime.strptime(event_date, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError("Invalid event date. Please use YYYY-MM-DD.")
+    for time_format in ('%H:%M:%S', '%H:%M'):
+        try:
+            datetime.strptime(start_time, time_format)
+            break
+        except ValueError:
+            pass
+    else:
+        raise ValueError("Invalid start time. Please use HH:MM or HH:MM:SS.")
+    return event_name, venue_name, event_date, start_time
+
+
+def _convert_membership(row):
+    return tuple(_require(row, ['stage_name', 'group_name']))
+
+
+def _convert_performance(row):
+    return tuple(_require(row, ['event_name', 'group_name']))
+
+
+def _convert_ticket(row):
+    event_name, price = _require(row, ['event_name', 'price'])
+
+    # A blank ID is generated from the event's ticket sequence
+    id = row.get('id', '').strip()
+    try:
+        id = int(id) if id else None
+    except ValueError:
+        raise ValueError("Ticket ID must be a whole number")
+
+    purchased_by = row.get('purchased_by', '').strip()
+    if purchased_by == '' or purchased_by.upper() in ('N/A', 'NULL'):
+        purchased_by = None
+    else:
+        try:
+            purchased_by = int(purchased_by)
+        except ValueError:
+            raise ValueError("Purchased By must be a user ID or 'N/A'")
+
+    try:
+        price = float(price)
+        if price <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("Price must be a valid positive number")
+
+    return id, event_name, purchased_by, price
+
+
+TABLE_SPECS = {
+    'Venue': TableSpec(['venue_name', 'city', 'capacity'], ['venue_name'], [], _convert_venue,
+                       "Venue name {} already exists"),
+    'Users': TableSpec(['id', 'user_name', 'phone_number', 'date_of_birth'], ['id'], [], _convert_user,
+                       "ID {} already exists"),
+    'Groups': TableSpec(['group_name', 'founded'], ['group_name'], [], _convert_group,
+                        "Group name {} already exists"),
+    'IndividualPerformers': TableSpec(['stage_name', 'individual_name', 'age'], ['stage_name'], [],
+                                      _convert_individual_performer, "Stage name {} already exists"),
+    'Events': TableSpec(['event_name', 'venue_name', 'event_date', 'start_time'], ['event_name'],
+                        [('venue_name', 'Venue', 'venue_name', "Venue name {} does not exist")],
+                        _convert_event, "Event name {} already exists"),
+    'Memberships': TableSpec(['stage_name', 'group_name'], ['stage_name', 'group_name'],
+                             [('stage_name', 'IndividualPerformers', 'stage_name', "Stage name {} does not exist"),
+                              ('group_name', 'Groups', 'group_name', "Group name {} does not exist")],
+                             _convert_membership, "Membership for {} already exists"),
+    'PerformanceList': TableSpec(['event_name', 'group_name'], ['event_name', 'group_name'],
+                                 [('event_name', 'Events', 'event_name', "Event name {} does not exist"),
+                                  ('group_name', 'Groups', 'group_name', "Group name {} does not exist")],
+                                 _convert_performance, "Entry for {} already exists"),
+    'Tickets': TableSpec(['id', 'event_name', 'purchased_by', 'price'], ['id', 'event_name'],
+                         [('event_name', 'Events', 'event_name', "Event name {} does not exist"),
+                          ('purchased_by', 'Users', 'id', "User with ID {} does not exist")],
+                         _convert_ticket, "Ticket {} already exists"),
+}
+
+
+def _normalize(value):
+    # Compare keys the way the default collation does: case-insensitive, trailing spaces ignored
+    return value.rstrip().casefold() if isinstance(value, str) else value
+
+
+def _existing_values(cursor, table, columns, values):
+    """
+    Which of the given key values already exist in table, in one query.
+
+    Args:
+        cursor: Database cursor.
+        table (str): Table to look in.
+        columns (list): Key columns.
+        values (set): Tuples of key values.
+
+    Returns:
+        set: The normalized tuples that exist.
+    """
+    if not values:
+        return set()
+    values = list(values)
+    column_list = ', '.join(columns)
+    row_placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    query = f"SELECT {column_list} FROM {table} WHERE ({column_list}) IN ({', '.join([row_placeholder] * len(values))})"
+    cursor.execute(query, [value for key in values for value in key])
+    return {tuple(_normalize(value) for value in row) for row in cursor.fetchall()}
+
+
+def _describe_key(key):
+    return ' and '.join(str(value) for value in key)
+
+
+def _read_chunks(path, columns, chunk_size):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        header = [name.strip() for name in (reader.fieldnames or [])]
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f"{path} is missing the column(s) {', '.join(missing)}")
+        reader.fieldnames = header
+
+        chunk = []
+        for row in reader:
+            # DictReader line_num is the physical line the row ended on
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class RejectionReport:
+    """
+    Collects rejected rows and writes them to a CSV with the reason next to the original fields.
+    """
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, table, path, line, reason, row):
+        self.rows.append((table, os.path.basename(path), line, reason, row))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def write(self, path):
+        """
+        Write the report to path (table, file, line, reason, then the rejected row's fields).
+        """
+        columns = []
+        for *_, row in self.rows:
+            columns.extend(column for column in row if column not in columns and column is not None)
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['table', 'file', 'line', 'reason'] + columns)
+            for table, file_name, line, reason, row in self.rows:
+                writer.writerow([table, file_name, line, reason] + [row.get(column, '') for column in columns])
+
+
+def _import_chunk(cursor, table, spec, path, chunk, seen_keys, report):
+    """
+    Validate one chunk and insert the rows that pass.
+
+    Returns:
+        list: Tuples of the inserted rows in spec.columns order.
+    """
+    accepted = []
+    for line, raw in chunk:
+        try:
+            accepted.append((line, raw, spec.convert(raw)))
+        except ValueError as e:
+            report.add(table, path, line, str(e), raw)
+
+    # Foreign keys: one lookup per referenced column for the whole chunk
+    for column, ref_table, ref_column, message in spec.foreign_keys:
+        index = spec.columns.index(column)
+        wanted = {(values[index],) for _, _, values in accepted if values[index] is not None}
+        found = _existing_values(cursor, ref_table, [ref_column], wanted)
+        kept = []
+        for line, raw, values in accepted:
+            if values[index] is not None and (_normalize(values[index]),) not in found:
+                report.add(table, path, line, message.format(values[index]), raw)
+            else:
+                kept.append((line, raw, values))
+        accepted = kept
+
+    # Duplicates within the file and against the table
+    key_index = [spec.columns.index(column) for column in spec.key]
+
+    def key_of(values):
+        return tuple(values[i] for i in key_index)
+
+    with_key = [values for _, _, values in accepted if None not in key_of(values)]
+    existing = _existing_values(cursor, table, spec.key, {key_of(values) for values in with_key})
+    kept = []
+    for line, raw, values in accepted:
+        key = key_of(values)
+        if None not in key:
+            normalized = tuple(_normalize(value) for value in key)
+            if normalized in existing or normalized in seen_keys:
+                report.add(table, path, line, spec.exists_message.format(_describe_key(key)), raw)
+                continue
+            seen_keys.add(normalized)
+        kept.append((line, raw, values))
+
+    if table == 'Tickets':
+        kept = _within_capacity(cursor, path, kept, report)
+    kept = [values for _, _, values in kept]
+
+    placeholders = ', '.join(['%s'] * len(spec.columns))
+    insert_query = f"INSERT INTO {table} ({', '.join(spec.columns)}) VALUES ({placeholders})"
+    if table == 'Tickets':
+        kept = _insert_tickets(cursor, insert_query, kept)
+    elif kept:
+        cursor.executemany(insert_query, kept)
+
+    if table == 'Tickets':
+        inserted = [(event_name, purchased_by, price) for _, event_name, purchased_by, price in kept]
+        record_tickets_inserted(cursor, inserted)
+        issue_inserted_tickets(cursor, inserted)
+    return kept
+
+
+def _within_capacity(cursor, path, tickets, report):
+    # Keep each event's tickets up to the seats its venue has left, in file order. The counters
+    # stay locked until the chunk commits, so no sale can take those seats in between
+    seats_left = {}
+    for event_name in sorted({values[1] for _, _, values in tickets}):
+        row = lock_inventory(cursor, event_name)
+        seats_left[event_name] = (row[0], row[0] - row[1]) if row is not None else None
+
+    kept = []
+    for line, raw, values in tickets:
+        seats = seats_left[values[1]]
+        if seats is None:
+            report.add('Tickets', path, line, f"Event {values[1]} has no venue", raw)
+        elif seats[1] <= 0:
+            report.add('Tickets', path, line, f"Event {values[1]} is sold out ({seats[0]} seats)", raw)
+        else:
+            seats_left[values[1]] = (seats[0], seats[1] - 1)
+            kept.append((line, raw, values))
+    return kept
+
+
+def _insert_tickets(cursor, insert_query, tickets):
+    """
+    Insert a chunk of tickets, generating the blank IDs.
+
+    The tickets with explicit IDs go in first and their events' sequences are synced past them,
+    all in the chunk's transaction. Only then are the blank IDs reserved, on the same cursor, so a
+    generated ID can never be one the chunk (or an earlier chunk) inserted explicitly.
+
+    Returns:
+        list: The inserted tickets, explicit IDs first, then the generated ones.
+    """
+    explicit = [values for values in tickets if values[0] is not None]
+    blank = [values for values in tickets if values[0] is None]
+
+    if explicit:
+        cursor.executemany(insert_query, explicit)
+        sync_ticket_sequences(cursor, sorted({event_name for _, event_name, _, _ in explicit}))
+
+    # One block per event; events in a fixed order so two imports cannot deadlock on the sequences
+    counts = {}
+    for _, event_name, _, _ in blank:
+        counts[event_name] = counts.get(event_name, 0) + 1
+    blocks = {event_name: iter(reserve_ticket_ids_in(cursor, event_name, counts[event_name]))
+              for event_name in sorted(counts)}
+    generated = [(next(blocks[event_name]), event_name, purchased_by, price)
+                 for _, event_name, purchased_by, price in blank]
+    if generated:
+        cursor.executemany(insert_query, generated)
+    return explicit + generated
+
+
+def import_csv(conn, table, path, chunk_size=DEFAULT_CHUNK_SIZE, report=None, progress=None):
+    """
+    Import one CSV file into a table, committing after every chunk.
+
+    Args:
+        conn: Database connection.
+        table (str): One of IMPORT_ORDER.
+        path (str): CSV file with a header row of column names.
+        chunk_size (int): Rows validated and inserted per batch.
+        report (RejectionReport): Collects the rejected rows; a new one is used if None.
+        progress (callable): Optional progress(table, read, inserted, rejected) called after every chunk.
+
+    Returns:
+        ImportResult: Row counts for the file.
+    """
+    if table not in TABLE_SPECS:
+        raise ValueError(f"Cannot import into {table}")
+    spec = TABLE_SPECS[table]
+    report = report if report is not None else RejectionReport()
+
+    read = inserted = rejected = 0
+    seen_keys = set()
+    cursor = conn.cursor()
+    try:
+        if table == 'Tickets':
+            # Blank IDs are reserved inside each chunk's transaction, where this DDL could not run
+            cursor.execute(CREATE_SEQUENCE_TABLE)
+        # Ticket IDs may be left out entirely and generated
+        header_columns = [column for column in spec.columns if not (table == 'Tickets' and column == 'id')]
+        for chunk in _read_chunks(path, header_columns, chunk_size):
+            rejected_before = len(report)
+            kept = _import_chunk(cursor, table, spec, path, chunk, seen_keys, report)
+            conn.commit()
+            if table == 'Tickets':
+                # IDs this process cached before the sequences moved past the explicit ones may be taken now
+                for event_name in {row.get('event_name', '').strip() for _, row in chunk if row.get('id', '').strip()}:
+                    ticket_ids.forget(event_name)
+
+            read += len(chunk)
+            inserted += len(kept)
+            rejected += len(report) - rejected_before
+            if progress is not None:
+                progress(table, read, inserted, rejected)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return ImportResult(table, read, inserted, rejected)
+
+
+def import_files(conn, files, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Import several CSV files in foreign key order.
+
+    Args:
+        conn: Database connection.
+        files (dict): Table name -> CSV path.
+        chunk_size (int): Rows per batch.
+        progress (callable): Optional progress(table, read, inserted, rejected).
+
+    Returns:
+        tuple: (list of ImportResult, RejectionReport)
+    """
+    unknown = [table for table in files if table not in TABLE_SPECS]
+    if unknown:
+        raise ValueError(f"Unknown table(s): {', '.join(unknown)}. Expected one of {', '.join(IMPORT_ORDER)}")
+
+    report = RejectionReport()
+    results = [import_csv(conn, table, files[table], chunk_size, report, progress)
+               for table in IMPORT_ORDER if table in files]
+    return results, report
+
+
+def files_in_directory(directory):
+    """
+    Find <Table>.csv files for the importable tables in a directory.
+
+    Returns:
+        dict: Table name -> CSV path.
+    """
+    files = {}
+    for name in os.listdir(directory):
+        table, extension = os.path.splitext(name)
+        if extension.lower() == '.csv' and table in TABLE_SPECS:
+            files[table] = os.path.join(directory, name)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import CSV files (one per table, with a header row).")
+    parser.add_argument('files', nargs='*', metavar='TABLE=PATH', help="ex. Venue=venues.csv Tickets=tickets.csv")
+    parser.add_argument('--dir', help="import every <Table>.csv found in this directory")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per batch")
+    parser.add_argument('--rejected', default="rejected_rows.csv", help="where to write the rejection report")
+    args = parser.parse_args()
+
+    files = files_in_directory(args.dir) if args.dir else {}
+    for argument in args.files:
+        table, separator, path = argument.partition('=')
+        if not separator:
+            parser.error(f"Expected TABLE=PATH, got {argument}")
+        files[table] = path
+    if not files:
+        parser.error("No files to import")
+
+    def show_progress(table, read, inserted, rejected):
+        print(f"{table}: {read} rows read, {inserted} inserted, {rejected} rejected", end='\r')
+
+    conn = get_connection()
+    try:
+        results, report = import_files(conn, files, args.chunk_size, show_progress)
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+    finally:
+        conn.close()
+
+    print()
+    for result in results:
+        print(f"{result.table}: {result.inserted} of {result.read} rows inserted, {result.rejected} rejected")
+    if len(report):
+        report.write(args.rejected)
+        print(f"Rejected rows written to {args.rejected}")
+
+
+if __name__ == '__main__':
+    main()
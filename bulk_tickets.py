@@ -0,0 +1,180 @@
+# bulk_tickets.py
+# This file contains bulk ticket inventory generation for the Ticket Apprentice application
+# Functionality includes:
+# - Creating N tickets for an event, or filling it up to its venue's capacity
+# - Splitting the tickets over one or more price points
+# - Batched inserts inside a single transaction, with IDs reserved in one block from ticket_ids.py
+# - Checking the venue's capacity against the event's inventory counters (see inventory.py)
+# - A command line entry point (run `python bulk_tickets.py --help`)
+#
+# Generated tickets are unsold (purchased_by is NULL), so the dashboard aggregates do not change.
+
+import argparse
+
+from db_pool import get_connection
+from ticket_ids import reserve_ticket_ids
+from inventory import lock_inventory, issue_tickets
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+insert_ticket_query = "INSERT INTO Tickets (id, event_name, purchased_by, price) VALUES (%s, %s, NULL, %s)"
+
+
+def parse_price_points(text):
+    """
+    Parse price points written as "price[:quantity], ..." (ex. "250:1000, 120:5000, 60").
+
+    Args:
+        text (str): The price points; a price without a quantity shares the remaining tickets.
+
+    Returns:
+        list: (price, quantity or None) tuples.
+    """
+    price_points = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        price, _, quantity = part.partition(':')
+        try:
+            price = float(price)
+            quantity = int(quantity) if quantity.strip() else None
+        except ValueError:
+            raise ValueError(f"Invalid price point '{part}', expected price or price:quantity")
+        if price <= 0:
+            raise ValueError("Price must be a positive value")
+        if quantity is not None and quantity <= 0:
+            raise ValueError("Quantities must be positive whole numbers")
+        price_points.append((price, quantity))
+
+    if not price_points:
+        raise ValueError("At least one price point is required")
+    return price_points
+
+
+def plan_price_points(price_points, total):
+    """
+    Give every price point a quantity so that together they make up total tickets.
+
+    Price points with a quantity keep it. The tickets left over are split evenly over the
+    price points without one, the first ones taking the odd tickets.
+
+    Args:
+        price_points (list): (price, quantity or None) tuples from parse_price_points.
+        total (int): Number of tickets to create.
+
+    Returns:
+        list: (price, quantity) tuples whose quantities sum to total.
+    """
+    fixed = sum(quantity for _, quantity in price_points if quantity is not None)
+    open_points = [price for price, quantity in price_points if quantity is None]
+
+    if fixed > total:
+        raise ValueError(f"Price point quantities add up to {fixed}, more than the {total} tickets to create")
+    if not open_points and fixed != total:
+        raise ValueError(f"Price point quantities add up to {fixed}, not {total}. Leave a quantity out to take the rest")
+
+    share, extra = divmod(total - fixed, len(open_points)) if open_points else (0, 0)
+    plan = []
+    for price, quantity in price_points:
+        if quantity is None:
+            quantity = share + (1 if extra > 0 else 0)
+            extra -= 1
+        if quantity > 0:
+            plan.append((price, quantity))
+    return plan
+
+
+def remaining_capacity(cursor, event_name):
+    """
+    Seats of the event's venue that do not have a ticket yet, read from the event's inventory counters.
+    Locks the counters, so concurrent generations and sales for one event run one after the other.
+
+    Returns:
+        tuple: (venue capacity, existing ticket count)
+    """
+    row = lock_inventory(cursor, event_name)
+    if row is None:
+        raise ValueError(f"Event name {event_name} does not exist or has no venue. Please select a valid event.")
+    return row[0], row[1]
+
+
+def generate_tickets(conn, event_name, price_points, count=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Create unsold tickets for an event in a single transaction.
+
+    Args:
+        conn: Database connection.
+        event_name (str): The event to create tickets for.
+        price_points (list): (price, quantity or None) tuples, see parse_price_points.
+        count (int): Number of tickets to create, or None to fill the venue to capacity.
+        batch_size (int): Rows sent per executemany call.
+        progress (callable): Optional progress(created, total) called after every batch.
+
+    Returns:
+        int: Number of tickets created.
+    """
+    cursor = conn.cursor()
+    try:
+        capacity, existing = remaining_capacity(cursor, event_name)
+        available = capacity - existing
+
+        total = available if count is None else int(count)
+        if total <= 0:
+            raise ValueError(f"{event_name} already has {existing} tickets for {capacity} seats")
+        if total > available:
+            raise ValueError(f"{event_name} only has {available} of {capacity} seats without a ticket")
+
+        plan = plan_price_points(price_points, total)
+        issue_tickets(cursor, event_name, total)
+        ticket_ids = iter(reserve_ticket_ids(event_name, total))
+
+        created = 0
+        batch = []
+        for price, quantity in plan:
+            for _ in range(quantity):
+                batch.append((next(ticket_ids), event_name, price))
+                if len(batch) >= batch_size:
+                    cursor.executemany(insert_ticket_query, batch)
+                    created += len(batch)
+                    batch = []
+                    if progress is not None:
+                        progress(created, total)
+        if batch:
+            cursor.executemany(insert_ticket_query, batch)
+            created += len(batch)
+            if progress is not None:
+                progress(created, total)
+
+        conn.commit()
+        return created
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create ticket inventory for an event.")
+    parser.add_argument('event_name', help="the event to create tickets for")
+    parser.add_argument('--prices', required=True,
+                        help="price points as price[:quantity],... (ex. 250:1000,120:5000,60)")
+    parser.add_argument('--count', type=int, help="number of tickets to create (default: fill the venue to capacity)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per insert batch")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        created = generate_tickets(conn, args.event_name, parse_price_points(args.prices), args.count, args.batch_size,
+                                   progress=lambda done, total: print(f"{done}/{total} tickets", end='\r'))
+        print(f"\nCreated {created} tickets for {args.event_name}")
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
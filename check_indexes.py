@@ -0,0 +1,167 @@
+# check_indexes.py
+# This file checks that the canned queries of the Ticket Apprentice application use the shipped indexes
+# Functionality includes:
+# - Optionally applying indexes.sql to the configured database (--apply)
+# - Running EXPLAIN on each canned query from queries.py, dashboard.py, deletes.py, aggregates.py and inventory.py
+# - Reporting, per query, the index chosen for each table and any full scan of Tickets
+#
+# Usage: python check_indexes.py [--apply] [--config my_config.ini]
+# Exits with status 1 if any query does not use an expected index.
+
+import argparse
+import sys
+
+from db_pool import get_connection, init_pool, load_db_config
+from dashboard import dashboard_query
+from deletes import preview_query
+from inventory import issue_tickets_query, venue_inventory_query
+from queries import city_list_query, ticket_info_query, build_ticket_search_query
+
+
+# FK columns get an implicit index named after the column; either that or the shipped index is fine
+PURCHASED_BY_KEYS = {'idx_tickets_purchased_by_price', 'purchased_by'}
+TICKET_EVENT_KEYS = {'idx_tickets_event_purchased_by', 'event_name'}
+EVENT_VENUE_KEYS = {'idx_events_venue_name', 'venue_name'}
+
+
+def canned_queries(sample):
+    """
+    The statements to EXPLAIN, with sample parameters and the indexes each table should use.
+
+    Args:
+        sample (dict): Real key values from the database so lookups are not optimized away.
+
+    Returns:
+        list: (name, query, params, {table or alias: set of acceptable index names})
+    """
+    price_query, price_values = build_ticket_search_query(sample['price'], sample['price'] + 50, False, [])
+    unsold_query, unsold_values = build_ticket_search_query(sample['price'], None, True, [])
+    city_query, city_values = build_ticket_search_query(0, None, False, [sample['city']])
+
+    return [
+        # The query the Admin Dashboard runs; every ranking aliases its summary table s
+        ("dashboard: all reports", dashboard_query(), (),
+         {'s': {'ticket_count', 'total_spent', 'total_revenue'}, 'UserTicketStats': {'ticket_count', 'total_spent'},
+          'EventRevenueStats': {'total_revenue'}, 'u': {'PRIMARY'}}),
+        ("search: price range", price_query, price_values,
+         {'Tickets': {'idx_tickets_price'}}),
+        ("search: not purchased", unsold_query, unsold_values,
+         {'Tickets': {'idx_tickets_price', 'idx_tickets_purchased_by_price'}}),
+        ("search: city", city_query, city_values,
+         {'Venue': {'idx_venue_city'}, 'Tickets': TICKET_EVENT_KEYS}),
+        ("search: city list", city_list_query, (),
+         {'Tickets': TICKET_EVENT_KEYS}),
+        ("search: ticket info", ticket_info_query, (sample['ticket_id'],),
+         {'t': {'PRIMARY'}, 'e': {'PRIMARY'}}),
+        # Dependents are aliased d in every subquery of a delete preview
+        ("delete user: preview", preview_query('Users'), (sample['user_id'],),
+         {'p': {'PRIMARY'}, 'd': PURCHASED_BY_KEYS}),
+        ("delete venue: preview", preview_query('Venue'), (sample['venue_name'],),
+         {'p': {'PRIMARY'}, 'd': EVENT_VENUE_KEYS}),
+        ("delete event: preview", preview_query('Events'), (sample['event_name'],),
+         {'p': {'PRIMARY'}, 'd': TICKET_EVENT_KEYS | {'PRIMARY'}}),
+        ("aggregates: rebuild pass",
+         "SELECT event_name, purchased_by, COUNT(*), SUM(price) FROM Tickets WHERE purchased_by IS NOT NULL GROUP BY event_name, purchased_by", (),
+         {'Tickets': TICKET_EVENT_KEYS}),
+        ("aggregates: event tickets by user",
+         "SELECT purchased_by, COUNT(*), SUM(price) FROM Tickets WHERE event_name = %s AND purchased_by IS NOT NULL GROUP BY purchased_by",
+         (sample['event_name'],),
+         {'Tickets': TICKET_EVENT_KEYS}),
+        # A sale is three primary key lookups, never a count over Tickets
+        ("inventory: issue a ticket", issue_tickets_query, (1, 0, sample['event_name'], 1),
+         {'i': {'PRIMARY'}, 'e': {'PRIMARY'}, 'v': {'PRIMARY'}}),
+        ("inventory: venue capacity check", venue_inventory_query, (sample['venue_name'],),
+         {'e': EVENT_VENUE_KEYS, 'i': {'PRIMARY'}}),
+    ]
+
+
+def load_sample(cursor):
+    # Pick one real purchased ticket and its venue so the EXPLAINs look up keys that exist
+    cursor.execute('''
+        SELECT t.id, t.event_name, t.purchased_by, t.price, v.venue_name, v.city
+        FROM Tickets t JOIN Events e USING (event_name) JOIN Venue v USING (venue_name)
+        WHERE t.purchased_by IS NOT NULL
+        LIMIT 1
+    ''')
+    row = cursor.fetchone()
+    if row is None:
+        raise SystemExit("Tickets has no purchased tickets to sample; load populate_tables.sql first")
+    ticket_id, event_name, user_id, price, venue_name, city = row
+    return {'ticket_id': ticket_id, 'event_name': event_name, 'user_id': user_id,
+            'price': float(price), 'venue_name': venue_name, 'city': city}
+
+
+def apply_indexes(cursor, path="indexes.sql"):
+    """
+    Run every statement in indexes.sql.
+    """
+    with open(path) as f:
+        script = f.read()
+
+    # Drop the comment lines, then split on ';'
+    lines = [line for line in script.splitlines() if not line.strip().startswith(('--', '/*', '*'))]
+    for statement in "\n".join(lines).split(';'):
+        if statement.strip():
+            cursor.execute(statement)
+            print(f"applied: {' '.join(statement.split())}")
+
+
+def explain(cursor, query, params):
+    cursor.execute("EXPLAIN " + query.strip().rstrip(';'), params)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def check_query(cursor, name, query, params, expected):
+    """
+    EXPLAIN one query and compare the chosen indexes with the expected ones.
+
+    Returns:
+        bool: True if every expected table uses an acceptable index and Tickets is never fully scanned.
+    """
+    plan = explain(cursor, query, params)
+    problems = []
+
+    for row in plan:
+        table, key, access = row.get('table'), row.get('key'), row.get('type')
+        if table in expected and key not in expected[table]:
+            problems.append(f"{table} uses {key or 'no index'} ({access}), expected {' or '.join(sorted(expected[table]))}")
+        elif table == 'Tickets' and access == 'ALL':
+            problems.append("full scan of Tickets")
+
+    used = ", ".join(f"{row.get('table')}:{row.get('key') or '-'}" for row in plan)
+    print(f"{'PASS' if not problems else 'FAIL'}  {name}  [{used}]")
+    for problem in problems:
+        print(f"        {problem}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the canned queries and check they use the shipped indexes.")
+    parser.add_argument('--apply', action='store_true', help="create the indexes from indexes.sql first")
+    parser.add_argument('--config', default="my_config.ini", help="config file with the [db_info] section")
+    args = parser.parse_args()
+
+    init_pool(**load_db_config(args.config))
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        if args.apply:
+            apply_indexes(cursor)
+            conn.commit()
+
+        sample = load_sample(cursor)
+        results = [check_query(cursor, *query) for query in canned_queries(sample)]
+        cursor.close()
+        # Nothing here should change data, roll back to be safe
+        conn.rollback()
+    finally:
+        conn.close()
+
+    failed = results.count(False)
+    print(f"\n{len(results) - failed} of {len(results)} queries use the expected indexes")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
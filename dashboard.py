@@ -0,0 +1,106 @@
+# dashboard.py
+# This file contains the Admin Dashboard report engine for the Ticket Apprentice application
+# Functionality includes:
+# - A registry of ranking metrics over the per-user and per-event purchase totals
+# - One query that computes every registered ranking in a single round trip
+# - Splitting that result back into one row list per report
+#
+# The per-user and per-event totals come from the UserTicketStats and EventRevenueStats summary
+# tables (see aggregates.py), which are both rolled up from one grouped pass over the purchased
+# tickets. Adding a report is adding a DashboardMetric; no new scan of Tickets is needed.
+
+from collections import namedtuple
+
+
+# Every ranking returns rows of the same shape, so they can share one UNION ALL:
+# (metric index, id, label, count, amount); a metric picks the columns it shows
+SOURCES = {
+    'users': {
+        'from': "UserTicketStats s JOIN Users u ON u.id = s.user_id",
+        'stats_table': "UserTicketStats",
+        'id': "s.user_id", 'label': "u.user_name", 'count': "ticket_count", 'amount': "total_spent",
+    },
+    'events': {
+        'from': "EventRevenueStats s",
+        'stats_table': "EventRevenueStats",
+        'id': "NULL", 'label': "s.event_name", 'count': "tickets_sold", 'amount': "total_revenue",
+    },
+}
+
+DashboardMetric = namedtuple('DashboardMetric', [
+    'name',     # report name, the key of the fetch_dashboard result
+    'source',   # 'users' or 'events' (see SOURCES)
+    'rank_by',  # 'count' or 'amount'
+    'limit',    # top N; ties with the Nth row are kept
+    'columns',  # which of 'id', 'label', 'count', 'amount' the report shows, in order
+])
+
+# The reports shown on the Admin Dashboard
+DASHBOARD_METRICS = [
+    DashboardMetric('top_ticket_count', 'users', 'count', 10, ('id', 'label', 'count')),
+    DashboardMetric('top_revenue', 'events', 'amount', 5, ('label', 'amount')),
+    DashboardMetric('top_users', 'users', 'amount', 10, ('id', 'label', 'count', 'amount')),
+]
+
+ROW_COLUMNS = ('id', 'label', 'count', 'amount')
+
+# Writes to these tables change the reports (they invalidate the cached dashboard)
+DASHBOARD_TABLES = ('Tickets', 'Users', 'Events')
+
+
+def _metric_query(index, metric):
+    source = SOURCES[metric.source]
+    rank_column = source[metric.rank_by]
+    # Rank <= limit keeps ties: take every row reaching the limit-th highest value, which is an
+    # index range read on the summary table's rank_column index
+    return f'''
+    SELECT {index} AS metric, {source['id']} AS id, {source['label']} AS label,
+           s.{source['count']} AS count, s.{source['amount']} AS amount, s.{rank_column} AS rank_value
+    FROM {source['from']}
+    WHERE s.{rank_column} >= COALESCE((
+        SELECT {rank_column} FROM {source['stats_table']} ORDER BY {rank_column} DESC LIMIT 1 OFFSET {int(metric.limit) - 1}
+    ), 0)'''
+
+
+def dashboard_query(metrics=DASHBOARD_METRICS):
+    """
+    Build the single query answering every metric.
+
+    Args:
+        metrics (list): DashboardMetric entries.
+
+    Returns:
+        str: A UNION ALL of one ranking per metric, ordered by metric and then by rank.
+    """
+    branches = [f"({_metric_query(index, metric)}\n)" for index, metric in enumerate(metrics)]
+    return "\nUNION ALL\n".join(branches) + "\nORDER BY metric, rank_value DESC"
+
+
+def split_dashboard_rows(rows, metrics=DASHBOARD_METRICS):
+    """
+    Split the rows of dashboard_query into one list per metric, keeping only the metric's columns.
+
+    Returns:
+        dict: Metric name -> list of row tuples, in rank order.
+    """
+    positions = [[1 + ROW_COLUMNS.index(column) for column in metric.columns] for metric in metrics]
+    reports = {metric.name: [] for metric in metrics}
+    for row in rows:
+        index = row[0]
+        reports[metrics[index].name].append(tuple(row[position] for position in positions[index]))
+    return reports
+
+
+def fetch_dashboard(cursor, metrics=DASHBOARD_METRICS):
+    """
+    Compute every dashboard report with one query.
+
+    Args:
+        cursor: Database cursor.
+        metrics (list): DashboardMetric entries.
+
+    Returns:
+        dict: Metric name -> list of row tuples, in rank order.
+    """
+    cursor.execute(dashboard_query(metrics))
+    return split_dashboard_rows(cursor.fetchall(), metrics)
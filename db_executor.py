@@ -0,0 +1,232 @@
+# db_executor.py
+# This file contains the background query executor for the Ticket Apprentice application
+# Functionality includes:
+# - Running database work on worker threads so the Tkinter mainloop never blocks
+# - Handing results back to the main thread through root.after
+# - Cancelling superseded requests (ex. clicking Search twice)
+# - Profiling the worker and main-thread parts of each request separately when profiling mode is on
+
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter.messagebox as MessageBox
+
+from profiler import profiler
+
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_POLL_INTERVAL_MS = 25
+
+
+def show_background_error(error):
+    """
+    Default error handler for background work, matching the message boxes used by the forms.
+
+    Args:
+        error (Exception): The exception raised by the background work.
+    """
+    print(f"Error: {error}")
+    MessageBox.showerror("Error", f"Error: {error}")
+
+
+class BackgroundTask:
+    """
+    Handle for one piece of work submitted to the QueryExecutor.
+
+    The work function receives its task so it can check `cancelled` between
+    steps and post intermediate results (ex. batches of rows) to the main thread.
+    """
+
+    def __init__(self, executor, key):
+        self.key = key
+        self.future = None
+        self._executor = executor
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        Cancel the task. Work that has not started is skipped and results that
+        arrive afterwards are dropped instead of being delivered.
+        """
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def post(self, callback, *args):
+        """
+        Schedule callback(*args) on the Tk main thread unless the task is cancelled.
+
+        Args:
+            callback (callable): Function to run on the main thread.
+            *args: Arguments for the callback.
+        """
+        if not self.cancelled:
+            self._executor._results.put((self, callback, args))
+
+
+class QueryExecutor:
+    """
+    Thread pool for database work with results delivered on the Tk main thread.
+
+    Worker threads never touch widgets. They put callbacks on a queue, and the
+    main thread drains that queue every poll_interval milliseconds via root.after.
+    Submitting work under a key that is already running cancels the older task.
+    """
+
+    def __init__(self, root, max_workers=DEFAULT_MAX_WORKERS, poll_interval=DEFAULT_POLL_INTERVAL_MS):
+        self._root = root
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-worker')
+        self._results = queue.Queue()
+        self._poll_interval = poll_interval
+        self._latest = {}  # key -> most recent BackgroundTask
+        self._lock = threading.Lock()
+        self._running = True
+        self._after_id = root.after(poll_interval, self._pump)
+
+    def submit(self, key, work, on_success=None, on_error=show_background_error):
+        """
+        Run work(task) on a worker thread.
+
+        Args:
+            key (str or None): Requests sharing a key supersede each other; None never cancels anything.
+            work (callable): Function taking the BackgroundTask; its return value is passed to on_success.
+            on_success (callable): Called on the main thread with the result.
+            on_error (callable): Called on the main thread with the exception.
+
+        Returns:
+            BackgroundTask: Handle that can be used to cancel the work.
+        """
+        task = BackgroundTask(self, key)
+
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = task
+            if previous is not None:
+                previous.cancel()
+
+        def run():
+            if task.cancelled:
+                return
+            try:
+                with profiler.section(f"{key or 'background'} [worker]"):
+                    result = work(task)
+            except Exception as e:
+                traceback.print_exc()
+                if on_error is not None:
+                    task.post(on_error, e)
+            else:
+                if on_success is not None:
+                    task.post(on_success, result)
+            finally:
+                task.post(self._forget, task)
+
+        task.future = self._threads.submit(run)
+        return task
+
+    def cancel(self, key):
+        """
+        Cancel the most recent task submitted under key, if any.
+        """
+        with self._lock:
+            task = self._latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def _forget(self, task):
+        with self._lock:
+            if self._latest.get(task.key) is task:
+                del self._latest[task.key]
+
+    def _pump(self):
+        # Deliver what the workers finished since the last poll. Work posted while
+        # we deliver waits for the next poll, so Tk gets to redraw in between.
+        for _ in range(self._results.qsize()):
+            try:
+                task, callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if task.cancelled:
+                continue
+            try:
+                # Rendering results (ex. Treeview inserts) is profiled under the request's key
+                with profiler.section(f"{task.key or 'background'} [ui]"):
+                    callback(*args)
+            except Exception:
+                # A widget may have been destroyed while the query ran; keep pumping
+                traceback.print_exc()
+
+        if self._running:
+            self._after_id = self._root.after(self._poll_interval, self._pump)
+
+    def shutdown(self):
+        """
+        Cancel outstanding work and stop the worker threads.
+        """
+        self._running = False
+        with self._lock:
+            tasks = list(self._latest.values())
+            self._latest.clear()
+        for task in tasks:
+            task.cancel()
+        try:
+            self._root.after_cancel(self._after_id)
+        except Exception:
+            pass
+        self._threads.shutdown(wait=False)
+
+
+# Process-wide executor created by main.py once the root window exists
+_executor = None
+
+
+def init_executor(root, max_workers=DEFAULT_MAX_WORKERS, poll_interval=DEFAULT_POLL_INTERVAL_MS):
+    """
+    Create the process-wide executor bound to the Tk root window.
+
+    Args:
+        root (Tk): The application's root window.
+        max_workers (int): Number of worker threads (keep at or below the connection pool size).
+        poll_interval (int): Milliseconds between result deliveries on the main thread.
+
+    Returns:
+        QueryExecutor: The new executor.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+    _executor = QueryExecutor(root, max_workers=max_workers, poll_interval=poll_interval)
+    return _executor
+
+
+def run_in_background(key, work, on_success=None, on_error=show_background_error):
+    """
+    Submit work to the process-wide executor (see QueryExecutor.submit).
+    """
+    if _executor is None:
+        raise RuntimeError("init_executor must be called before running background work")
+    return _executor.submit(key, work, on_success=on_success, on_error=on_error)
+
+
+def cancel_background(key):
+    """
+    Cancel the most recent background task submitted under key.
+    """
+    if _executor is not None:
+        _executor.cancel(key)
+
+
+def shutdown_executor():
+    """
+    Stop the process-wide executor if it was created.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,365 @@
+# db_pool.py
+# This file contains the shared database connection pool for the Ticket Apprentice application
+# Functionality includes:
+# - Reading the connection settings from my_config.ini
+# - A process-wide pool of MariaDB connections that every query borrows from
+# - Validation of connections on checkout and eviction of idle connections
+# - Checkout and wait counters for diagnosing pool pressure
+# - Cursors instrumented by query_stats.py, so every statement is timed and fingerprinted
+
+import threading
+import time
+from collections import deque
+from configparser import ConfigParser
+
+import mariadb
+
+from query_stats import query_stats, InstrumentedCursor
+
+
+# Defaults used when my_config.ini has no [pool] section
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_IDLE_SECONDS = 300
+DEFAULT_CHECKOUT_TIMEOUT = 30
+
+
+def load_db_config(path="my_config.ini"):
+    """
+    Read the database and pool settings from the config file.
+
+    Args:
+        path (str): Path to the config file with a [db_info] section and an optional [pool] section.
+
+    Returns:
+        dict: Keyword arguments accepted by init_pool.
+    """
+    config = ConfigParser()
+    config.read(path)
+
+    return {
+        'host': config.get('db_info', 'host'),
+        'user': config.get('db_info', 'user'),
+        'password': config.get('db_info', 'password'),
+        'database': config.get('db_info', 'database'),
+        'pool_size': config.getint('pool', 'pool_size', fallback=DEFAULT_POOL_SIZE),
+        'max_idle_seconds': config.getfloat('pool', 'max_idle_seconds', fallback=DEFAULT_MAX_IDLE_SECONDS),
+        'checkout_timeout': config.getfloat('pool', 'checkout_timeout', fallback=DEFAULT_CHECKOUT_TIMEOUT),
+        'validate_on_checkout': config.getboolean('pool', 'validate_on_checkout', fallback=True),
+    }
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a MariaDB connection borrowed from a ConnectionPool.
+
+    Every attribute is forwarded to the underlying connection, except close(),
+    which hands the connection back to the pool instead of closing the socket.
+    This lets the existing `conn.close()` calls keep working unchanged.
+    """
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._conn = raw_conn
+        self._released = False
+
+    def close(self):
+        """
+        Return the connection to the pool. Calling close() more than once is a no-op.
+        """
+        if not self._released:
+            self._released = True
+            self._pool._release(self._conn)
+
+    def cursor(self, *args, **kwargs):
+        """
+        Open a cursor on the underlying connection, wrapped for query_stats unless it is disabled.
+        """
+        cursor = self._conn.cursor(*args, **kwargs)
+        if query_stats.enabled:
+            return InstrumentedCursor(cursor, query_stats)
+        return cursor
+
+    def discard(self):
+        """
+        Close the underlying connection instead of returning it to the pool.
+        Used when a connection is left in an unknown state, ex. an unbuffered
+        result set that was abandoned partway through.
+        """
+        if not self._released:
+            self._released = True
+            self._pool._discard(self._conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __del__(self):
+        # Safety net for code paths that return without closing the connection
+        if not getattr(self, '_released', True):
+            self._released = True
+            self._pool._release(self._conn, reclaimed=True)
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of MariaDB connections shared by the whole process.
+
+    Connections are opened lazily up to pool_size. A checkout reuses the most
+    recently returned idle connection, pings it first when validation is enabled,
+    and waits up to checkout_timeout seconds when every connection is in use.
+    Connections idle for longer than max_idle_seconds are closed.
+    """
+
+    def __init__(self, host, user, password, database, pool_size=DEFAULT_POOL_SIZE,
+                 max_idle_seconds=DEFAULT_MAX_IDLE_SECONDS, checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 validate_on_checkout=True):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+
+        self._connect_args = {'host': host, 'user': user, 'password': password, 'database': database}
+        self.pool_size = pool_size
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self.validate_on_checkout = validate_on_checkout
+
+        self._lock = threading.Condition(threading.RLock())
+        self._idle = deque()  # (connection, time it was returned)
+        self._open = 0
+        self._closed = False
+
+        # Counters reported by stats()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._created = 0
+        self._evicted = 0
+        self._validation_failures = 0
+        self._reclaimed = 0
+        self._discarded = 0
+
+    def _connect(self):
+        started = time.perf_counter()
+        conn = mariadb.connect(**self._connect_args)
+        query_stats.record_connect(time.perf_counter() - started)
+        return conn
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception as e:
+            print(f"Error during closing: {e}")
+
+    def _evict_idle(self):
+        # Oldest connections sit at the left of the deque, so stop at the first fresh one
+        if self.max_idle_seconds is None:
+            return
+        cutoff = time.monotonic() - self.max_idle_seconds
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.popleft()
+            self._open -= 1
+            self._evicted += 1
+            self._close_quietly(conn)
+
+    def _is_alive(self, conn):
+        try:
+            conn.ping()
+            return True
+        except Exception:
+            return False
+
+    def get_connection(self):
+        """
+        Borrow a connection from the pool.
+
+        Returns:
+            PooledConnection: Connection wrapper; call close() to return it to the pool.
+
+        Raises:
+            mariadb.PoolError: If no connection becomes free within checkout_timeout seconds.
+        """
+        deadline = None
+        with self._lock:
+            if self._closed:
+                raise mariadb.PoolError("Connection pool has been closed")
+
+            self._checkouts += 1
+            while True:
+                self._evict_idle()
+
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    break
+
+                if self._open < self.pool_size:
+                    # Reserve the slot now and open the socket outside the lock
+                    self._open += 1
+                    conn = None
+                    break
+
+                if deadline is None:
+                    self._waits += 1
+                    wait_started = time.monotonic()
+                    deadline = wait_started + self.checkout_timeout
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._wait_time += time.monotonic() - wait_started
+                    raise mariadb.PoolError(f"No connection available after waiting {self.checkout_timeout} seconds")
+                self._lock.wait(remaining)
+
+            if deadline is not None:
+                self._wait_time += time.monotonic() - wait_started
+
+        if conn is not None and self.validate_on_checkout and not self._is_alive(conn):
+            with self._lock:
+                self._validation_failures += 1
+            self._close_quietly(conn)
+            conn = None
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._created += 1
+
+        return PooledConnection(self, conn)
+
+    def _release(self, conn, reclaimed=False):
+        # Roll back anything the borrower left uncommitted so the next user starts clean
+        try:
+            conn.rollback()
+            healthy = True
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            if reclaimed:
+                self._reclaimed += 1
+            if healthy and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._open -= 1
+                self._close_quietly(conn)
+            self._evict_idle()
+            self._lock.notify()
+
+    def _discard(self, conn):
+        with self._lock:
+            self._open -= 1
+            self._discarded += 1
+            self._lock.notify()
+        self._close_quietly(conn)
+
+    def stats(self):
+        """
+        Snapshot of the pool counters.
+
+        Returns:
+            dict: Pool size, open/idle/in-use connections and the checkout, wait,
+                  creation, eviction, validation failure, reclaim and discard counters.
+        """
+        with self._lock:
+            return {
+                'pool_size': self.pool_size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time': self._wait_time,
+                'created': self._created,
+                'evicted': self._evicted,
+                'validation_failures': self._validation_failures,
+                'reclaimed': self._reclaimed,
+                'discarded': self._discarded,
+            }
+
+    def close(self):
+        """
+        Close every idle connection and refuse further checkouts.
+        Connections still in use are closed when they are returned.
+        """
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._open -= 1
+                self._close_quietly(conn)
+            self._lock.notify_all()
+
+
+# Process-wide pool shared by main.py and ticket_utils.py
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def init_pool(host, user, password, database, **pool_options):
+    """
+    Create the process-wide connection pool, replacing any existing one.
+
+    Args:
+        host (str): Database host.
+        user (str): Database user.
+        password (str): Database password.
+        database (str): Database name.
+        **pool_options: pool_size, max_idle_seconds, checkout_timeout, validate_on_checkout.
+
+    Returns:
+        ConnectionPool: The new pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(host, user, password, database, **pool_options)
+        return _pool
+
+
+def get_pool():
+    """
+    Return the process-wide pool, creating it from my_config.ini on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(**load_db_config())
+        return _pool
+
+
+def get_connection():
+    """
+    Borrow a connection from the process-wide pool.
+
+    Returns:
+        PooledConnection: Connection wrapper; call close() to return it to the pool.
+    """
+    return get_pool().get_connection()
+
+
+def pool_stats():
+    """
+    Counters of the process-wide pool (see ConnectionPool.stats).
+    """
+    return get_pool().stats()
+
+
+def close_pool():
+    """
+    Close the process-wide pool if it was created.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
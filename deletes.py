@@ -0,0 +1,449 @@
+# deletes.py
+# This file contains the delete layer of the Ticket Apprentice application
+# Functionality includes:
+# - The ON DELETE rule of every foreign key (CASCADE or RESTRICT), also declared in populate_tables.sql
+# - A delete preview: the row and the dependents it cascades to or is blocked by, in one query
+# - Deleting a row with one DELETE statement, keeping the dashboard summary tables and the
+#   inventory counters in step
+# - Bulk deletes: the impact of many keys in one grouped query, then chunked DELETE ... IN statements
+# - Applying the rules to an existing database (run `python deletes.py --apply`)
+#
+# The server enforces the rules, so a dependent added after the preview still blocks (RESTRICT)
+# or follows (CASCADE) the delete.
+
+import argparse
+from collections import namedtuple
+
+from db_pool import get_connection, init_pool, load_db_config
+from aggregates import record_ticket_change, record_event_tickets_deleted, record_tickets_deleted
+from inventory import release_deleted_tickets, drop_event_inventory
+from pagination import TABLE_PRIMARY_KEYS
+
+
+DeleteRule = namedtuple('DeleteRule', [
+    'table',          # child table holding the foreign key
+    'column',         # foreign key column
+    'parent',         # referenced table
+    'parent_column',  # referenced column
+    'action',         # 'CASCADE' or 'RESTRICT'
+    'label',          # child column listed in the dependency report
+])
+
+DELETE_RULES = [
+    DeleteRule('Events', 'venue_name', 'Venue', 'venue_name', 'RESTRICT', 'event_name'),
+    DeleteRule('PerformanceList', 'event_name', 'Events', 'event_name', 'CASCADE', 'group_name'),
+    DeleteRule('PerformanceList', 'group_name', 'Groups', 'group_name', 'RESTRICT', 'event_name'),
+    DeleteRule('Memberships', 'stage_name', 'IndividualPerformers', 'stage_name', 'CASCADE', 'group_name'),
+    DeleteRule('Memberships', 'group_name', 'Groups', 'group_name', 'CASCADE', 'stage_name'),
+    DeleteRule('Tickets', 'purchased_by', 'Users', 'id', 'RESTRICT', 'event_name'),
+    DeleteRule('Tickets', 'event_name', 'Events', 'event_name', 'CASCADE', 'id'),
+]
+
+# Key columns identifying one row of every table that can be deleted from the UI
+DELETE_KEYS = TABLE_PRIMARY_KEYS
+
+# How many dependent names the report lists
+DEPENDENT_SAMPLE = 10
+
+# Keys per statement of a bulk delete (and of its impact query)
+BULK_DELETE_CHUNK = 500
+
+# Server error raised when a RESTRICT foreign key blocks a delete
+ER_ROW_IS_REFERENCED = 1451
+
+
+class DeleteBlocked(ValueError):
+    """
+    Raised when a RESTRICT rule blocks a delete that looked possible in the preview.
+    """
+
+
+Dependents = namedtuple('Dependents', ['rule', 'count', 'names'])
+
+
+class DeletePreview:
+    """
+    One row about to be deleted and the rows depending on it.
+
+    Attributes:
+        table (str): Table of the row.
+        keys (tuple): Key values of the row (see DELETE_KEYS).
+        row (tuple): The row, as SELECT * returns it.
+        dependents (list): Dependents for every rule pointing at the table, including empty ones.
+    """
+
+    def __init__(self, table, keys, row, dependents):
+        self.table = table
+        self.keys = tuple(keys)
+        self.row = row
+        self.dependents = dependents
+
+    @property
+    def blocked_by(self):
+        """
+        Dependents of RESTRICT rules; the delete fails while there are any.
+        """
+        return [dependent for dependent in self.dependents if dependent.rule.action == 'RESTRICT' and dependent.count]
+
+    @property
+    def cascades_to(self):
+        """
+        Dependents of CASCADE rules; the delete removes them too.
+        """
+        return [dependent for dependent in self.dependents if dependent.rule.action == 'CASCADE' and dependent.count]
+
+    def count(self, table):
+        return sum(dependent.count for dependent in self.dependents if dependent.rule.table == table)
+
+
+def rules_for(table):
+    """
+    The rules whose parent is the given table, in DELETE_RULES order.
+    """
+    return [rule for rule in DELETE_RULES if rule.parent == table]
+
+
+def _where(keys, alias=None):
+    prefix = f"{alias}." if alias else ""
+    return " AND ".join(f"{prefix}{column} = %s" for column in keys)
+
+
+def preview_query(table):
+    """
+    The query returning a row with a count and a sample of names per dependent table.
+
+    Every dependent is a correlated subquery over the foreign key's index, so the whole
+    dependency report costs one round trip.
+
+    Returns:
+        str: Columns are count and names of every rule in rules_for(table), then the row itself.
+    """
+    columns = []
+    for rule in rules_for(table):
+        match = f"FROM {rule.table} d WHERE d.{rule.column} = p.{rule.parent_column}"
+        columns.append(f"(SELECT COUNT(*) {match})")
+        columns.append(f"(SELECT GROUP_CONCAT(DISTINCT d.{rule.label} ORDER BY d.{rule.label} SEPARATOR ', ' "
+                       f"LIMIT {DEPENDENT_SAMPLE}) {match})")
+    columns.append("p.*")
+    return f"SELECT {', '.join(columns)} FROM {table} p WHERE {_where(DELETE_KEYS[table], 'p')}"
+
+
+def load_delete_preview(cursor, table, keys):
+    """
+    Fetch a row and its dependency report.
+
+    Args:
+        cursor: Database cursor.
+        table (str): Table name, a key of DELETE_KEYS.
+        keys (tuple): Values of the table's key columns.
+
+    Returns:
+        DeletePreview: Or None if the row does not exist.
+    """
+    rules = rules_for(table)
+    cursor.execute(preview_query(table), tuple(keys))
+    result = cursor.fetchone()
+    if result is None:
+        return None
+
+    dependents = [Dependents(rule, int(result[2 * i] or 0), result[2 * i + 1] or "") for i, rule in enumerate(rules)]
+    return DeletePreview(table, keys, tuple(result[2 * len(rules):]), dependents)
+
+
+def delete_previewed(cursor, preview):
+    """
+    Delete a previewed row with one DELETE; the foreign key rules remove or protect its dependents.
+    Call before the commit, the summary table updates land in the same transaction.
+
+    Args:
+        cursor: Cursor of the connection the preview was loaded on.
+        preview (DeletePreview): The row to delete.
+
+    Returns:
+        int: Number of rows deleted (0 if it was already gone).
+
+    Raises:
+        DeleteBlocked: A RESTRICT rule blocked the delete.
+    """
+    # Cascaded tickets bypass the ticket write paths, take them out of the dashboard aggregates first
+    if preview.table == 'Events':
+        if preview.count('Tickets'):
+            record_event_tickets_deleted(cursor, preview.keys[0])
+        drop_event_inventory(cursor, "event_name = %s", preview.keys)
+    elif preview.table == 'Tickets':
+        # Counted from the row itself, under the delete's lock, rather than from the preview
+        release_deleted_tickets(cursor, _where(DELETE_KEYS['Tickets']), preview.keys)
+
+    try:
+        cursor.execute(f"DELETE FROM {preview.table} WHERE {_where(DELETE_KEYS[preview.table])}", preview.keys)
+    except Exception as e:
+        if getattr(e, 'errno', None) == ER_ROW_IS_REFERENCED:
+            raise DeleteBlocked(f"{preview.table} {', '.join(map(str, preview.keys))} is still referenced by other rows") from e
+        raise
+    deleted = cursor.rowcount
+
+    # row is (id, event_name, purchased_by, price)
+    if preview.table == 'Tickets' and deleted:
+        record_ticket_change(cursor, preview.row[1:], None)
+    return deleted
+
+
+def describe_dependents(dependents):
+    """
+    One line per dependent table, ex. "Tickets: 120 (4, 7, 9, ...)".
+    """
+    lines = []
+    for dependent in dependents:
+        more = ", ..." if dependent.count > DEPENDENT_SAMPLE else ""
+        lines.append(f"{dependent.rule.table}: {dependent.count} ({dependent.names}{more})")
+    return "\n".join(lines)
+
+
+def parse_key_list(table, text):
+    """
+    Parse pasted keys, one row per line. Composite keys are comma or tab separated in DELETE_KEYS order
+    (ex. "12, Summer Jam" for Tickets). Blank lines and repeated keys (also ones differing only in case) are skipped.
+
+    Args:
+        table (str): Table name, a key of DELETE_KEYS.
+        text (str): The pasted text.
+
+    Returns:
+        list: Key tuples, in the order given.
+
+    Raises:
+        ValueError: A line does not have one value per key column, or an ID is not a whole number.
+    """
+    columns = DELETE_KEYS[table]
+    keys = []
+    seen = set()
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        separator = '\t' if '\t' in line else ','
+        values = [value.strip() for value in line.split(separator, len(columns) - 1)] if len(columns) > 1 else [line.strip()]
+        if len(values) != len(columns) or not all(values):
+            raise ValueError(f"Line {number}: expected {', '.join(columns)}")
+        if columns[0] == 'id':
+            try:
+                values[0] = int(values[0])
+            except ValueError:
+                raise ValueError(f"Line {number}: ID must be a whole number")
+        key = tuple(values)
+        if _normalize(key) not in seen:
+            seen.add(_normalize(key))
+            keys.append(key)
+    return keys
+
+
+def _key_condition(columns, count, alias=None):
+    # "col IN (%s, ...)" for single-column keys, "(a, b) IN ((%s, %s), ...)" for composite ones
+    prefix = f"{alias}." if alias else ""
+    if len(columns) == 1:
+        return f"{prefix}{columns[0]} IN ({', '.join(['%s'] * count)})"
+    row = f"({', '.join(['%s'] * len(columns))})"
+    return f"({', '.join(prefix + column for column in columns)}) IN ({', '.join([row] * count)})"
+
+
+def _normalize(key):
+    # Key values as the server compares them: the default collation ignores case and trailing spaces
+    return tuple(value.rstrip().casefold() if isinstance(value, str) else value for value in key)
+
+
+def _chunks(keys, size=BULK_DELETE_CHUNK):
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+class BulkDeleteImpact:
+    """
+    What deleting many keys of one table would do.
+
+    Attributes:
+        table (str): Table of the keys.
+        keys (list): The requested key tuples.
+        found (int): How many of them exist.
+        dependents (dict): Rule -> {parent key value: number of dependent rows}, for every rule pointing at the table.
+    """
+
+    def __init__(self, table, keys):
+        self.table = table
+        self.keys = keys
+        self.found = 0
+        self.dependents = {rule: {} for rule in rules_for(table)}
+
+    @property
+    def blocked_keys(self):
+        """
+        Keys that a RESTRICT rule keeps from being deleted, normalized (see _normalize): the
+        dependents report the parent value as stored, which may differ in case or trailing spaces
+        from the requested key.
+        """
+        blocked = set()
+        for rule, counts in self.dependents.items():
+            if rule.action == 'RESTRICT':
+                blocked.update(_normalize((value,)) for value in counts)
+        return blocked
+
+    @property
+    def deletable(self):
+        """
+        The requested keys without the blocked ones, in the order given.
+        """
+        blocked = self.blocked_keys
+        return [key for key in self.keys if _normalize(key) not in blocked]
+
+    def count(self, rule):
+        return sum(self.dependents[rule].values())
+
+    def describe(self):
+        """
+        Printable summary for the confirmation dialog.
+        """
+        lines = [f"{self.found} of {len(self.keys)} {self.table} entries found"]
+        for rule in self.dependents:
+            rows = self.count(rule)
+            if not rows:
+                continue
+            parents = len(self.dependents[rule])
+            if rule.action == 'CASCADE':
+                lines.append(f"WILL ALSO DELETE {rows} {rule.table} entries")
+            else:
+                sample = ', '.join(str(value) for value in list(self.dependents[rule])[:DEPENDENT_SAMPLE])
+                lines.append(f"{parents} of them are kept because they still have {rows} {rule.table} entries ({sample}"
+                             f"{', ...' if parents > DEPENDENT_SAMPLE else ''})")
+        return "\n".join(lines)
+
+
+def bulk_delete_impact_query(table, count):
+    """
+    One grouped query over a chunk of keys: how many exist, and the dependent rows of every rule per key.
+
+    Returns:
+        str: Rows are (rule index, key value, count); rule index -1 is the number of existing keys.
+    """
+    columns = DELETE_KEYS[table]
+    branches = [f"SELECT -1, NULL, COUNT(*) FROM {table} WHERE {_key_condition(columns, count)}"]
+    for index, rule in enumerate(rules_for(table)):
+        branches.append(f"SELECT {index}, d.{rule.column}, COUNT(*) FROM {rule.table} d "
+                        f"WHERE {_key_condition((rule.column,), count, 'd')} GROUP BY d.{rule.column}")
+    return "\nUNION ALL\n".join(branches)
+
+
+def load_bulk_delete_impact(cursor, table, keys):
+    """
+    Compute the impact of deleting many keys, one grouped query per BULK_DELETE_CHUNK keys.
+
+    Args:
+        cursor: Database cursor.
+        table (str): Table name, a key of DELETE_KEYS.
+        keys (list): Key tuples (see parse_key_list).
+
+    Returns:
+        BulkDeleteImpact
+    """
+    impact = BulkDeleteImpact(table, keys)
+    rules = rules_for(table)
+    branches = len(rules) + 1
+    for chunk in _chunks(keys):
+        values = tuple(value for key in chunk for value in key)
+        cursor.execute(bulk_delete_impact_query(table, len(chunk)), values * branches if rules else values)
+        for index, value, count in cursor.fetchall():
+            if index < 0:
+                impact.found += int(count)
+            else:
+                impact.dependents[rules[index]][value] = int(count)
+    return impact
+
+
+def bulk_delete(cursor, table, keys, progress=None):
+    """
+    Delete many keys with chunked DELETE ... IN statements. Call commit afterwards; everything is one transaction.
+    Cascaded and deleted tickets are taken out of the dashboard summary tables and the inventory counters chunk by chunk.
+
+    Args:
+        cursor: Database cursor.
+        table (str): Table name, a key of DELETE_KEYS.
+        keys (list): Key tuples, usually BulkDeleteImpact.deletable.
+        progress (function): Optional callback receiving the number of keys processed so far.
+
+    Returns:
+        int: Number of rows deleted.
+
+    Raises:
+        DeleteBlocked: A RESTRICT rule blocked one of the deletes; nothing should be committed.
+    """
+    columns = DELETE_KEYS[table]
+    deleted = 0
+    done = 0
+    for chunk in _chunks(keys):
+        condition = _key_condition(columns, len(chunk))
+        values = tuple(value for key in chunk for value in key)
+        # Both key conditions also select the affected rows of Tickets
+        if table in ('Tickets', 'Events'):
+            record_tickets_deleted(cursor, condition, values)
+        if table == 'Tickets':
+            release_deleted_tickets(cursor, condition, values)
+        elif table == 'Events':
+            drop_event_inventory(cursor, condition, values)
+
+        try:
+            cursor.execute(f"DELETE FROM {table} WHERE {condition}", values)
+        except Exception as e:
+            if getattr(e, 'errno', None) == ER_ROW_IS_REFERENCED:
+                raise DeleteBlocked(f"Some {table} entries gained dependent rows since the check, nothing was deleted") from e
+            raise
+        deleted += cursor.rowcount
+        done += len(chunk)
+        if progress is not None:
+            progress(done)
+    return deleted
+
+
+def apply_delete_rules(cursor):
+    """
+    Recreate the foreign keys of an existing database with the ON DELETE rules of DELETE_RULES.
+
+    Returns:
+        int: Number of foreign keys recreated.
+    """
+    cursor.execute('''
+        SELECT TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL
+    ''')
+    constraints = {(table, column): name for table, column, name in cursor.fetchall()}
+
+    for rule in DELETE_RULES:
+        name = constraints.get((rule.table, rule.column))
+        if name is not None:
+            cursor.execute(f"ALTER TABLE {rule.table} DROP FOREIGN KEY {name}")
+        cursor.execute(f"ALTER TABLE {rule.table} ADD FOREIGN KEY ({rule.column}) "
+                       f"REFERENCES {rule.parent}({rule.parent_column}) ON DELETE {rule.action}")
+        print(f"applied: {rule.table}.{rule.column} -> {rule.parent}.{rule.parent_column} ON DELETE {rule.action}")
+    return len(DELETE_RULES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the ON DELETE rules of the foreign keys.")
+    parser.add_argument('--apply', action='store_true', help="recreate the foreign keys with the rules of DELETE_RULES")
+    parser.add_argument('--config', default="my_config.ini", help="config file with the [db_info] section")
+    args = parser.parse_args()
+
+    if not args.apply:
+        for rule in DELETE_RULES:
+            print(f"{rule.table}.{rule.column} -> {rule.parent}.{rule.parent_column} ON DELETE {rule.action}")
+        return
+
+    init_pool(**load_db_config(args.config))
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        apply_delete_rules(cursor)
+        cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+# export.py
+# This file contains the streaming export of tables and search results for the Ticket Apprentice application
+# Functionality includes:
+# - Exporting any table (the Search All tab) or a Search Tickets result
+# - Writing CSV, or Parquet when pyarrow is installed
+# - Streaming rows from an unbuffered cursor batch by batch, so memory use does not grow with the table
+# - A command line entry point (run `python export.py --help`)
+#
+# Files are written to <path>.part and renamed when complete, so a failed or
+# stopped export never leaves a truncated file behind.
+
+import argparse
+import csv
+import os
+import time
+
+from pagination import TABLE_PRIMARY_KEYS
+from queries import build_ticket_search_query
+from streaming import QueryStream
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+
+DEFAULT_EXPORT_BATCH_SIZE = 10000
+
+
+def export_format(path):
+    """
+    Pick the export format from the file extension.
+
+    Returns:
+        str: 'csv' or 'parquet'
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('parquet', 'pq'):
+        return 'parquet'
+    if extension in ('csv', ''):
+        return 'csv'
+    raise ValueError(f"Cannot export to .{extension} files, use .csv or .parquet")
+
+
+class CsvExportWriter:
+    def __init__(self, path, columns, description):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExportWriter:
+    """
+    Writes every batch as its own Parquet row group, with the schema taken from the
+    cursor description so a column that starts with NULLs keeps its real type.
+    """
+
+    def __init__(self, path, columns, description):
+        self._schema = pa.schema([(name, self._arrow_type(column[1])) for name, column in zip(columns, description)])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    @staticmethod
+    def _arrow_type(type_code):
+        from mariadb.constants import FIELD_TYPE
+
+        if type_code in (FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.INT24,
+                         FIELD_TYPE.LONGLONG, FIELD_TYPE.YEAR):
+            return pa.int64()
+        if type_code in (FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE, FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL):
+            return pa.float64()
+        if type_code in (FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE):
+            return pa.date32()
+        if type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+            return pa.timestamp('us')
+        if type_code == FIELD_TYPE.TIME:
+            return pa.duration('us')  # the connector returns TIME columns as timedelta
+        return pa.string()
+
+    def write(self, rows):
+        arrays = []
+        for index, field in enumerate(self._schema):
+            values = [row[index] for row in rows]
+            if pa.types.is_floating(field.type):
+                values = [None if value is None else float(value) for value in values]
+            elif pa.types.is_string(field.type):
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+EXPORT_WRITERS = {'csv': CsvExportWriter, 'parquet': ParquetExportWriter}
+
+
+def export_query(query, values, path, batch_size=DEFAULT_EXPORT_BATCH_SIZE, progress=None, cancelled=None):
+    """
+    Stream the rows of a query into a CSV or Parquet file.
+
+    Args:
+        query (str): The SQL query to export.
+        values (tuple or list): Parameters for the query.
+        path (str): Output file; .parquet writes Parquet, anything else CSV.
+        batch_size (int): Rows per fetchmany call (and per Parquet row group).
+        progress (callable): Optional progress(rows_written) called after every batch.
+        cancelled (callable): Optional function returning True to stop the export early.
+
+    Returns:
+        int: Number of rows written, or None if the export was stopped.
+    """
+    file_format = export_format(path)
+    if file_format == 'parquet' and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow); export to .csv instead")
+    writer_class = EXPORT_WRITERS[file_format]
+    partial_path = path + ".part"
+    written = 0
+    completed = False
+
+    try:
+        with QueryStream(query, values, batch_size) as stream:
+            writer = writer_class(partial_path, stream.columns, stream.description)
+            try:
+                for rows in stream.batches():
+                    if cancelled is not None and cancelled():
+                        break
+                    writer.write(rows)
+                    written += len(rows)
+                    if progress is not None:
+                        progress(written)
+                else:
+                    completed = True
+            finally:
+                writer.close()
+
+        if completed:
+            os.replace(partial_path, path)
+            return written
+        return None
+    finally:
+        if not completed and os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def table_export_query(table_name):
+    """
+    SELECT for a whole table in primary key order (the Search All tab's order).
+    """
+    if table_name not in TABLE_PRIMARY_KEYS:
+        raise ValueError(f"Unknown table {table_name}")
+    return f"SELECT * FROM {table_name} ORDER BY {', '.join(TABLE_PRIMARY_KEYS[table_name])}"
+
+
+def export_table(table_name, path, batch_size=DEFAULT_EXPORT_BATCH_SIZE, progress=None, cancelled=None):
+    """
+    Export every row of a table (see export_query).
+    """
+    return export_query(table_export_query(table_name), (), path, batch_size, progress, cancelled)
+
+
+def export_ticket_search(filters, path, batch_size=DEFAULT_EXPORT_BATCH_SIZE, progress=None, cancelled=None):
+    """
+    Export a Search Tickets result (see export_query).
+
+    Args:
+        filters (tuple): (min_price, max_price, not_purchased, cities) as passed to build_ticket_search_query.
+    """
+    query, values = build_ticket_search_query(*filters)
+    return export_query(query, values, path, batch_size, progress, cancelled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a table or a ticket search to CSV or Parquet.")
+    parser.add_argument('path', help="output file (.csv or .parquet)")
+    parser.add_argument('--table', help="export this whole table")
+    parser.add_argument('--min-price', type=float, default=0, help="ticket search: minimum price")
+    parser.add_argument('--max-price', type=float, help="ticket search: maximum price")
+    parser.add_argument('--not-purchased', action='store_true', help="ticket search: only unsold tickets")
+    parser.add_argument('--city', action='append', default=[], help="ticket search: venue city (repeatable)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_EXPORT_BATCH_SIZE, help="rows per batch")
+    args = parser.parse_args()
+
+    def show_progress(written):
+        print(f"{written:,} rows written", end='\r')
+
+    started = time.monotonic()
+    try:
+        if args.table:
+            written = export_table(args.table, args.path, args.batch_size, show_progress)
+        else:
+            filters = (args.min_price, args.max_price, args.not_purchased, args.city)
+            written = export_ticket_search(filters, args.path, args.batch_size, show_progress)
+    except (ValueError, RuntimeError) as e:
+        parser.exit(1, f"Error: {e}\n")
+
+    elapsed = time.monotonic() - started
+    print(f"\nExported {written:,} rows to {args.path} in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
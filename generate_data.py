@@ -0,0 +1,350 @@
+# generate_data.py
+# This file contains the synthetic data generator for the Ticket Apprentice schema
+# Functionality includes:
+# - Deterministic, seedable rows for every table in populate_tables.sql
+# - Configurable row counts and skew: a few events sell most tickets, a few users buy most of them
+# - Writing CSV files in the bulk_import.py format, or loading straight into the database
+#
+# Usage: python generate_data.py --out data/ --users 100000 --events 2000 --tickets 5000000
+#        python generate_data.py --load --replace --tickets 1000000
+#
+# The same seed and counts always give the same rows. Every table draws from its own
+# random stream, so changing one count does not reshuffle the other tables.
+
+import argparse
+import bisect
+import csv
+import datetime
+import itertools
+import os
+import random
+import time
+from collections import namedtuple
+
+from db_pool import get_connection
+from bulk_import import IMPORT_ORDER, TABLE_SPECS
+from aggregates import CREATE_AGGREGATE_TABLES, rebuild_aggregates
+from ticket_ids import CREATE_SEQUENCE_TABLE, rebuild_ticket_sequences
+from inventory import CREATE_INVENTORY_TABLE, rebuild_inventory
+
+
+DEFAULT_BATCH_SIZE = 10000
+
+CITIES = ['New York', 'London', 'Los Angeles', 'Chicago', 'Berlin', 'Tokyo', 'Paris', 'Toronto', 'Sydney',
+          'Seattle', 'Austin', 'Nashville', 'Mexico City', 'Madrid', 'Amsterdam', 'Dublin', 'Spokane', 'Denver']
+VENUE_KINDS = [('Stadium', 30000, 90000), ('Arena', 8000, 25000), ('Amphitheater', 5000, 20000),
+               ('Hall', 1500, 8000), ('Theater', 500, 3000), ('Club', 100, 1000)]
+EVENT_WORDS = ['Summer', 'Winter', 'Electric', 'Midnight', 'Golden', 'Neon', 'Acoustic', 'Grand', 'Wild', 'Silver']
+EVENT_KINDS = ['Festival', 'Tour', 'Live', 'Sessions', 'Jam', 'Showcase', 'Nights', 'Revival']
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Casey', 'Riley', 'Jamie', 'Morgan', 'Avery', 'Quinn', 'Drew', 'Robin']
+LAST_NAMES = ['Smith', 'Garcia', 'Nguyen', 'Kim', 'Brown', 'Lopez', 'Patel', 'Martin', 'Silva', 'Cohen', 'Novak', 'Ito']
+GENRES = ['Rock', 'Pop', 'Jazz', 'Soul', 'Metal', 'Folk', 'Indie', 'Blues', 'Punk', 'Disco']
+
+GeneratorConfig = namedtuple('GeneratorConfig', [
+    'seed', 'users', 'venues', 'groups', 'performers', 'events', 'tickets',
+    'event_skew',    # Zipf exponent for ticket volume per event (0 = uniform)
+    'buyer_skew',    # Zipf exponent for tickets bought per user
+    'sell_through',  # share of tickets sold at the most popular event; falls off with popularity
+])
+
+DEFAULT_CONFIG = GeneratorConfig(seed=321, users=10000, venues=200, groups=500, performers=1500, events=1000,
+                                 tickets=1000000, event_skew=1.1, buyer_skew=1.2, sell_through=0.9)
+
+
+def _rng(config, table):
+    # One independent stream per table (str seeds are hashed deterministically by random)
+    return random.Random(f"{config.seed}:{table}")
+
+
+def zipf_cum_weights(count, skew):
+    """
+    Cumulative Zipf weights for ranks 1..count, for random.choices(cum_weights=...) or bisect.
+    """
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+def _random_date(rng, first_year, last_year):
+    start = datetime.date(first_year, 1, 1).toordinal()
+    end = datetime.date(last_year, 12, 31).toordinal()
+    return datetime.date.fromordinal(rng.randint(start, end)).isoformat()
+
+
+class SyntheticData:
+    """
+    Row generators for every table. Small tables are kept in memory so the large ones can refer
+    to them; tickets are generated lazily, so any number of them can be streamed out.
+    """
+
+    def __init__(self, config=DEFAULT_CONFIG):
+        self.config = config
+        self._venues = self._make_venues()
+        self._events = self._make_events()
+        self._ticket_counts = self._plan_ticket_counts()
+
+    def _make_venues(self):
+        rng = _rng(self.config, 'Venue')
+        city_weights = zipf_cum_weights(len(CITIES), 0.8)
+        venues = []
+        for i in range(1, self.config.venues + 1):
+            kind, low, high = rng.choice(VENUE_KINDS)
+            city = rng.choices(CITIES, cum_weights=city_weights)[0]
+            venues.append((f"{city} {rng.choice(EVENT_WORDS)} {kind} {i}", city, rng.randint(low, high)))
+        return venues
+
+    def _make_events(self):
+        rng = _rng(self.config, 'Events')
+        events = []
+        for i in range(1, self.config.events + 1):
+            venue_name = rng.choice(self._venues)[0]
+            name = f"{rng.choice(EVENT_WORDS)} {rng.choice(GENRES)} {rng.choice(EVENT_KINDS)} {i}"
+            start_time = f"{rng.choice([12, 14, 17, 18, 19, 20, 21])}:{rng.choice(['00', '30'])}:00"
+            events.append((name, venue_name, _random_date(rng, 1965, 2030), start_time))
+        return events
+
+    def _plan_ticket_counts(self):
+        # Spread the ticket total over events by Zipf rank, capped at each venue's capacity.
+        # Ranks are shuffled so popularity does not follow the event numbering.
+        rng = _rng(self.config, 'popularity')
+        venue_capacity = {venue_name: capacity for venue_name, _, capacity in self._venues}
+        capacity = [venue_capacity[event[1]] for event in self._events]
+        ranks = list(range(1, len(self._events) + 1))
+        rng.shuffle(ranks)
+
+        if self.config.tickets > sum(capacity):
+            raise ValueError(f"{self.config.tickets:,} tickets do not fit in the {sum(capacity):,} seats of "
+                             f"{len(self._events):,} events; add events or venues, or ask for fewer tickets")
+
+        weights = [1.0 / (rank ** self.config.event_skew) for rank in ranks]
+        counts = [0] * len(self._events)
+        remaining = self.config.tickets
+        # Tickets cut off by a full venue go to the events that still have seats, by popularity,
+        # until every ticket is placed
+        while remaining > 0:
+            open_events = [i for i in range(len(counts)) if counts[i] < capacity[i]]
+            scale = remaining / sum(weights[i] for i in open_events)
+            placed = 0
+            for i in open_events:
+                share = min(int(weights[i] * scale), capacity[i] - counts[i])
+                counts[i] += share
+                placed += share
+            if placed == 0:
+                # Fewer tickets left than open events: one more each, most popular first
+                for i in sorted(open_events, key=lambda i: ranks[i])[:remaining]:
+                    counts[i] += 1
+                placed = min(remaining, len(open_events))
+            remaining -= placed
+        return list(zip(counts, ranks))
+
+    def planned_tickets(self):
+        return sum(count for count, _ in self._ticket_counts)
+
+    def venues(self):
+        return iter(self._venues)
+
+    def events(self):
+        return iter(self._events)
+
+    def users(self):
+        rng = _rng(self.config, 'Users')
+        for user_id in range(1, self.config.users + 1):
+            name = f"{rng.choice(FIRST_NAMES)}{rng.choice(LAST_NAMES)}{user_id}"
+            yield user_id, name, rng.randint(2000000000, 9999999999), _random_date(rng, 1940, 2010)
+
+    def groups(self):
+        rng = _rng(self.config, 'Groups')
+        for i in range(1, self.config.groups + 1):
+            yield f"The {rng.choice(EVENT_WORDS)} {rng.choice(GENRES)} Band {i}", _random_date(rng, 1955, 2022)
+
+    def group_names(self):
+        return [group_name for group_name, _ in self.groups()]
+
+    def performers(self):
+        rng = _rng(self.config, 'IndividualPerformers')
+        for i in range(1, self.config.performers + 1):
+            individual_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            yield f"{individual_name.split()[0]}{rng.choice(GENRES)}{i}", individual_name, rng.randint(16, 85)
+
+    def memberships(self):
+        # Most performers are in one group, some in two
+        rng = _rng(self.config, 'Memberships')
+        group_names = self.group_names()
+        if not group_names:
+            return
+        for stage_name, _, _ in self.performers():
+            for group_name in rng.sample(group_names, min(len(group_names), rng.choice([1, 1, 1, 2]))):
+                yield stage_name, group_name
+
+    def performance_list(self):
+        # Headliner plus up to two openers per event
+        rng = _rng(self.config, 'PerformanceList')
+        group_names = self.group_names()
+        if not group_names:
+            return
+        for event_name, _, _, _ in self._events:
+            for group_name in rng.sample(group_names, min(len(group_names), rng.randint(1, 3))):
+                yield event_name, group_name
+
+    def tickets(self):
+        """
+        Tickets numbered from 1 within each event. Popular events sell a larger share of their
+        tickets, and buyers are drawn by Zipf rank so a few heavy buyers hold many tickets.
+        """
+        rng = _rng(self.config, 'Tickets')
+        buyer_weights = zipf_cum_weights(self.config.users, self.config.buyer_skew)
+        buyer_total = buyer_weights[-1] if buyer_weights else 0
+        # Shuffle which user ids are the heavy buyers
+        buyer_ids = list(range(1, self.config.users + 1))
+        _rng(self.config, 'buyers').shuffle(buyer_ids)
+
+        for (event_name, _, _, _), (count, rank) in zip(self._events, self._ticket_counts):
+            base_price = round(rng.lognormvariate(4.2, 0.6), 2)
+            sell_through = self.config.sell_through / (rank ** 0.3) if buyer_ids else 0
+            tiers = [(round(base_price * 2.5, 2), 0.1), (round(base_price * 1.5, 2), 0.3), (base_price, 1.0)]
+            for ticket_id in range(1, count + 1):
+                position = ticket_id / count
+                price = next(tier_price for tier_price, share in tiers if position <= share)
+                if rng.random() < sell_through:
+                    buyer = buyer_ids[bisect.bisect_left(buyer_weights, rng.random() * buyer_total)]
+                else:
+                    buyer = None
+                yield ticket_id, event_name, buyer, price
+
+    def rows(self, table):
+        """
+        Rows for a table in bulk_import column order.
+        """
+        return {
+            'Venue': self.venues, 'Users': self.users, 'Groups': self.groups,
+            'IndividualPerformers': self.performers, 'Events': self.events, 'Memberships': self.memberships,
+            'PerformanceList': self.performance_list, 'Tickets': self.tickets,
+        }[table]()
+
+
+def _batches(rows, batch_size):
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def write_csv(data, directory, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Write <Table>.csv files that bulk_import.py can load.
+
+    Returns:
+        dict: Table name -> rows written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = {}
+    for table in IMPORT_ORDER:
+        count = 0
+        with open(os.path.join(directory, f"{table}.csv"), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(TABLE_SPECS[table].columns)
+            for batch in _batches(data.rows(table), batch_size):
+                writer.writerows(['' if value is None else value for value in row] for row in batch)
+                count += len(batch)
+                if progress is not None:
+                    progress(table, count)
+        written[table] = count
+    return written
+
+
+def clear_tables(conn):
+    """
+    Delete every row from the schema's tables, children first.
+    """
+    cursor = conn.cursor()
+    try:
+        for statement in CREATE_AGGREGATE_TABLES + [CREATE_SEQUENCE_TABLE, CREATE_INVENTORY_TABLE]:
+            cursor.execute(statement)
+        for table in ['UserTicketStats', 'EventRevenueStats', 'TicketSequences', 'EventInventory'] + IMPORT_ORDER[::-1]:
+            cursor.execute(f"DELETE FROM {table}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def load_database(data, conn, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Insert the generated rows with batched executemany, committing every batch.
+    The rows are consistent by construction, so unique and foreign key checks are
+    switched off for this session while loading.
+
+    Returns:
+        dict: Table name -> rows inserted.
+    """
+    cursor = conn.cursor()
+    loaded = {}
+    try:
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        cursor.execute("SET SESSION unique_checks = 0")
+        for table in IMPORT_ORDER:
+            columns = TABLE_SPECS[table].columns
+            query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+            count = 0
+            for batch in _batches(data.rows(table), batch_size):
+                cursor.executemany(query, batch)
+                conn.commit()
+                count += len(batch)
+                if progress is not None:
+                    progress(table, count)
+            loaded[table] = count
+
+        rebuild_ticket_sequences(cursor)
+        conn.commit()
+    finally:
+        cursor.execute("SET SESSION foreign_key_checks = 1")
+        cursor.execute("SET SESSION unique_checks = 1")
+        cursor.close()
+
+    rebuild_aggregates(conn)
+    rebuild_inventory(conn)
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Ticket Apprentice data.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--out', help="write <Table>.csv files to this directory")
+    target.add_argument('--load', action='store_true', help="insert straight into the configured database")
+    parser.add_argument('--replace', action='store_true', help="with --load, delete the existing rows first")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per batch")
+    for field in GeneratorConfig._fields:
+        default = getattr(DEFAULT_CONFIG, field)
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default,
+                            help=f"default: {default}")
+    args = parser.parse_args()
+
+    try:
+        data = SyntheticData(GeneratorConfig(*(getattr(args, field) for field in GeneratorConfig._fields)))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Generating {data.planned_tickets():,} tickets for {args.events:,} events")
+
+    def show_progress(table, count):
+        print(f"{table}: {count:,} rows", end='\r')
+
+    started = time.monotonic()
+    if args.out:
+        counts = write_csv(data, args.out, args.batch_size, show_progress)
+    else:
+        conn = get_connection()
+        try:
+            if args.replace:
+                clear_tables(conn)
+            counts = load_database(data, conn, args.batch_size, show_progress)
+        finally:
+            conn.close()
+
+    elapsed = time.monotonic() - started
+    print()
+    for table, count in counts.items():
+        print(f"{table}: {count:,} rows")
+    print(f"{sum(counts.values()):,} rows in {elapsed:.1f}s ({sum(counts.values()) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+/**********************************************************************
+ * DESCRIPTION: Secondary indexes for the hot query shapes.
+ * Run after populate_tables.sql (or against an existing database);
+ * every statement is safe to re-run. Verify with `python check_indexes.py`.
+ **********************************************************************/
+
+-- Update probes and delete previews (Tickets WHERE purchased_by = %s) and the per-user
+-- dashboard aggregation. Covers price so spend totals never touch the rows.
+-- Also serves the purchased_by foreign key.
+CREATE INDEX IF NOT EXISTS idx_tickets_purchased_by_price ON Tickets (purchased_by, price);
+
+-- Search Tickets price range. With the primary key (id, event_name) stored in
+-- every InnoDB secondary index this covers the whole search select list.
+CREATE INDEX IF NOT EXISTS idx_tickets_price ON Tickets (price, purchased_by);
+
+-- Per-event work: the event join, revenue by event and deleting an event's
+-- tickets (ON DELETE CASCADE). Also serves the event_name foreign key.
+CREATE INDEX IF NOT EXISTS idx_tickets_event_purchased_by ON Tickets (event_name, purchased_by, price);
+
+-- Search Tickets city filter and the city listbox
+CREATE INDEX IF NOT EXISTS idx_venue_city ON Venue (city);
+
+-- Venue delete preview (Events WHERE venue_name = %s) and the Venue -> Events join
+CREATE INDEX IF NOT EXISTS idx_events_venue_name ON Events (venue_name);
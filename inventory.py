@@ -0,0 +1,352 @@
+# inventory.py
+# This file contains the per-event ticket inventory counters of the Ticket Apprentice application
+# Functionality includes:
+# - An EventInventory table holding the number of tickets issued and sold for every event
+# - Venue capacity enforcement with one conditional UPDATE per sale (no COUNT over Tickets)
+# - Incremental maintenance from the ticket insert, purchase and delete paths
+# - Checks that a venue change or capacity change still fits the tickets already issued
+# - A full rebuild (run `python inventory.py --rebuild`)
+#
+# The counters are updated with the same cursor as the ticket write, before its commit, so both
+# land in one transaction. Issuing is "UPDATE ... WHERE tickets_issued + n <= capacity": the
+# check and the increment happen under the counter row's lock, so concurrent sellers of one event
+# queue on that row and can never issue more tickets than the venue has seats.
+
+import argparse
+
+from db_pool import get_connection
+
+
+# Also created by populate_tables.sql
+CREATE_INVENTORY_TABLE = '''
+CREATE TABLE IF NOT EXISTS EventInventory (
+    event_name VARCHAR(100),
+    tickets_issued INT NOT NULL,
+    tickets_sold INT NOT NULL,
+    PRIMARY KEY (event_name)
+)
+'''
+
+# Take n seats if the venue still has them; affects no row when it does not
+issue_tickets_query = '''
+UPDATE EventInventory i
+JOIN Events e ON e.event_name = i.event_name
+JOIN Venue v ON v.venue_name = e.venue_name
+SET i.tickets_issued = i.tickets_issued + %s, i.tickets_sold = i.tickets_sold + %s
+WHERE i.event_name = %s AND i.tickets_issued + %s <= v.capacity
+'''
+
+release_tickets_query = '''
+UPDATE EventInventory SET tickets_issued = tickets_issued - %s, tickets_sold = tickets_sold - %s
+WHERE event_name = %s
+'''
+
+sell_tickets_query = "UPDATE EventInventory SET tickets_sold = tickets_sold + %s WHERE event_name = %s"
+
+create_event_inventory_query = '''
+INSERT INTO EventInventory (event_name, tickets_issued, tickets_sold) VALUES (%s, 0, 0)
+ON DUPLICATE KEY UPDATE tickets_issued = 0, tickets_sold = 0
+'''
+
+# First sale of an event created before the counters existed (or by another client): count its
+# tickets once. If another client created the row in the meantime the duplicate key keeps theirs
+create_inventory_query = '''
+INSERT INTO EventInventory (event_name, tickets_issued, tickets_sold)
+SELECT e.event_name, COUNT(t.id), COUNT(t.purchased_by)
+FROM Events e LEFT JOIN Tickets t ON t.event_name = e.event_name
+WHERE e.event_name = %s
+GROUP BY e.event_name
+ON DUPLICATE KEY UPDATE tickets_issued = tickets_issued
+'''
+
+inventory_query = '''
+SELECT v.capacity, i.tickets_issued, i.tickets_sold
+FROM EventInventory i
+JOIN Events e ON e.event_name = i.event_name
+JOIN Venue v ON v.venue_name = e.venue_name
+WHERE i.event_name = %s
+'''
+
+# Issued counts of a venue's events, largest first
+venue_inventory_query = '''
+SELECT i.event_name, i.tickets_issued
+FROM Events e JOIN EventInventory i ON i.event_name = e.event_name
+WHERE e.venue_name = %s
+ORDER BY i.tickets_issued DESC
+'''
+
+
+class CapacityExceeded(ValueError):
+    """
+    Issuing the tickets would put more tickets on an event than its venue has seats.
+    """
+
+    def __init__(self, event_name, capacity, issued, requested):
+        self.event_name = event_name
+        self.capacity = capacity
+        self.issued = issued
+        self.requested = requested
+        available = max(capacity - issued, 0)
+        if available == 0:
+            message = f"{event_name} is sold out: all {capacity} seats of its venue already have a ticket"
+        else:
+            message = f"{event_name} only has {available} of {capacity} seats without a ticket, {requested} requested"
+        super().__init__(message)
+
+
+def _sold(ticket):
+    # ticket is (event_name, purchased_by, price)
+    return 1 if ticket[1] is not None else 0
+
+
+def create_event_inventory(cursor, event_name):
+    """
+    Start the counters of a new event at zero. Call with the cursor that inserted the event.
+    """
+    cursor.execute(create_event_inventory_query, (event_name,))
+
+
+def lock_inventory(cursor, event_name):
+    """
+    Read and lock an event's counters until the end of the transaction, creating them if missing.
+
+    Returns:
+        tuple: (venue capacity, tickets issued, tickets sold), or None if the event does not exist or has no venue.
+    """
+    cursor.execute(inventory_query + " FOR UPDATE", (event_name,))
+    row = cursor.fetchone()
+    if row is None:
+        cursor.execute(create_inventory_query, (event_name,))
+        cursor.execute(inventory_query + " FOR UPDATE", (event_name,))
+        row = cursor.fetchone()
+    return row
+
+
+def issue_tickets(cursor, event_name, count, sold=0):
+    """
+    Count count new tickets (sold of them purchased) against an event's venue capacity.
+    Call with the cursor inserting the tickets, before the commit.
+
+    Args:
+        cursor: Cursor of the connection inserting the tickets.
+        event_name (str): The event the tickets belong to.
+        count (int): Number of tickets being inserted.
+        sold (int): How many of them have a buyer.
+
+    Returns:
+        None
+
+    Raises:
+        CapacityExceeded: The venue does not have count seats left; nothing was counted.
+        ValueError: The event does not exist or has no venue.
+    """
+    if count <= 0:
+        return
+    values = (count, sold, event_name, count)
+    cursor.execute(issue_tickets_query, values)
+    if cursor.rowcount:
+        return
+
+    # No row changed: the venue is full, or the event has no counters yet
+    cursor.execute(inventory_query, (event_name,))
+    row = cursor.fetchone()
+    if row is None:
+        cursor.execute(create_inventory_query, (event_name,))
+        cursor.execute(issue_tickets_query, values)
+        if cursor.rowcount:
+            return
+        cursor.execute(inventory_query, (event_name,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Event name {event_name} does not exist or has no venue. Please select a valid event.")
+    raise CapacityExceeded(event_name, row[0], row[1], count)
+
+
+def release_tickets(cursor, event_name, count, sold=0):
+    """
+    Give back the seats of count deleted tickets (sold of them purchased).
+    """
+    cursor.execute(release_tickets_query, (count, sold, event_name))
+
+
+def record_inventory_change(cursor, old_ticket, new_ticket):
+    """
+    Apply one ticket insert, update (ex. a purchase) or delete to the counters.
+    Same arguments as aggregates.record_ticket_change; call it next to that one, before the commit.
+
+    Args:
+        cursor: Cursor of the connection performing the ticket write.
+        old_ticket (tuple): (event_name, purchased_by, price) before the write, or None for an insert.
+        new_ticket (tuple): (event_name, purchased_by, price) after the write, or None for a delete.
+
+    Returns:
+        None
+
+    Raises:
+        CapacityExceeded: The ticket is new to its event and the venue is full.
+    """
+    if old_ticket is not None and new_ticket is not None and old_ticket[0] == new_ticket[0]:
+        change = _sold(new_ticket) - _sold(old_ticket)
+        if change:
+            cursor.execute(sell_tickets_query, (change, new_ticket[0]))
+        return
+
+    # Take the new seat first, so a full venue fails before anything else is written
+    if new_ticket is not None:
+        issue_tickets(cursor, new_ticket[0], 1, _sold(new_ticket))
+    if old_ticket is not None:
+        release_tickets(cursor, old_ticket[0], 1, _sold(old_ticket))
+
+
+def issue_inserted_tickets(cursor, tickets):
+    """
+    Count many new tickets with one capacity-checked update per event.
+    Call with the same cursor, before the commit of the ticket inserts.
+
+    Args:
+        cursor: Cursor of the connection inserting the tickets.
+        tickets (iterable): (event_name, purchased_by, price) tuples.
+
+    Raises:
+        CapacityExceeded: One of the events does not have the seats; roll the inserts back.
+    """
+    by_event = {}
+    for ticket in tickets:
+        count, sold = by_event.get(ticket[0], (0, 0))
+        by_event[ticket[0]] = (count + 1, sold + _sold(ticket))
+    # Always lock the counter rows in the same order, so two imports cannot deadlock on them
+    for event_name in sorted(by_event):
+        count, sold = by_event[event_name]
+        issue_tickets(cursor, event_name, count, sold)
+
+
+def release_deleted_tickets(cursor, condition, values):
+    """
+    Give back the seats of the tickets matching a condition, with one grouped update.
+    Call before those tickets are deleted, in the same transaction.
+
+    Args:
+        cursor: Cursor of the connection deleting the tickets.
+        condition (str): SQL condition on Tickets selecting the tickets (ex. "id = %s AND event_name = %s").
+        values (tuple): Parameters of the condition.
+
+    Returns:
+        None
+    """
+    cursor.execute(f'''
+        UPDATE EventInventory i
+        JOIN (
+            SELECT event_name, COUNT(*) AS removed_count, COUNT(purchased_by) AS removed_sold
+            FROM Tickets
+            WHERE {condition}
+            GROUP BY event_name
+        ) AS removed ON removed.event_name = i.event_name
+        SET i.tickets_issued = i.tickets_issued - removed.removed_count,
+            i.tickets_sold = i.tickets_sold - removed.removed_sold
+    ''', tuple(values))
+
+
+def drop_event_inventory(cursor, condition, values):
+    """
+    Drop the counters of deleted events (their tickets go with them).
+
+    Args:
+        cursor: Cursor of the connection deleting the events.
+        condition (str): SQL condition on event_name (ex. "event_name IN (%s, %s)").
+        values (tuple): Parameters of the condition.
+    """
+    cursor.execute(f"DELETE FROM EventInventory WHERE {condition}", tuple(values))
+
+
+def venue_capacity_problem(cursor, venue_name, capacity):
+    """
+    Check a new capacity against the tickets already issued for the venue's events.
+    Locks those events' counters, so no sale can slip in before the capacity update commits.
+
+    Returns:
+        str: Why the capacity is too small, or None if it fits.
+    """
+    cursor.execute(venue_inventory_query + " FOR UPDATE", (venue_name,))
+    row = cursor.fetchone()
+    cursor.fetchall()
+    if row is not None and row[1] > capacity:
+        return f"{row[0]} already has {row[1]} tickets, more than a capacity of {capacity}."
+    return None
+
+
+def event_venue_problem(cursor, event_name, venue_name):
+    """
+    Check that an event's issued tickets fit in the venue it is moving to. Locks the event's counters.
+
+    Returns:
+        str: Why the venue is too small, or None if it fits.
+    """
+    row = lock_inventory(cursor, event_name)
+    if row is None:
+        return None
+    cursor.execute("SELECT capacity FROM Venue WHERE venue_name = %s", (venue_name,))
+    venue = cursor.fetchone()
+    if venue is not None and row[1] > venue[0]:
+        return f"{event_name} already has {row[1]} tickets, more than the {venue[0]} seats of {venue_name}."
+    return None
+
+
+def rebuild_inventory(conn):
+    """
+    Recompute every event's counters from Tickets in a single transaction.
+
+    Args:
+        conn: Database connection.
+
+    Returns:
+        list: (event_name, capacity, tickets_issued) of the events holding more tickets than their venue has seats.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CREATE_INVENTORY_TABLE)
+        cursor.execute("DELETE FROM EventInventory")
+        cursor.execute('''
+            INSERT INTO EventInventory (event_name, tickets_issued, tickets_sold)
+            SELECT e.event_name, COUNT(t.id), COUNT(t.purchased_by)
+            FROM Events e LEFT JOIN Tickets t ON t.event_name = e.event_name
+            GROUP BY e.event_name
+        ''')
+        cursor.execute('''
+            SELECT i.event_name, v.capacity, i.tickets_issued
+            FROM EventInventory i
+            JOIN Events e ON e.event_name = i.event_name
+            JOIN Venue v ON v.venue_name = e.venue_name
+            WHERE i.tickets_issued > v.capacity
+            ORDER BY i.event_name
+        ''')
+        over_capacity = cursor.fetchall()
+        conn.commit()
+        return over_capacity
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the per-event ticket inventory counters.")
+    parser.add_argument('--rebuild', action='store_true', help="recompute the counters from Tickets")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    conn = get_connection()
+    try:
+        over_capacity = rebuild_inventory(conn)
+        print("Rebuilt EventInventory")
+        for event_name, capacity, issued in over_capacity:
+            print(f"  {event_name}: {issued} tickets for {capacity} seats (new tickets are refused until it is under capacity)")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+# key_cache.py
+# This file contains the in-process reference key cache of the Ticket Apprentice application
+# Functionality includes:
+# - The key sets of Users, Events, Venue, Groups and IndividualPerformers, loaded in bulk on a worker thread
+# - Answering "does this key exist?" for the form validators without a round trip when it does
+# - Applying the app's own inserts and deletes to the sets as they commit
+# - A periodic full reload of every table to pick up writes made by other clients
+# - A sorted prefix index per table for the autocomplete fields of the entry forms (see autocomplete.py)
+#
+# The database constraints stay the authority. The cache only answers for tables loaded within
+# max_age seconds, and only "yes": a key missing from the set may have just been created by another
+# client, so it is checked on the server, like every key of a table over max_keys keys. Only input
+# that can never be a key (blank, or a non-numeric user ID) is rejected without asking.
+
+import bisect
+import threading
+import time
+
+from streaming import QueryStream
+
+
+DEFAULT_MAX_AGE_SECONDS = 300
+DEFAULT_MAX_KEYS = 1000000
+DEFAULT_SUGGESTIONS = 10
+
+# Table -> key column of every cached table
+REFERENCE_KEYS = {
+    'Users': 'id',
+    'Events': 'event_name',
+    'Venue': 'venue_name',
+    'Groups': 'group_name',
+    'IndividualPerformers': 'stage_name',
+}
+
+
+def normalize_key(table, value):
+    """
+    The form a key is stored in: user IDs as ints, names compared like the default collation does.
+
+    Returns:
+        The normalized key, or None if the value can never be a key of the table (ex. a non-numeric user ID).
+    """
+    if value is None:
+        return None
+    if REFERENCE_KEYS[table] == 'id':
+        try:
+            return int(str(value).strip())
+        except ValueError:
+            return None
+    value = str(value).rstrip()
+    return value.casefold() if value else None
+
+
+def _index_entry(table, value):
+    """
+    The (sort key, shown text) of a key in the prefix index, or None for a value that is not a key.
+    User IDs are indexed by their digits so typing "12" suggests 12, 120, 1203, ...
+    """
+    key = normalize_key(table, value)
+    if key is None:
+        return None
+    if REFERENCE_KEYS[table] == 'id':
+        return str(key), str(key)
+    return key, str(value).rstrip()
+
+
+class PrefixIndex:
+    """
+    Keys of one table in a sorted array. A prefix search is a bisect to the first key at or after
+    the prefix and a walk over the matches, O(log n + limit) however many keys there are.
+    """
+
+    def __init__(self, entries=()):
+        # entries: (sort key, shown text); one shown text per sort key
+        by_key = dict(entries)
+        self._keys = sorted(by_key)
+        self._shown = [by_key[key] for key in self._keys]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, shown):
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            self._shown[position] = shown
+        else:
+            self._keys.insert(position, key)
+            self._shown.insert(position, shown)
+
+    def remove(self, key):
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._shown[position]
+
+    def suggest(self, prefix, limit=DEFAULT_SUGGESTIONS):
+        """
+        Returns:
+            list: Up to limit shown texts of the keys starting with prefix, in key order.
+        """
+        position = bisect.bisect_left(self._keys, prefix)
+        end = min(position + limit, len(self._keys))
+        suggestions = []
+        while position < end and self._keys[position].startswith(prefix):
+            suggestions.append(self._shown[position])
+            position += 1
+        return suggestions
+
+
+class _KeySet:
+    def __init__(self, keys, index, loaded_at):
+        self.keys = keys
+        self.index = index
+        self.loaded_at = loaded_at
+
+
+class ReferenceKeyCache:
+    """
+    Key sets of the reference tables. lookup() answers True for a key of a set loaded within
+    max_age seconds, False for input that can never be a key, and None (ask the database) otherwise.
+
+    Writes made while a table is being reloaded are journaled and replayed on the new set,
+    so the app's own commits are never lost to a reload that read the table before them.
+
+    suggest() reads the prefix index kept next to each set. Suggestions are only hints, so
+    they are served from whatever set is loaded, however old.
+    """
+
+    def __init__(self, max_age=DEFAULT_MAX_AGE_SECONDS, max_keys=DEFAULT_MAX_KEYS, batch_size=10000):
+        self.max_age = max_age
+        self.max_keys = max_keys
+        self.batch_size = batch_size
+        self.enabled = False
+        self._sets = {}        # table -> _KeySet
+        self._journals = {}    # table -> [(add, value)] while the table is being reloaded
+        self._too_large = set()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, table, value):
+        """
+        Whether a key exists, if the cache knows.
+
+        A key missing from the set is not reported as missing: another client may have created it
+        since the set was loaded, so the database is asked.
+
+        Returns:
+            True if a fresh key set holds the key, False for blank or malformed input,
+            None when the database has to be asked.
+        """
+        if not self.enabled or table not in REFERENCE_KEYS:
+            return None
+        key = normalize_key(table, value)
+        if key is None:
+            # Blank or malformed input is never a key, no need to ask
+            return False
+        with self._lock:
+            key_set = self._sets.get(table)
+            if key_set is None or time.monotonic() - key_set.loaded_at > self.max_age or key not in key_set.keys:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return True
+
+    def suggest(self, table, prefix, limit=DEFAULT_SUGGESTIONS):
+        """
+        Keys of a table starting with what the user has typed, for the autocomplete fields.
+
+        Args:
+            table (str): A table of REFERENCE_KEYS.
+            prefix (str): The text typed so far, compared like normalize_key compares keys.
+            limit (int): Most suggestions to return.
+
+        Returns:
+            list: Up to limit keys as stored, in sorted order. Empty when the table is not loaded.
+        """
+        if not self.enabled or table not in REFERENCE_KEYS:
+            return []
+        if REFERENCE_KEYS[table] == 'id':
+            prefix = prefix.strip()
+            if prefix and not prefix.isdigit():
+                return []
+        else:
+            # No rstrip: a trailing space is part of what the user means ("Taylor " vs "Taylors")
+            prefix = prefix.casefold()
+        with self._lock:
+            key_set = self._sets.get(table)
+            return key_set.index.suggest(prefix, limit) if key_set is not None else []
+
+    @staticmethod
+    def _apply_to_set(table, key_set, add, value):
+        entry = _index_entry(table, value)
+        if entry is None:
+            return
+        key = normalize_key(table, value)
+        if add:
+            key_set.keys.add(key)
+            key_set.index.add(*entry)
+        else:
+            key_set.keys.discard(key)
+            key_set.index.remove(entry[0])
+
+    def _apply(self, table, add, values):
+        with self._lock:
+            journal = self._journals.get(table)
+            if journal is not None:
+                journal.extend((add, value) for value in values)
+            key_set = self._sets.get(table)
+            if key_set is not None:
+                for value in values:
+                    self._apply_to_set(table, key_set, add, value)
+
+    def added(self, table, *values):
+        """
+        Record keys the app just inserted (call after the commit).
+        """
+        if table in REFERENCE_KEYS:
+            self._apply(table, True, values)
+
+    def removed(self, table, *values):
+        """
+        Record keys the app just deleted (call after the commit).
+        """
+        if table in REFERENCE_KEYS:
+            self._apply(table, False, values)
+
+    def invalidate(self, *tables):
+        """
+        Forget the key sets of these tables (all if none are given) until the next refresh,
+        ex. after a bulk import.
+        """
+        with self._lock:
+            for table in tables or list(self._sets):
+                self._sets.pop(table, None)
+
+    def _load(self, table):
+        column = REFERENCE_KEYS[table]
+        entries = []
+        with QueryStream(f"SELECT {column} FROM {table}", (), self.batch_size) as stream:
+            for rows in stream.batches():
+                entries.extend(_index_entry(table, row[0]) for row in rows)
+                if len(entries) > self.max_keys:
+                    return None
+        entries = [entry for entry in entries if entry is not None]
+        keys = {normalize_key(table, shown) for _, shown in entries}
+        return _KeySet(keys, PrefixIndex(entries), time.monotonic())
+
+    def refresh(self, force=False):
+        """
+        Reload the key sets that are missing or older than max_age / 2 (all of them with force).
+        Every reload reads the whole table: names have no order new keys could be fetched by, and
+        a full read is also what drops the keys other clients deleted. Runs on a worker thread.
+
+        Returns:
+            dict: Table -> number of keys, for the tables reloaded.
+        """
+        if not self.enabled:
+            return {}
+        reloaded = {}
+        with self._refresh_lock:
+            for table in REFERENCE_KEYS:
+                with self._lock:
+                    key_set = self._sets.get(table)
+                    due = force or key_set is None or time.monotonic() - key_set.loaded_at > self.max_age / 2
+                    if not due or (table in self._too_large and not force):
+                        continue
+                    self._journals[table] = []
+
+                started = time.monotonic()
+                try:
+                    key_set = self._load(table)
+                finally:
+                    with self._lock:
+                        journal = self._journals.pop(table)
+
+                with self._lock:
+                    if key_set is None:
+                        # Too many keys to hold, validate this table on the server
+                        self._too_large.add(table)
+                        self._sets.pop(table, None)
+                        continue
+                    self._too_large.discard(table)
+                    for add, value in journal:
+                        self._apply_to_set(table, key_set, add, value)
+                    key_set.loaded_at = started
+                    self._sets[table] = key_set
+                reloaded[table] = len(key_set.keys)
+        return reloaded
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'tables': {table: len(key_set.keys) for table, key_set in self._sets.items()},
+                    'too_large': sorted(self._too_large), 'hits': self._hits, 'misses': self._misses}
+
+
+# Process-wide cache used by the form validators in ticket_utils.py
+reference_keys = ReferenceKeyCache()
+
+
+def configure_reference_keys(enabled=True, max_age=DEFAULT_MAX_AGE_SECONDS, max_keys=DEFAULT_MAX_KEYS):
+    """
+    Turn the cache on or off and set how long a loaded key set is trusted.
+    """
+    reference_keys.enabled = enabled
+    reference_keys.max_age = max_age
+    reference_keys.max_keys = max_keys
+    if not enabled:
+        reference_keys.invalidate()
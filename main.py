@@ -11,23 +11,67 @@ import tkinter as tk
 from tkinter import *
 import tkinter.messagebox as MessageBox
 import tkinter.ttk as ttk
+from tkinter import filedialog
 import mariadb 
 from configparser import ConfigParser
 from ticket_utils import *
-
-# scrapes input from config file for db connection
+from db_pool import init_pool, close_pool, load_db_config
+from query_stats import configure_query_stats, query_stats
+from profiler import profiler, configure_profiler
+from db_executor import init_executor, shutdown_executor, run_in_background
+from pagination import DEFAULT_PAGE_SIZE
+from streaming import set_default_batch_size, stop_stream
+from query_cache import dashboard_cache, configure_dashboard_cache
+from ticket_ids import configure_ticket_ids
+from ticket_index import configure_ticket_index, ticket_index
+from key_cache import configure_reference_keys, reference_keys
+
+# scrapes input from config file for the app settings (the db connection settings are read by db_pool.py)
 config = ConfigParser()
 config.read("my_config.ini")
-serv = config.get('db_info', 'host')
-usern = config.get('db_info', 'user')
-passw =config.get('db_info', 'password')
-db = config.get('db_info', 'database')
+
+# Every statement is timed per fingerprint; slow ones are appended to the slow-query log
+configure_query_stats(enabled=config.getboolean('query_stats', 'enabled', fallback=True),
+                      slow_query_ms=config.getfloat('query_stats', 'slow_query_ms', fallback=500),
+                      slow_query_log=config.get('query_stats', 'slow_query_log', fallback='slow_queries.log'),
+                      window=config.getint('query_stats', 'window', fallback=1000))
+
+# Every query borrows from this shared pool instead of opening its own connection
+init_pool(**load_db_config())
 
 
 # General format for layout of application
 root = tk.Tk()
 root.title("Final Project")
 root.geometry('1000x800')
+
+# Database work from the tabs runs on these worker threads, results come back through root.after
+init_executor(root, max_workers=config.getint('executor', 'max_workers', fallback=4))
+set_default_batch_size(config.getint('streaming', 'batch_size', fallback=500))
+configure_ticket_ids(config.getint('ticket_ids', 'block_size', fallback=10))
+
+# Optional NumPy ticket index for Search Tickets, built in the background so the first search is instant
+if configure_ticket_index(enabled=config.getboolean('ticket_index', 'enabled', fallback=False),
+                          max_age=config.getfloat('ticket_index', 'max_age', fallback=300)):
+    run_in_background("ticket_index", lambda task: ticket_index.refresh())
+
+# Key sets of the reference tables, so the forms accept known references and reject duplicate keys without
+# a round trip. Reloaded in the background twice per max_age (at most once a second, however small
+# max_age is set) so a loaded set never goes stale while the app runs
+configure_reference_keys(enabled=config.getboolean('reference_keys', 'enabled', fallback=True),
+                         max_age=config.getfloat('reference_keys', 'max_age', fallback=300),
+                         max_keys=config.getint('reference_keys', 'max_keys', fallback=1000000))
+reference_keys_refresh_ms = max(1000, int(reference_keys.max_age * 500))
+
+
+def reference_keys_tick():
+    if reference_keys.enabled:
+        run_in_background("reference_keys", lambda task: reference_keys.refresh())
+        root.after(reference_keys_refresh_ms, reference_keys_tick)
+
+
+reference_keys_tick()
+
 tabControl = ttk.Notebook(root)
 tab1 = ttk.Frame(tabControl)
 tab2 = ttk.Frame(tabControl)
@@ -51,228 +95,291 @@ update_tables = ['Events', 'Groups', 'IndividualPerformers', 'Tickets', 'Users',
 
 # Dashboard
 
-# Selectes Top 10 Users that have purchased the most tickets. Keeps ties
-label1 = tk.Label(tab1, text="Top 10 Users With Most Tickets")
-label1.pack(pady=20)
-
-# Create Top Ticket counts
-top_ticket_count = '''
-SELECT
-    user_id,
-    user_name,
-    ticket_count
-FROM (
-    SELECT
-        user_id,
-        user_name,
-        ticket_count,
-        RANK() OVER (ORDER BY ticket_count DESC) AS rank
-    FROM (
-        SELECT
-            t.purchased_by AS user_id,
-            u.user_name,
-            COUNT(t.id) AS ticket_count
-        FROM Tickets t JOIN Users u ON u.id = t.purchased_by
-        WHERE t.purchased_by IS NOT NULL
-        GROUP BY t.purchased_by, u.user_name
-    ) AS ranked_users
-) AS final_result
-WHERE rank <= 10
-ORDER BY ticket_count DESC; 
-'''
-
-top_ticket_tree = ttk.Treeview(tab1, columns=("ID", "user_name", "ticket_count"), show="headings", height=5)
-top_ticket_tree.heading("ID", text="ID")
-top_ticket_tree.heading("ticket_count", text="Ticket Count")
-top_ticket_tree.heading("user_name", text="User Name")
-top_ticket_tree.pack(pady=10)
-
-columns1 = ("ID", "User Name", "Ticket Count")
-populate_result_tree(top_ticket_tree, top_ticket_count, columns1)
-
-
-# Query to Generate the top 5 Revenue Generating Events. Joins with User tickets and uses those prices that are not NULL (must be purchased ticket)
-top_revenue_query = '''
-WITH RankedEvents AS (
-    SELECT
-        Events.event_name,
-        SUM(price) AS total_revenue,
-        RANK() OVER (ORDER BY SUM(price) DESC) AS rank
-    FROM Tickets JOIN Events ON Tickets.event_name = Events.event_name
-    WHERE Tickets.purchased_by IS NOT NULL
-    GROUP BY Events.event_name
-)
-SELECT
-    event_name,
-    total_revenue
-FROM RankedEvents
-WHERE rank <= 5;
-'''
-
-label_revenue = tk.Label(tab1, text="Top 5 Events with Highest Revenue")
-label_revenue.pack(pady=20)
-
-result_tree_revenue = ttk.Treeview(tab1, columns=("Event Name", "Total Revenue"), show="headings", height=5)
-result_tree_revenue.heading("Event Name", text="Event Name")
-result_tree_revenue.heading("Total Revenue", text="Total Revenue")
-result_tree_revenue.pack(pady=10)
-
-columns_revenue = ("Event Name", "Total Revenue")
-populate_result_tree(result_tree_revenue, top_revenue_query, columns_revenue)
-
-top_users_query = '''
-WITH RankedUsers AS (
-    SELECT
-        u.id AS user_id,
-        u.user_name,
-        COUNT(t.id) AS ticket_count,
-        SUM(t.price) AS total_spent,
-        RANK() OVER (ORDER BY SUM(t.price) DESC) AS rank
-    FROM Tickets t
-    JOIN Users u ON t.purchased_by = u.id
-    WHERE t.purchased_by IS NOT NULL
-    GROUP BY u.id, u.user_name
-)
-SELECT
-    user_id,
-    user_name,
-    ticket_count,
-    total_spent
-FROM RankedUsers
-WHERE rank <= 10
-ORDER BY total_spent DESC;
-'''
-
-label_top_users = tk.Label(tab1, text="Top 10 Users with Highest Spending")
-label_top_users.pack(pady=20)
-
-result_tree_top_users = ttk.Treeview(tab1, columns=("User ID", "User Name", "Ticket Count", "Total Spent"), show="headings", height=10)
-result_tree_top_users.heading("User ID", text="User ID")
-result_tree_top_users.heading("User Name", text="User Name")
-result_tree_top_users.heading("Ticket Count", text="Ticket Count")
-result_tree_top_users.heading("Total Spent", text="Total Spent")
-result_tree_top_users.pack(pady=10)
-
-columns_top_users = ("User ID", "User Name", "Ticket Count", "Total Spent")
-populate_result_tree(result_tree_top_users, top_users_query, columns_top_users)
+# Filled by build_dashboard_tab: (tree, metric name in dashboard.py, timing label) for every report
+dashboard_reports = []
+dashboard_refresh_ms = int(config.getfloat('dashboard', 'refresh_interval', fallback=30) * 1000)
+configure_dashboard_cache(ttl=config.getfloat('dashboard', 'cache_ttl', fallback=60),
+                          stale_seconds=config.getfloat('dashboard', 'stale_seconds', fallback=300))
+
+
+def refresh_dashboard(changed_tables=None):
+    # Every report comes from one query (one round trip), see dashboard.py
+    populate_dashboard_trees(dashboard_reports)
+
+    stats = dashboard_cache.stats()
+    dashboard_cache_label.config(text=f"Cache: {stats['hits']} hits, {stats['stale_hits']} stale, "
+                                      f"{stats['misses']} misses ({stats['hit_ratio']:.0%} hit ratio)")
+
+
+def dashboard_tick():
+    refresh_dashboard()
+    root.after(dashboard_refresh_ms, dashboard_tick)
+
+
+def build_dashboard_tab():
+    global top_ticket_tree, result_tree_revenue, result_tree_top_users, dashboard_cache_label, profiling_var
+
+    # Selectes Top 10 Users that have purchased the most tickets. Keeps ties
+    label1 = tk.Label(tab1, text="Top 10 Users With Most Tickets")
+    label1.pack(pady=20)
+
+    # Create Top Ticket counts (the top_ticket_count metric in dashboard.py)
+    top_ticket_tree = ttk.Treeview(tab1, columns=("ID", "user_name", "ticket_count"), show="headings", height=5)
+    top_ticket_tree.heading("ID", text="ID")
+    top_ticket_tree.heading("ticket_count", text="Ticket Count")
+    top_ticket_tree.heading("user_name", text="User Name")
+    top_ticket_tree.pack(pady=(10, 0))
+    top_ticket_timing = tk.Label(tab1, text="", fg='gray')
+    top_ticket_timing.pack()
+
+    # Top 5 Revenue Generating Events (the top_revenue metric in dashboard.py)
+    label_revenue = tk.Label(tab1, text="Top 5 Events with Highest Revenue")
+    label_revenue.pack(pady=20)
+
+    result_tree_revenue = ttk.Treeview(tab1, columns=("Event Name", "Total Revenue"), show="headings", height=5)
+    result_tree_revenue.heading("Event Name", text="Event Name")
+    result_tree_revenue.heading("Total Revenue", text="Total Revenue")
+    result_tree_revenue.pack(pady=(10, 0))
+    revenue_timing = tk.Label(tab1, text="", fg='gray')
+    revenue_timing.pack()
+
+    # Top 10 spenders (the top_users metric in dashboard.py)
+    label_top_users = tk.Label(tab1, text="Top 10 Users with Highest Spending")
+    label_top_users.pack(pady=20)
+
+    result_tree_top_users = ttk.Treeview(tab1, columns=("User ID", "User Name", "Ticket Count", "Total Spent"), show="headings", height=10)
+    result_tree_top_users.heading("User ID", text="User ID")
+    result_tree_top_users.heading("User Name", text="User Name")
+    result_tree_top_users.heading("Ticket Count", text="Ticket Count")
+    result_tree_top_users.heading("Total Spent", text="Total Spent")
+    result_tree_top_users.pack(pady=(10, 0))
+    top_users_timing = tk.Label(tab1, text="", fg='gray')
+    top_users_timing.pack()
+
+    dashboard_cache_label = tk.Label(tab1, text="Loading reports...", fg='gray')
+    dashboard_cache_label.pack(pady=5)
+
+    # Profiling mode (also turned on by the TICKET_PROFILE environment variable)
+    profiler_controls = tk.Frame(tab1)
+    profiler_controls.pack(pady=5)
+    profiling_var = tk.BooleanVar(value=profiler.enabled)
+    Checkbutton(profiler_controls, text="Profile UI actions", variable=profiling_var,
+                command=lambda: configure_profiler(profiling_var.get())).pack(side='left', padx=5)
+    Button(profiler_controls, text="Hot Paths...", font=("italic", 10), bg="white",
+           command=show_hot_paths).pack(side='left', padx=5)
+    Button(profiler_controls, text="Dump pstats...", font=("italic", 10), bg="white",
+           command=dump_profiles).pack(side='left', padx=5)
+
+    # Dashboard reports are computed together and go through the query cache. Each entry names its metric
+    # in dashboard.py and the label showing how long the shared query took
+    dashboard_reports[:] = [
+        (top_ticket_tree, 'top_ticket_count', top_ticket_timing),
+        (result_tree_revenue, 'top_revenue', revenue_timing),
+        (result_tree_top_users, 'top_users', top_users_timing),
+    ]
+
+    # Ticket/user/event writes invalidate the cached reports, redraw right away instead of waiting for the next tick
+    dashboard_cache.add_invalidation_listener(refresh_dashboard)
+    dashboard_tick()
 
 
 # Insertion functionality
 
-text_var = tk.StringVar()
-text_var.set('Select Table')
-table_drop_down = ttk.Combobox(tab2, textvariable=text_var, values=all_tables)
-table_drop_down.pack()
-table_drop_down.bind("<<ComboboxSelected>>", insert_pick_table)
-
-
-# Deletion functionality
-    
-del_text_var = tk.StringVar()
-del_text_var.set('Select Table')
-delete_drop_down = ttk.Combobox(tab3, textvariable=del_text_var, values=all_tables)
-delete_drop_down.pack()
-delete_drop_down.bind("<<ComboboxSelected>>", delete_pick_table)
-
-
-# Update functionality
-
-update_text_var = tk.StringVar()
-update_text_var.set('Select Table')
-update_drop_down = ttk.Combobox(tab4, textvariable=update_text_var, values=update_tables)
-update_drop_down.pack()
-update_drop_down.bind("<<ComboboxSelected>>", update_pick_table)
-
-
-# Search functionality
-# Initially have to genereate the search features, then use refresh button to refresh the page once edits are made
-# to the tables. The refresh button then recursively calls itself so multiple searches can happen after refreshing. 
-
-# widget list for destruction on refresh
-widgets_to_destroy = []
-
-min_price_label = tk.Label(tab5, text='Min Price:')
-min_price_label.pack(pady=10)
-widgets_to_destroy.append(min_price_label)
-
-min_price_entry = tk.Entry(tab5)
-min_price_entry.insert(0, "0")  # Set default value to zero
-min_price_entry.pack()
-widgets_to_destroy.append(min_price_entry)
+def build_insert_tab():
+    global import_status_label, import_button, text_var, table_drop_down
 
-max_price_label = tk.Label(tab5, text='Max Price:')
-max_price_label.pack(pady=10)
-widgets_to_destroy.append(max_price_label)
+    # Created before the table drop down so insert_pick_table (which clears everything after it) keeps them
+    import_status_label = Label(tab2, text='', font=('italic', 10), fg='gray')
+    import_status_label.place(relx=1.0, x=-10, y=35, anchor='ne')
+    import_button = Button(tab2, text="Import CSV...", font=("italic", 10), bg="white",
+                           command=lambda: import_csv_files(filedialog.askopenfilenames(
+                               title="Select CSV files named after their tables (ex. Venue.csv)",
+                               filetypes=[("CSV files", "*.csv")]), import_status_label))
+    import_button.place(relx=1.0, x=-10, y=5, anchor='ne')
 
-max_price_entry = tk.Entry(tab5)
-max_price_entry.pack()
-widgets_to_destroy.append(max_price_entry)
+    text_var = tk.StringVar()
+    text_var.set('Select Table')
+    table_drop_down = ttk.Combobox(tab2, textvariable=text_var, values=all_tables)
+    table_drop_down.pack()
+    table_drop_down.bind("<<ComboboxSelected>>", insert_pick_table)
 
-purchased_by_var = tk.IntVar()
-purchased_by_checkbox = tk.Checkbutton(tab5, text='Not Purchased', variable=purchased_by_var)
-purchased_by_checkbox.pack(pady=10)
-widgets_to_destroy.append(purchased_by_checkbox)
 
-city_label = tk.Label(tab5, text='Select Cities:')
-city_label.pack(pady=10)
-widgets_to_destroy.append(city_label)
-
-# Create a listbox for cities based on tickets' event's cities
-try:
-    conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT DISTINCT city FROM Venue JOIN (Tickets JOIN Events USING (event_name)) USING (venue_name)")
-    cities = [row[0] for row in cursor.fetchall()]
-
-except Exception as e:
-    print(f"Error: {e}")
-    MessageBox.showerror("Error", f"Error: {e}")
+# Deletion functionality
 
-finally:
-    cursor.close()
-    conn.close()
+def build_delete_tab():
+    global del_text_var, delete_drop_down
 
-# Generate cities to be selected from 
-city_listbox = tk.Listbox(tab5, selectmode=tk.MULTIPLE, exportselection=0)
-for city in cities:
-    city_listbox.insert(tk.END, city)
-city_listbox.pack(pady=10)
-widgets_to_destroy.append(city_listbox)
+    del_text_var = tk.StringVar()
+    del_text_var.set('Select Table')
+    delete_drop_down = ttk.Combobox(tab3, textvariable=del_text_var, values=all_tables)
+    delete_drop_down.pack()
+    delete_drop_down.bind("<<ComboboxSelected>>", delete_pick_table)
 
-search_button = tk.Button(tab5, text="Search", command=search_tickets)
-search_button.pack(pady=10)
-widgets_to_destroy.append(search_button)
 
-result_tree = ttk.Treeview(tab5, columns=("ID", "Event Name", "Purchased By", "Price"), show="headings", selectmode='browse')
-result_tree.heading("ID", text="ID")
-result_tree.heading("Event Name", text="Event Name")
-result_tree.heading("Purchased By", text="Purchased By")
-result_tree.heading("Price", text="Price")
-result_tree.pack(pady=10)
-result_tree.bind("<Double-1>", lambda event: show_ticket_info(result_tree)) # Bind double click to open new information
+# Update functionality
 
-widgets_to_destroy.append(result_tree)
+def build_update_tab():
+    global update_text_var, update_drop_down
 
-refresh_button = tk.Button(tab5, text="Refresh", command=lambda: refresh_tab5(widgets_to_destroy))
-refresh_button.pack(pady=10)
-widgets_to_destroy.append(refresh_button)
+    update_text_var = tk.StringVar()
+    update_text_var.set('Select Table')
+    update_drop_down = ttk.Combobox(tab4, textvariable=update_text_var, values=update_tables)
+    update_drop_down.pack()
+    update_drop_down.bind("<<ComboboxSelected>>", update_pick_table)
 
 
+# Search functionality
+# Initially have to genereate the search features, then use refresh button to refresh the page once edits are made
+# to the tables. The refresh button then recursively calls itself so multiple searches can happen after refreshing. 
 
-label_search = tk.Label(tab6, text="Search All Entries", font=('bold', 10))
-label_search.pack(pady=10)
+def build_search_tab():
+    global widgets_to_destroy, min_price_entry, max_price_entry, purchased_by_var, city_listbox, search_status_label, result_tree
 
-search_table_var = tk.StringVar()
-search_table_var.set('Select Table')
-search_table_drop_down = ttk.Combobox(tab6, textvariable=search_table_var, values=all_tables)
-search_table_drop_down.pack(pady=10)
+    # widget list for destruction on refresh
+    widgets_to_destroy = []
 
-result_tree_search = ttk.Treeview(tab6, show="headings", height=10)
-result_tree_search.pack(pady=10)
+    min_price_label = tk.Label(tab5, text='Min Price:')
+    min_price_label.pack(pady=10)
+    widgets_to_destroy.append(min_price_label)
 
-search_all_button = Button(tab6, text="Search All", font=("italic", 10), bg="white",
-                           command=lambda: search_all_entries(search_table_var.get(), result_tree_search))
-search_all_button.pack(pady=10)
+    min_price_entry = tk.Entry(tab5)
+    min_price_entry.insert(0, "0")  # Set default value to zero
+    min_price_entry.pack()
+    widgets_to_destroy.append(min_price_entry)
+
+    max_price_label = tk.Label(tab5, text='Max Price:')
+    max_price_label.pack(pady=10)
+    widgets_to_destroy.append(max_price_label)
+
+    max_price_entry = tk.Entry(tab5)
+    max_price_entry.pack()
+    widgets_to_destroy.append(max_price_entry)
+
+    purchased_by_var = tk.IntVar()
+    purchased_by_checkbox = tk.Checkbutton(tab5, text='Not Purchased', variable=purchased_by_var)
+    purchased_by_checkbox.pack(pady=10)
+    widgets_to_destroy.append(purchased_by_checkbox)
+
+    city_label = tk.Label(tab5, text='Select Cities:')
+    city_label.pack(pady=10)
+    widgets_to_destroy.append(city_label)
+
+    # Cities that have ticketed events, loaded in the background (the query joins three tables)
+    city_listbox = tk.Listbox(tab5, selectmode=tk.MULTIPLE, exportselection=0)
+    load_city_listbox(city_listbox)
+    city_listbox.pack(pady=10)
+    widgets_to_destroy.append(city_listbox)
+
+    search_button = tk.Button(tab5, text="Search", command=search_tickets)
+    search_button.pack(pady=10)
+    widgets_to_destroy.append(search_button)
 
-root.mainloop()
\ No newline at end of file
+    # Results stream in batches, so a long search can be stopped partway through
+    stop_search_button = tk.Button(tab5, text="Stop", command=lambda: stop_stream("search_tickets"))
+    stop_search_button.pack()
+    widgets_to_destroy.append(stop_search_button)
+
+    export_search_button = tk.Button(tab5, text="Export...",
+                                     command=lambda: export_ticket_search_results(min_price_entry, max_price_entry, purchased_by_var,
+                                                                                  city_listbox, search_status_label))
+    export_search_button.pack(pady=5)
+    widgets_to_destroy.append(export_search_button)
+
+    search_status_label = tk.Label(tab5, text="")
+    search_status_label.pack()
+    widgets_to_destroy.append(search_status_label)
+
+    result_tree = ttk.Treeview(tab5, columns=("ID", "Event Name", "Purchased By", "Price"), show="headings", selectmode='browse')
+    result_tree.heading("ID", text="ID")
+    result_tree.heading("Event Name", text="Event Name")
+    result_tree.heading("Purchased By", text="Purchased By")
+    result_tree.heading("Price", text="Price")
+    result_tree.pack(pady=10)
+    result_tree.bind("<Double-1>", lambda event: show_ticket_info(result_tree)) # Bind double click to open new information
+
+    widgets_to_destroy.append(result_tree)
+
+    refresh_button = tk.Button(tab5, text="Refresh", command=lambda: refresh_tab5(widgets_to_destroy))
+    refresh_button.pack(pady=10)
+    widgets_to_destroy.append(refresh_button)
+
+
+# Search All functionality
+
+def build_search_all_tab():
+    global search_table_var, result_tree_search, page_size_var, search_all_status
+
+    label_search = tk.Label(tab6, text="Search All Entries", font=('bold', 10))
+    label_search.pack(pady=10)
+
+    search_table_var = tk.StringVar()
+    search_table_var.set('Select Table')
+    search_table_drop_down = ttk.Combobox(tab6, textvariable=search_table_var, values=all_tables)
+    search_table_drop_down.pack(pady=10)
+
+    result_tree_search = ttk.Treeview(tab6, show="headings", height=10)
+    result_tree_search.pack(pady=10)
+
+    page_size_label = tk.Label(tab6, text="Rows per page:")
+    page_size_label.pack()
+
+    page_size_var = tk.StringVar(value=str(config.getint('search_all', 'page_size', fallback=DEFAULT_PAGE_SIZE)))
+    page_size_entry = tk.Spinbox(tab6, from_=10, to=10000, increment=50, textvariable=page_size_var, width=8)
+    page_size_entry.pack(pady=5)
+
+    search_all_status = tk.Label(tab6, text="")
+
+    search_all_button = Button(tab6, text="Search All", font=("italic", 10), bg="white",
+                               command=lambda: search_all_entries(search_table_var.get(), result_tree_search,
+                                                                  page_size_var.get(), search_all_status))
+    search_all_button.pack(pady=10)
+
+    # Keyset page navigation, each page is a primary key range seek instead of a full table read
+    page_controls = tk.Frame(tab6)
+    page_controls.pack(pady=5)
+    previous_page_button = Button(page_controls, text="< Previous", font=("italic", 10), bg="white",
+                                  command=lambda: search_all_previous_page(result_tree_search, search_all_status))
+    previous_page_button.pack(side=tk.LEFT, padx=10)
+    next_page_button = Button(page_controls, text="Next >", font=("italic", 10), bg="white",
+                              command=lambda: search_all_next_page(result_tree_search, search_all_status))
+    next_page_button.pack(side=tk.LEFT, padx=10)
+
+    # Whole table to CSV/Parquet, streamed instead of paged
+    export_all_button = Button(page_controls, text="Export...", font=("italic", 10), bg="white",
+                               command=lambda: export_search_all(search_table_var.get(), search_all_status))
+    export_all_button.pack(side=tk.LEFT, padx=10)
+
+    # Selected rows (ctrl/shift click) are deleted together, see bulk_delete_entries
+    delete_selected_button = Button(page_controls, text="Delete Selected", font=("italic", 10), bg="white",
+                                    command=lambda: delete_search_all_selection(result_tree_search, search_all_status))
+    delete_selected_button.pack(side=tk.LEFT, padx=10)
+    search_all_status.pack(pady=5)
+
+
+# Tabs are built the first time they are selected, so the window appears before any query runs
+# and startup time does not depend on the size of the database
+tab_builders = {str(tab1): build_dashboard_tab, str(tab2): build_insert_tab, str(tab3): build_delete_tab,
+                str(tab4): build_update_tab, str(tab5): build_search_tab, str(tab6): build_search_all_tab}
+tab_placeholders = {}
+for tab in (tab1, tab2, tab3, tab4, tab5, tab6):
+    tab_placeholders[str(tab)] = tk.Label(tab, text="Loading...", fg='gray')
+    tab_placeholders[str(tab)].pack(pady=20)
+
+
+def build_selected_tab(event=None):
+    selected = tabControl.select()
+    builder = tab_builders.pop(selected, None)
+    if builder is not None:
+        tab_placeholders.pop(selected).destroy()
+        builder()
+
+
+tabControl.bind("<<NotebookTabChanged>>", build_selected_tab)
+# Build the first tab once the window is on screen
+root.after_idle(build_selected_tab)
+
+root.mainloop()
+shutdown_executor()
+close_pool()
+if query_stats.enabled:
+    print(query_stats.report())
\ No newline at end of file
@@ -0,0 +1,197 @@
+# pagination.py
+# This file contains keyset pagination for the Search All tab of the Ticket Apprentice application
+# Functionality includes:
+# - Primary key definitions for every table in the schema
+# - Keyset (seek) page queries that stay fast no matter how deep the page is
+# - Next/previous navigation and a cheap total row estimate
+
+from collections import namedtuple
+
+from db_pool import get_connection
+
+
+DEFAULT_PAGE_SIZE = 100
+
+# Primary keys from populate_tables.sql, in index order. Pages are ordered and seeked on these columns.
+TABLE_PRIMARY_KEYS = {
+    'Events': ('event_name',),
+    'Groups': ('group_name',),
+    'IndividualPerformers': ('stage_name',),
+    'Memberships': ('stage_name', 'group_name'),
+    'PerformanceList': ('event_name', 'group_name'),
+    'Tickets': ('id', 'event_name'),
+    'Users': ('id',),
+    'Venue': ('venue_name',),
+}
+
+
+# One page of results plus what the UI needs to draw the next/previous controls
+Page = namedtuple('Page', ['rows', 'number', 'first_key', 'last_key', 'has_previous', 'has_next'])
+
+
+def keyset_condition(key_columns, operator):
+    """
+    Build the WHERE clause that seeks past a composite key.
+
+    (a, b) > (x, y) is expanded to `a > x OR (a = x AND b > y)` so MariaDB can
+    use the primary key index as a range scan.
+
+    Args:
+        key_columns (tuple): Primary key column names.
+        operator (str): '>' to seek forward, '<' to seek backward.
+
+    Returns:
+        tuple: (condition string, function mapping a key tuple to its parameter list)
+    """
+    terms = []
+    for i, column in enumerate(key_columns):
+        equalities = [f"{prefix} = %s" for prefix in key_columns[:i]]
+        terms.append("(" + " AND ".join(equalities + [f"{column} {operator} %s"]) + ")")
+    condition = "(" + " OR ".join(terms) + ")"
+
+    def params_for(key):
+        params = []
+        for i in range(len(key_columns)):
+            params.extend(key[:i + 1])
+        return params
+
+    return condition, params_for
+
+
+class KeysetPager:
+    """
+    Walks one table page by page in primary key order.
+
+    Each page is fetched with `WHERE key > last_seen ORDER BY key LIMIT n`, so
+    loading page 1,000 costs the same as loading page 1. The query methods only
+    touch the database and may run on a worker thread; call show() with the
+    returned Page on the main thread to move the pager.
+    """
+
+    def __init__(self, table_name, page_size=DEFAULT_PAGE_SIZE):
+        if table_name not in TABLE_PRIMARY_KEYS:
+            raise ValueError(f"Unknown table {table_name}")
+        if page_size < 1:
+            raise ValueError("Page size must be a positive integer")
+
+        self.table_name = table_name
+        self.page_size = page_size
+        self.key_columns = TABLE_PRIMARY_KEYS[table_name]
+        self.columns = []
+        self.estimated_total = None
+        self.current = None
+
+    def load_metadata(self, cursor):
+        """
+        Fetch the column names and the row estimate for the table.
+
+        The estimate comes from information_schema instead of COUNT(*), which
+        would have to scan the whole table.
+        """
+        cursor.execute(f"SHOW COLUMNS FROM {self.table_name}")
+        self.columns = [column[0] for column in cursor.fetchall()]
+
+        cursor.execute("SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                       (self.table_name,))
+        estimate = cursor.fetchone()
+        self.estimated_total = estimate[0] if estimate else None
+
+    def _key_of(self, row):
+        return tuple(row[self.columns.index(column)] for column in self.key_columns)
+
+    def _query_page(self, cursor, boundary, forward):
+        order_by = ", ".join(f"{column} {'ASC' if forward else 'DESC'}" for column in self.key_columns)
+        query = f"SELECT * FROM {self.table_name}"
+        params = []
+
+        if boundary is not None:
+            condition, params_for = keyset_condition(self.key_columns, '>' if forward else '<')
+            query += f" WHERE {condition}"
+            params = params_for(boundary)
+
+        # Ask for one extra row to know whether another page exists in this direction
+        query += f" ORDER BY {order_by} LIMIT %s"
+        params.append(self.page_size + 1)
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if not forward:
+            rows.reverse()
+        return rows, more
+
+    def _fetch(self, boundary, forward, number, first_page=False):
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            if first_page or not self.columns:
+                self.load_metadata(cursor)
+            rows, more = self._query_page(cursor, boundary, forward)
+            cursor.close()
+        finally:
+            conn.close()
+
+        if not rows:
+            # Rows were deleted underneath us; stay on the current page
+            if boundary is not None:
+                return None
+            return Page([], number, None, None, False, False)
+
+        first_key, last_key = self._key_of(rows[0]), self._key_of(rows[-1])
+        if forward:
+            return Page(rows, number, first_key, last_key, boundary is not None, more)
+        return Page(rows, number, first_key, last_key, more, True)
+
+    def first_page(self):
+        """
+        Fetch the first page (and the table metadata).
+
+        Returns:
+            Page: The first page of the table, empty if the table has no rows.
+        """
+        return self._fetch(None, True, 1, first_page=True)
+
+    def next_page(self):
+        """
+        Fetch the page after the one currently shown.
+
+        Returns:
+            Page: The next page, or None if there is none (or it vanished).
+        """
+        if self.current is None or not self.current.has_next:
+            return None
+        return self._fetch(self.current.last_key, True, self.current.number + 1)
+
+    def previous_page(self):
+        """
+        Fetch the page before the one currently shown.
+
+        Returns:
+            Page: The previous page, or None if there is none (or it vanished).
+        """
+        if self.current is None or not self.current.has_previous:
+            return None
+        return self._fetch(self.current.first_key, False, self.current.number - 1)
+
+    def show(self, page):
+        """
+        Make page the current page so next/previous continue from it.
+        """
+        self.current = page
+
+    def describe(self):
+        """
+        Status text for the current page, ex. 'Page 3 (rows 201-300 of ~12,000)'.
+        """
+        if self.current is None:
+            return ''
+        if not self.current.rows:
+            return 'No entries found'
+        start = (self.current.number - 1) * self.page_size + 1
+        end = start + len(self.current.rows) - 1
+        total = ''
+        if self.estimated_total is not None:
+            # The estimate can lag behind recent inserts, never show fewer rows than we have seen
+            total = f" of ~{max(self.estimated_total, end):,}"
+        return f"Page {self.current.number} (rows {start}-{end}{total})"
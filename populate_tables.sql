@@ -5,6 +5,10 @@
  * DESCRIPTION: Table creation for project
  **********************************************************************/
 
+DROP TABLE IF EXISTS EventInventory;
+DROP TABLE IF EXISTS TicketSequences;
+DROP TABLE IF EXISTS UserTicketStats;
+DROP TABLE IF EXISTS EventRevenueStats;
 DROP TABLE IF EXISTS Tickets;
 DROP TABLE IF EXISTS Memberships;
 DROP TABLE IF EXISTS PerformanceList;
@@ -16,6 +20,9 @@ DROP TABLE IF EXISTS Users;
 
 
 
+-- ON DELETE rules are listed in deletes.py (DELETE_RULES); `python deletes.py --apply` adds them to an older database
+
+
 CREATE TABLE IndividualPerformers (
     individual_name VARCHAR(50),
     stage_name VARCHAR(50),
@@ -54,7 +61,7 @@ CREATE TABLE Events (
     event_date DATE,
     start_time TIME,
     PRIMARY KEY (event_name),
-    FOREIGN KEY (venue_name) REFERENCES Venue(venue_name)
+    FOREIGN KEY (venue_name) REFERENCES Venue(venue_name) ON DELETE RESTRICT
 );
 
 
@@ -62,8 +69,8 @@ CREATE TABLE PerformanceList (
     event_name VARCHAR(100),
     group_name VARCHAR(50),
     PRIMARY KEY (event_name, group_name),
-    FOREIGN KEY (event_name) REFERENCES Events(event_name),
-    FOREIGN KEY (group_name) REFERENCES Groups(group_name)
+    FOREIGN KEY (event_name) REFERENCES Events(event_name) ON DELETE CASCADE,
+    FOREIGN KEY (group_name) REFERENCES Groups(group_name) ON DELETE RESTRICT
 );
 
 
@@ -71,8 +78,8 @@ CREATE TABLE Memberships (
     stage_name VARCHAR(50),
     group_name VARCHAR(50) NOT NULL,
     PRIMARY KEY (stage_name, group_name),
-    FOREIGN KEY (stage_name) REFERENCES IndividualPerformers(stage_name),
-    FOREIGN KEY (group_name) REFERENCES Groups(group_name)
+    FOREIGN KEY (stage_name) REFERENCES IndividualPerformers(stage_name) ON DELETE CASCADE,
+    FOREIGN KEY (group_name) REFERENCES Groups(group_name) ON DELETE CASCADE
 );
 
 
@@ -83,11 +90,53 @@ CREATE TABLE Tickets (
     purchased_by INT,
     price FLOAT NOT NULL,
     PRIMARY KEY (id, event_name),
-    FOREIGN KEY (purchased_by) REFERENCES Users(id),
-    FOREIGN KEY (event_name) REFERENCES Events(event_name)
+    FOREIGN KEY (purchased_by) REFERENCES Users(id) ON DELETE RESTRICT,
+    FOREIGN KEY (event_name) REFERENCES Events(event_name) ON DELETE CASCADE
+);
+
+
+-- Summary tables read by the Admin Dashboard. Kept up to date by the ticket
+-- insert/update/delete paths in ticket_utils.py, rebuilt with `python aggregates.py --rebuild`
+CREATE TABLE UserTicketStats (
+    user_id INT,
+    ticket_count INT NOT NULL,
+    total_spent DOUBLE NOT NULL,
+    PRIMARY KEY (user_id),
+    INDEX (ticket_count),
+    INDEX (total_spent)
+);
+
+
+CREATE TABLE EventRevenueStats (
+    event_name VARCHAR(100),
+    tickets_sold INT NOT NULL,
+    total_revenue DOUBLE NOT NULL,
+    PRIMARY KEY (event_name),
+    INDEX (total_revenue)
 );
 
 
+-- Next free ticket ID of every event, handed out by ticket_ids.py
+CREATE TABLE TicketSequences (
+    event_name VARCHAR(100),
+    next_id INT NOT NULL,
+    PRIMARY KEY (event_name)
+);
+
+
+-- Tickets issued and sold per event, checked against Venue.capacity on every sale (see inventory.py).
+-- Kept up to date by the ticket write paths, rebuilt with `python inventory.py --rebuild`
+CREATE TABLE EventInventory (
+    event_name VARCHAR(100),
+    tickets_issued INT NOT NULL,
+    tickets_sold INT NOT NULL,
+    PRIMARY KEY (event_name)
+);
+
+
+-- Secondary indexes for search, dashboard and delete paths are in indexes.sql (run it after this file)
+
+
 
 
 
@@ -1700,3 +1749,27 @@ INSERT INTO Tickets (id, event_name, purchased_by, price) VALUES
 (10, 'Isle of Wight Festival', NULL, 515.75);
 
 
+-- Fill the dashboard summary tables from the sample tickets
+INSERT INTO UserTicketStats (user_id, ticket_count, total_spent)
+SELECT purchased_by, COUNT(*), SUM(price)
+FROM Tickets
+WHERE purchased_by IS NOT NULL
+GROUP BY purchased_by;
+
+INSERT INTO EventRevenueStats (event_name, tickets_sold, total_revenue)
+SELECT event_name, COUNT(*), SUM(price)
+FROM Tickets
+WHERE purchased_by IS NOT NULL
+GROUP BY event_name;
+
+-- Start every event's ticket sequence after its sample tickets
+INSERT INTO TicketSequences (event_name, next_id)
+SELECT event_name, MAX(id) + 1
+FROM Tickets
+GROUP BY event_name;
+
+-- Count every event's sample tickets against its venue
+INSERT INTO EventInventory (event_name, tickets_issued, tickets_sold)
+SELECT e.event_name, COUNT(t.id), COUNT(t.purchased_by)
+FROM Events e LEFT JOIN Tickets t ON t.event_name = e.event_name
+GROUP BY e.event_name;
@@ -0,0 +1,200 @@
+# profiler.py
+# This file contains the built-in profiler for the Ticket Apprentice application
+# Functionality includes:
+# - Profiling UI actions (search, insert, Search All, ...) with cProfile while profiling mode is on
+# - Separate sections for the main thread ([ui]) and the worker threads ([worker]) of each action
+# - Splitting the profiled time into database, Tk and Python time
+# - The top functions by cumulative time, and pstats files for offline analysis
+#
+# Profiling mode starts on when the TICKET_PROFILE environment variable is set (ex. TICKET_PROFILE=1)
+# and can be switched at runtime from the Admin Dashboard.
+
+import cProfile
+import datetime
+import functools
+import os
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+PROFILE_ENV_VAR = "TICKET_PROFILE"
+
+
+def _category(function):
+    # Built-in entries look like ('~', 0, "<method 'execute' of 'mariadb.cursor' objects>")
+    filename, _, name = function
+    if 'mariadb' in name or 'mariadb' in filename:
+        return 'database'
+    if '_tkinter' in name or f"{os.sep}tkinter{os.sep}" in filename:
+        return 'tk'
+    return 'python'
+
+
+def _label(function):
+    filename, line, name = function
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class ActionProfiler:
+    """
+    Collects one pstats.Stats per action name. Nothing is recorded while disabled, and the only
+    cost of a section is checking the enabled flag.
+
+    Python 3.12+ allows only one cProfile profiler at a time, so a section that starts while another
+    thread is being profiled runs unprofiled and is counted as skipped.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._stats = {}  # action -> pstats.Stats
+        self._runs = {}   # action -> [count, wall seconds]
+        self._skipped = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()  # the section active on this thread, if any
+
+    @contextmanager
+    def section(self, action):
+        """
+        Profile the body of the with block under the given action name.
+        A section nested in another on the same thread is part of the outer one.
+        """
+        if not self.enabled or getattr(self._local, 'active', False):
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            with self._lock:
+                self._skipped += 1
+            yield
+            return
+
+        self._local.active = True
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._local.active = False
+            self._add(action, profile, time.perf_counter() - started)
+
+    def _add(self, action, profile, seconds):
+        with self._lock:
+            stats = self._stats.get(action)
+            if stats is None:
+                self._stats[action] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            runs = self._runs.setdefault(action, [0, 0.0])
+            runs[0] += 1
+            runs[1] += seconds
+
+    def _merged(self, action=None):
+        with self._lock:
+            if action is not None:
+                selected = [self._stats[action]] if action in self._stats else []
+            else:
+                selected = list(self._stats.values())
+            merged = pstats.Stats()
+            for stats in selected:
+                merged.add(stats)
+        return merged
+
+    def actions(self):
+        """
+        Per-action summary, slowest first.
+
+        Returns:
+            list: dicts with action, runs, wall_ms and the database_ms, tk_ms and python_ms split
+                  of the time spent inside functions (tottime).
+        """
+        with self._lock:
+            names = list(self._runs)
+        summaries = []
+        for action in names:
+            split = {'database': 0.0, 'tk': 0.0, 'python': 0.0}
+            for function, (_, _, tottime, _, _) in self._merged(action).stats.items():
+                split[_category(function)] += tottime
+            with self._lock:
+                runs, wall = self._runs[action]
+            summaries.append({'action': action, 'runs': runs, 'wall_ms': wall * 1000,
+                              'database_ms': split['database'] * 1000, 'tk_ms': split['tk'] * 1000,
+                              'python_ms': split['python'] * 1000})
+        return sorted(summaries, key=lambda summary: summary['wall_ms'], reverse=True)
+
+    def top_functions(self, action=None, limit=20):
+        """
+        The functions with the highest cumulative time, for one action or across all of them.
+
+        Returns:
+            list: dicts with function, category, calls, tottime_ms and cumtime_ms.
+        """
+        stats = self._merged(action).stats
+        ordered = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [{'function': _label(function), 'category': _category(function), 'calls': calls,
+                 'tottime_ms': tottime * 1000, 'cumtime_ms': cumtime * 1000}
+                for function, (_, calls, tottime, cumtime, _) in ordered]
+
+    def dump(self, directory):
+        """
+        Write one .pstats file per action (open them with `python -m pstats <file>` or snakeviz).
+
+        Returns:
+            list: Paths of the files written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        with self._lock:
+            names = list(self._stats)
+        paths = []
+        for action in names:
+            path = os.path.join(directory, f"{stamp}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', action).strip('_')}.pstats")
+            self._merged(action).dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'actions': len(self._stats), 'skipped': self._skipped}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._runs.clear()
+            self._skipped = 0
+
+
+def profiling_requested():
+    """
+    Whether the TICKET_PROFILE environment variable asks for profiling mode.
+    """
+    return os.environ.get(PROFILE_ENV_VAR, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+# Process-wide profiler used by ticket_utils.py and db_executor.py
+profiler = ActionProfiler(enabled=profiling_requested())
+
+
+def configure_profiler(enabled):
+    """
+    Switch profiling mode on or off. Stats collected so far are kept.
+    """
+    profiler.enabled = enabled
+
+
+def profiled(func):
+    """
+    Decorator profiling every call of a UI action under the function's name while profiling mode is on.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profiler.section(f"{func.__name__} [ui]"):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,58 @@
+# queries.py
+# This file contains the canned SQL used by the Ticket Apprentice application
+# Functionality includes:
+# - The Search Tickets filter builder
+# - Other fixed lookups shared between the UI and the maintenance scripts
+#
+# Keeping the SQL here (instead of inline in main.py) lets scripts such as
+# check_indexes.py EXPLAIN the same statements the UI runs without opening a window.
+
+
+# Search Tickets
+
+# Cities that have at least one ticketed event, used to fill the city listbox
+city_list_query = "SELECT DISTINCT city FROM Venue JOIN (Tickets JOIN Events USING (event_name)) USING (venue_name)"
+
+# Extra event details shown when a search result is double clicked
+ticket_info_query = "SELECT e.venue_name, e.event_date, e.start_time FROM Events e JOIN Tickets t USING (event_name) WHERE t.id = %s"
+
+ticket_search_base = "SELECT id, event_name, purchased_by, price FROM Tickets JOIN Events USING (event_name) JOIN Venue USING (venue_name) WHERE "
+
+
+def build_ticket_search_query(min_price, max_price, not_purchased, cities):
+    """
+    Build the Search Tickets query from the selected filters.
+
+    Args:
+        min_price (float): Minimum price, 0 or None for no lower bound.
+        max_price (float): Maximum price, None or '' for no upper bound.
+        not_purchased (bool): Only return tickets nobody has purchased.
+        cities (list): Venue cities to include, empty for all cities.
+
+    Returns:
+        tuple: (query string, list of parameter values)
+    """
+    conditions = []
+    values = []
+
+    if min_price:
+        conditions.append("price >= %s")
+        values.append(float(min_price))
+
+    if max_price:
+        conditions.append("price <= %s")
+        values.append(float(max_price))
+
+    if not_purchased:
+        conditions.append("purchased_by IS NULL")
+
+    # Venue is already joined, so filter on its city directly (uses the Venue city index)
+    if cities:
+        placeholders = ', '.join(['%s'] * len(cities))
+        conditions.append(f"city IN ({placeholders})")
+        values.extend(cities)
+
+    # Combine conditions into the final query
+    if conditions:
+        return ticket_search_base + " AND ".join(conditions), values
+    return ticket_search_base + "1", values  # To avoid syntax error if no conditions are specified
@@ -0,0 +1,203 @@
+# query_cache.py
+# This file contains the query result cache for the Ticket Apprentice application
+# Functionality includes:
+# - Caching query results keyed by the query text and parameters
+# - A TTL after which entries are served stale while they are refreshed in the background
+# - Invalidation by table name, triggered by the app's own writes
+# - Hit, miss and refresh statistics
+
+import threading
+import time
+
+
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_STALE_SECONDS = 300
+
+# States returned by QueryCache.lookup
+FRESH = 'fresh'
+STALE = 'stale'
+MISS = 'miss'
+
+
+class CacheEntry:
+    """
+    Cached rows for one query plus the tables they were read from.
+    """
+
+    def __init__(self, rows, tables, fetched_at):
+        self.rows = rows
+        self.tables = frozenset(tables)
+        self.fetched_at = fetched_at
+        self.refreshing = False
+
+
+class QueryCache:
+    """
+    Result cache with a TTL and stale-while-revalidate.
+
+    An entry younger than ttl is served as is. Between ttl and ttl + stale_seconds
+    it is still served, but the caller should refresh it in the background.
+    Older entries, and entries whose tables were invalidated, are misses.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, stale_seconds=DEFAULT_STALE_SECONDS):
+        self.ttl = ttl
+        self.stale_seconds = stale_seconds
+        self._entries = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._invalidations = 0
+        self._generation = 0
+
+    @staticmethod
+    def make_key(query, values=()):
+        """
+        Cache key for a query: whitespace-normalised SQL plus its parameters.
+        """
+        return (" ".join(query.split()), tuple(values))
+
+    def lookup(self, key):
+        """
+        Look up a key and count the hit or miss.
+
+        Args:
+            key (tuple): Key from make_key.
+
+        Returns:
+            tuple: (state, rows) where state is FRESH, STALE or MISS and rows is None on a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    self._hits += 1
+                    return FRESH, entry.rows
+                if age < self.ttl + self.stale_seconds:
+                    self._stale_hits += 1
+                    return STALE, entry.rows
+                del self._entries[key]
+            self._misses += 1
+            return MISS, None
+
+    def begin_refresh(self, key):
+        """
+        Claim the background refresh of a stale entry.
+
+        Returns:
+            bool: True if the caller should refresh, False if a refresh is already running.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refreshing:
+                return False
+            entry.refreshing = True
+            self._refreshes += 1
+            return True
+
+    def abandon_refresh(self, key):
+        """
+        Release a refresh claimed with begin_refresh that failed, so a later lookup can retry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def generation(self):
+        """
+        Counter bumped by every invalidation. Read it before fetching and pass it to store().
+        """
+        with self._lock:
+            return self._generation
+
+    def store(self, key, rows, tables, generation=None):
+        """
+        Store freshly fetched rows.
+
+        Args:
+            key (tuple): Key from make_key.
+            rows (list): The query results.
+            tables (iterable): Tables the query reads, used for invalidation.
+            generation (int): Value of generation() when the fetch started. If an invalidation
+                              happened since, the rows may predate the write and are not stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = CacheEntry(rows, tables, time.monotonic())
+
+    def invalidate(self, *tables):
+        """
+        Drop every entry that reads any of the given tables and notify listeners.
+        Call after a write to those tables has been committed.
+
+        Args:
+            *tables (str): Table names that were written to.
+        """
+        changed = set(tables)
+        with self._lock:
+            stale_keys = [key for key, entry in self._entries.items() if entry.tables & changed]
+            for key in stale_keys:
+                del self._entries[key]
+            self._invalidations += len(stale_keys)
+            self._generation += 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(changed)
+
+    def add_invalidation_listener(self, listener):
+        """
+        Register listener(tables) to be called after every invalidation.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            dict: entries, hits, stale_hits, misses, refreshes, invalidations and hit_ratio.
+        """
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'stale_hits': self._stale_hits,
+                'misses': self._misses,
+                'refreshes': self._refreshes,
+                'invalidations': self._invalidations,
+                'hit_ratio': (self._hits + self._stale_hits) / lookups if lookups else 0.0,
+            }
+
+
+# Process-wide cache for the Admin Dashboard reports
+dashboard_cache = QueryCache()
+
+
+def configure_dashboard_cache(ttl=DEFAULT_TTL_SECONDS, stale_seconds=DEFAULT_STALE_SECONDS):
+    """
+    Set the TTL and stale window of the dashboard cache.
+    """
+    dashboard_cache.ttl = ttl
+    dashboard_cache.stale_seconds = stale_seconds
+
+
+def invalidate_dashboard(*tables):
+    """
+    Invalidate dashboard reports that read any of the given tables.
+    """
+    dashboard_cache.invalidate(*tables)
@@ -0,0 +1,315 @@
+# query_stats.py
+# This file contains the query instrumentation for the Ticket Apprentice application
+# Functionality includes:
+# - A cursor wrapper (handed out by db_pool) that times every execute, executemany and fetch
+# - SQL fingerprints: the statement with its literals and parameters replaced by ?
+# - Per-fingerprint counters plus a rolling latency histogram over the most recent executions
+# - Connect times of new pool connections
+# - A slow-query log file for statements over a configurable threshold
+#
+# Parameter values are never recorded or logged, only how many there were.
+
+import datetime
+import math
+import re
+import threading
+import time
+from collections import deque
+
+
+DEFAULT_WINDOW = 1000
+DEFAULT_SLOW_QUERY_MS = 500
+DEFAULT_SLOW_QUERY_LOG = "slow_queries.log"
+
+# Upper bounds (ms) of the histogram buckets; anything slower lands in the last, open bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_literal_pattern = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b")
+_value_list_pattern = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint(query):
+    """
+    Normalise a statement so executions that differ only in their values share statistics.
+
+    Whitespace is collapsed, literals and %s placeholders become ?, and lists of them
+    (ex. an IN list whose length depends on the selected filters) become (?+).
+    """
+    text = ' '.join(query.split()).rstrip(';').strip()
+    text = _literal_pattern.sub('?', text)
+    text = text.replace('%s', '?')
+    return _value_list_pattern.sub('(?+)', text)
+
+
+def _count_params(values):
+    return 0 if values is None else len(values)
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    # Nearest rank
+    return ordered[max(1, math.ceil(fraction * len(ordered))) - 1]
+
+
+class LatencyStats:
+    """
+    Totals since the last reset plus the most recent `window` durations, from which the
+    percentiles and histogram are computed, so they follow the current behaviour.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.fetch_time = 0.0
+        self.params = 0
+        self.rows_returned = 0
+        self.rows_affected = 0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total_time += seconds
+        self.max_time = max(self.max_time, seconds)
+        self.recent.append(seconds)
+
+    def summary(self):
+        ordered = sorted(self.recent)
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for seconds in ordered:
+            histogram[_bucket_index(seconds * 1000)] += 1
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': self.total_time * 1000,
+            'mean_ms': self.total_time / self.count * 1000 if self.count else None,
+            'p50_ms': _ms(_percentile(ordered, 0.50)),
+            'p95_ms': _ms(_percentile(ordered, 0.95)),
+            'p99_ms': _ms(_percentile(ordered, 0.99)),
+            'max_ms': self.max_time * 1000,
+            'fetch_ms': self.fetch_time * 1000,
+            'params': self.params,
+            'rows_returned': self.rows_returned,
+            'rows_affected': self.rows_affected,
+            'histogram': histogram,
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def _bucket_index(milliseconds):
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if milliseconds <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+class QueryStats:
+    """
+    Statistics for every statement fingerprint, plus connect times and the slow-query log.
+    Safe to use from the worker threads.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, slow_query_ms=DEFAULT_SLOW_QUERY_MS, slow_query_log=DEFAULT_SLOW_QUERY_LOG):
+        self.enabled = True
+        self.window = window
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_log = slow_query_log
+        self._statements = {}  # fingerprint -> LatencyStats
+        self._connects = LatencyStats(window)
+        self._fingerprints = {}  # query text -> fingerprint, the app only runs a few hundred distinct texts
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._slow_queries = 0
+
+    def fingerprint_of(self, query):
+        found = self._fingerprints.get(query)
+        if found is None:
+            found = fingerprint(query)
+            if len(self._fingerprints) > 5000:
+                self._fingerprints.clear()
+            self._fingerprints[query] = found
+        return found
+
+    def record(self, query, params, seconds, rows_affected=0, error=None):
+        """
+        Record one execute (or executemany) of query.
+
+        Args:
+            query (str): The statement text.
+            params (int): Number of parameter values sent with it.
+            seconds (float): Time spent in execute.
+            rows_affected (int): Rows changed by a write, 0 for a SELECT.
+            error (Exception): The error the statement raised, if any.
+
+        Returns:
+            str: The fingerprint, used to attribute the rows fetched afterwards.
+        """
+        key = self.fingerprint_of(query)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = LatencyStats(self.window)
+            stats.add(seconds)
+            stats.params += params
+            stats.rows_affected += max(0, rows_affected or 0)
+            if error is not None:
+                stats.errors += 1
+
+        if self.slow_query_ms is not None and seconds * 1000 >= self.slow_query_ms:
+            self._log_slow_query(key, params, seconds, rows_affected, error)
+        return key
+
+    def add_fetch(self, key, rows, seconds):
+        if key is None:
+            return
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is not None:
+                stats.rows_returned += rows
+                stats.fetch_time += seconds
+
+    def record_connect(self, seconds):
+        with self._lock:
+            self._connects.add(seconds)
+
+    def _log_slow_query(self, key, params, seconds, rows_affected, error):
+        with self._lock:
+            self._slow_queries += 1
+        if not self.slow_query_log:
+            return
+        fields = [datetime.datetime.now().isoformat(timespec='milliseconds'), f"{seconds * 1000:.1f} ms",
+                  f"params={params}", f"rows_affected={rows_affected or 0}"]
+        if error is not None:
+            fields.append(f"error={type(error).__name__}")
+        line = "\t".join(fields + [key]) + "\n"
+        try:
+            with self._log_lock, open(self.slow_query_log, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Error: {e}")
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: statements (fingerprint -> LatencyStats.summary(), slowest total first),
+                  connects (summary of the pool's connect times) and slow_queries.
+        """
+        with self._lock:
+            statements = {key: stats.summary() for key, stats in self._statements.items()}
+            connects = self._connects.summary()
+            slow_queries = self._slow_queries
+        ordered = dict(sorted(statements.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+        return {'statements': ordered, 'connects': connects, 'slow_queries': slow_queries}
+
+    def report(self, top=10):
+        """
+        The top fingerprints by total time as printable text.
+        """
+        snapshot = self.snapshot()
+        lines = [f"{'count':>7} {'total ms':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rows':>9}  statement"]
+        for key, stats in list(snapshot['statements'].items())[:top]:
+            lines.append(f"{stats['count']:7} {stats['total_ms']:10.1f} {stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} "
+                         f"{stats['p99_ms']:8.2f} {stats['rows_returned'] + stats['rows_affected']:9}  {key[:120]}")
+        connects = snapshot['connects']
+        if connects['count']:
+            lines.append(f"{connects['count']} connections opened, p50 {connects['p50_ms']:.1f} ms, max {connects['max_ms']:.1f} ms")
+        lines.append(f"{snapshot['slow_queries']} statements over {self.slow_query_ms} ms")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._connects = LatencyStats(self.window)
+            self._slow_queries = 0
+
+
+class InstrumentedCursor:
+    """
+    Wraps a MariaDB cursor and reports every statement and fetch to a QueryStats.
+    Everything else is forwarded to the wrapped cursor.
+    """
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+        self._key = None
+
+    def _rows_affected(self):
+        # rowcount of a SELECT is the number of rows buffered; those are counted as they are fetched
+        if self._cursor.description is not None:
+            return 0
+        return self._cursor.rowcount
+
+    def execute(self, query, *args, **kwargs):
+        values = args[0] if args else kwargs.get('data')
+        started = time.perf_counter()
+        try:
+            result = self._cursor.execute(query, *args, **kwargs)
+        except Exception as e:
+            self._key = self._stats.record(query, _count_params(values), time.perf_counter() - started, error=e)
+            raise
+        self._key = self._stats.record(query, _count_params(values), time.perf_counter() - started, self._rows_affected())
+        return result
+
+    def executemany(self, query, seq_of_values, *args, **kwargs):
+        params = sum(_count_params(values) for values in seq_of_values)
+        started = time.perf_counter()
+        try:
+            result = self._cursor.executemany(query, seq_of_values, *args, **kwargs)
+        except Exception as e:
+            self._key = self._stats.record(query, params, time.perf_counter() - started, error=e)
+            raise
+        self._key = self._stats.record(query, params, time.perf_counter() - started, self._rows_affected())
+        return result
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._stats.add_fetch(self._key, 0 if row is None else 1, time.perf_counter() - started)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.add_fetch(self._key, len(rows), time.perf_counter() - started)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._stats.add_fetch(self._key, len(rows), time.perf_counter() - started)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cursor.close()
+        return False
+
+
+# Process-wide statistics for every connection borrowed from db_pool
+query_stats = QueryStats()
+
+
+def configure_query_stats(enabled=True, slow_query_ms=DEFAULT_SLOW_QUERY_MS, slow_query_log=DEFAULT_SLOW_QUERY_LOG,
+                          window=DEFAULT_WINDOW):
+    """
+    Turn the instrumentation on or off and set the slow-query threshold and log file.
+    A slow_query_log of None or '' only counts slow statements without writing them anywhere.
+    """
+    query_stats.enabled = enabled
+    query_stats.slow_query_ms = slow_query_ms
+    query_stats.slow_query_log = slow_query_log or None
+    query_stats.window = window
@@ -0,0 +1,227 @@
+# streaming.py
+# This file contains streaming result delivery for the Ticket Apprentice application
+# Functionality includes:
+# - Pulling rows from an unbuffered cursor in fixed-size fetchmany batches
+# - Showing the first batch in a Treeview as soon as it arrives
+# - Bounding client memory by letting only a couple of batches be in flight
+# - Stopping a stream partway through
+
+import threading
+
+from db_pool import get_connection
+from db_executor import run_in_background, cancel_background
+
+
+DEFAULT_BATCH_SIZE = 500
+
+# Batches fetched but not yet inserted into the Treeview. The worker waits
+# when this many are queued, so a fast server cannot outrun the UI.
+MAX_BATCHES_IN_FLIGHT = 2
+
+_batch_size = DEFAULT_BATCH_SIZE
+
+# key -> TreeStream currently filling a Treeview
+active_streams = {}
+
+
+def set_default_batch_size(batch_size):
+    """
+    Set the batch size used when stream_into_tree is called without one.
+
+    Args:
+        batch_size (int): Rows per fetchmany call.
+    """
+    global _batch_size
+    if batch_size < 1:
+        raise ValueError("Batch size must be a positive integer")
+    _batch_size = batch_size
+
+
+class QueryStream:
+    """
+    Rows of one query read from an unbuffered cursor, batch by batch.
+
+    Use as a context manager. If the with block is left before every batch was read
+    (ex. the task was cancelled), the rest of the result set is not drained; the
+    connection is discarded instead of returned to the pool.
+    """
+
+    def __init__(self, query, values=(), batch_size=None):
+        self.query = query
+        self.values = values
+        self.batch_size = batch_size or _batch_size
+        self.columns = []
+        self._conn = None
+        self._cursor = None
+        self._finished = False
+
+    def __enter__(self):
+        self._conn = get_connection()
+        try:
+            self._cursor = self._conn.cursor(buffered=False)
+            self._cursor.execute(self.query, self.values)
+        except Exception:
+            self._conn.discard()
+            raise
+        self.columns = [column[0] for column in self._cursor.description]
+        return self
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def batches(self):
+        """
+        Yield lists of up to batch_size rows until the result set is exhausted.
+        """
+        while True:
+            rows = self._cursor.fetchmany(self.batch_size)
+            if not rows:
+                self._finished = True
+                return
+            yield rows
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._finished:
+            self._cursor.close()
+            self._conn.close()
+        else:
+            self._conn.discard()
+        return False
+
+
+def deliver_batches(task, batches, on_batch):
+    """
+    Post row batches to the main thread, at most MAX_BATCHES_IN_FLIGHT at a time.
+    Runs on a worker thread and stops early if the task is cancelled.
+
+    Args:
+        task (BackgroundTask): The task running this stream.
+        batches (iterable): Lists of rows.
+        on_batch (callable): Called on the main thread with each list of rows.
+
+    Returns:
+        int: Number of rows delivered.
+    """
+    in_flight = threading.Semaphore(MAX_BATCHES_IN_FLIGHT)
+
+    def deliver(rows):
+        in_flight.release()
+        on_batch(rows)
+
+    total = 0
+    for rows in batches:
+        if task.cancelled:
+            break
+        total += len(rows)
+
+        # Wait for the UI to catch up, checking for cancellation while we wait
+        while not in_flight.acquire(timeout=0.1):
+            if task.cancelled:
+                break
+        if task.cancelled:
+            break
+        task.post(deliver, rows)
+
+    return total
+
+
+def stream_query(task, query, values=(), batch_size=None, on_batch=None):
+    """
+    Run a query on an unbuffered cursor and hand the rows over batch by batch.
+    Runs on a worker thread; on_batch is posted to the main thread.
+
+    If the task is cancelled partway through, the rest of the result set is
+    not drained; the connection is discarded instead of returned to the pool.
+
+    Args:
+        task (BackgroundTask): The task running this stream.
+        query (str): The SQL query to run.
+        values (tuple or list): Parameters for the query.
+        batch_size (int): Rows per fetchmany call.
+        on_batch (callable): Called on the main thread with each list of rows.
+
+    Returns:
+        int: Number of rows streamed.
+    """
+    with QueryStream(query, values, batch_size) as stream:
+        return deliver_batches(task, stream.batches(), on_batch)
+
+
+class TreeStream:
+    """
+    Progress of one stream into a Treeview, kept on the main thread.
+    """
+
+    def __init__(self, tree, status_label=None):
+        self.tree = tree
+        self.status_label = status_label
+        self.rows_shown = 0
+        self.task = None
+
+    def add_batch(self, rows):
+        for row in rows:
+            self.tree.insert("", "end", values=row)
+        self.rows_shown += len(rows)
+        self.set_status(f"Loading... {self.rows_shown:,} rows")
+
+    def set_status(self, text):
+        if self.status_label is not None:
+            self.status_label.config(text=text)
+
+
+def stream_into_tree(key, tree, query, values=(), batch_size=None, status_label=None, on_error=None, source=None):
+    """
+    Clear a Treeview and fill it from a streamed query without blocking the mainloop.
+    Starting a new stream under the same key stops the previous one.
+
+    Args:
+        key (str): Identifies the stream; pass the same key to stop_stream.
+        tree (ttk.Treeview): The Treeview to fill.
+        query (str): The SQL query to run.
+        values (tuple or list): Parameters for the query.
+        batch_size (int): Rows per fetchmany call.
+        status_label (Label): Optional label showing how many rows have loaded.
+        on_error (callable): Optional error handler, defaults to the executor's message box.
+        source (callable): Optional source(batch_size) returning row batches from somewhere other
+                           than the database (ex. the ticket index); query and values are then ignored.
+
+    Returns:
+        TreeStream: Progress of the new stream.
+    """
+    stream = TreeStream(tree, status_label)
+    active_streams[key] = stream
+
+    # Clear previous results
+    for item in tree.get_children():
+        tree.delete(item)
+    stream.set_status("Loading...")
+
+    def finished(total):
+        if active_streams.get(key) is stream:
+            del active_streams[key]
+        stream.set_status(f"{total:,} rows")
+
+    kwargs = {} if on_error is None else {'on_error': on_error}
+    if source is not None:
+        def work(task):
+            return deliver_batches(task, source(batch_size or _batch_size), stream.add_batch)
+    else:
+        def work(task):
+            return stream_query(task, query, values, batch_size, stream.add_batch)
+
+    stream.task = run_in_background(key, work, on_success=finished, **kwargs)
+    return stream
+
+
+def stop_stream(key):
+    """
+    Stop the stream running under key, keeping the rows already shown.
+
+    Args:
+        key (str): The key the stream was started with.
+    """
+    stream = active_streams.pop(key, None)
+    cancel_background(key)
+    if stream is not None:
+        stream.set_status(f"Stopped after {stream.rows_shown:,} rows")
@@ -0,0 +1,101 @@
+# test_bulk_import.py
+# Unit tests for the ticket ID handling of bulk_import.py
+# Functionality includes:
+# - A fake cursor running the TicketSequences statements of ticket_ids.py over in-memory tables
+# - Tickets with explicit and blank IDs for one event never get the same ID, with or without
+#   an existing sequence row
+#
+# Usage: python -m unittest test_bulk_import   (or pytest)
+
+import unittest
+from unittest import mock
+
+import bulk_import
+from bulk_import import TABLE_SPECS, RejectionReport, _import_chunk, _normalize
+from ticket_ids import advance_sequence_query, create_sequence_query, sync_sequence_query
+
+
+class FakeTicketCursor:
+    """
+    The statements of one import transaction on Tickets and TicketSequences, where the
+    primary key (id, event_name) rejects duplicates like the server does.
+    """
+
+    def __init__(self, tickets=(), sequences=None):
+        self.tickets = {(id, event_name) for id, event_name in tickets}
+        self.sequences = dict(sequences or {})
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def _max_id(self, event_name):
+        return max((id for id, event in self.tickets if event == event_name), default=0)
+
+    def execute(self, query, values=()):
+        if query == advance_sequence_query:
+            count, event_name = values
+            self.rowcount = 0
+            if event_name in self.sequences:
+                self.sequences[event_name] += count
+                self.lastrowid = self.sequences[event_name]
+                self.rowcount = 1
+        elif query == create_sequence_query:
+            event_name, count = values[0], values[1]
+            self.sequences[event_name] = self._max_id(event_name) + 1 + count
+            self.lastrowid = self.sequences[event_name]
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def executemany(self, query, rows):
+        if query == sync_sequence_query:
+            for event_name, _ in rows:
+                if event_name in self.sequences:
+                    self.sequences[event_name] = max(self.sequences[event_name], self._max_id(event_name) + 1)
+            return
+        assert query.startswith("INSERT INTO Tickets"), query
+        for id, event_name, _, _ in rows:
+            if (id, event_name) in self.tickets:
+                raise AssertionError(f"Duplicate entry '{id}-{event_name}' for key 'PRIMARY'")
+            self.tickets.add((id, event_name))
+
+
+def existing_references(cursor, table, columns, values):
+    # Every event and user exists; no ticket of the chunk does yet
+    if table == 'Tickets':
+        return set()
+    return {tuple(_normalize(value) for value in key) for key in values}
+
+
+@mock.patch.object(bulk_import, 'issue_inserted_tickets', mock.Mock())
+@mock.patch.object(bulk_import, 'record_tickets_inserted', mock.Mock())
+@mock.patch.object(bulk_import, '_within_capacity', lambda cursor, path, tickets, report: tickets)
+@mock.patch.object(bulk_import, '_existing_values', existing_references)
+class MixedTicketIdsTest(unittest.TestCase):
+
+    def import_chunk(self, cursor, ids):
+        chunk = [(line, {'id': id, 'event_name': 'Gala', 'purchased_by': 'N/A', 'price': '10'})
+                 for line, id in enumerate(ids, start=2)]
+        report = RejectionReport()
+        kept = _import_chunk(cursor, 'Tickets', TABLE_SPECS['Tickets'], 'Tickets.csv', chunk, set(), report)
+        self.assertEqual(len(report), 0)
+        return sorted(id for id, _, _, _ in kept)
+
+    def test_blank_ids_skip_explicit_ids_of_the_chunk_with_a_sequence(self):
+        # The sequence still points at 1: it has not seen the explicit IDs of this chunk
+        cursor = FakeTicketCursor(sequences={'Gala': 1})
+        ids = self.import_chunk(cursor, ['', '1', '', '2', '3', ''])
+        self.assertEqual(ids, [1, 2, 3, 4, 5, 6])
+
+    def test_blank_ids_skip_explicit_ids_of_the_chunk_without_a_sequence(self):
+        cursor = FakeTicketCursor(tickets=[(1, 'Gala')])
+        ids = self.import_chunk(cursor, ['', '5', '', '2'])
+        self.assertEqual(ids, [2, 5, 6, 7])
+
+    def test_blank_ids_skip_explicit_ids_of_an_earlier_chunk(self):
+        cursor = FakeTicketCursor(sequences={'Gala': 1})
+        self.import_chunk(cursor, ['1', '2'])
+        self.assertEqual(self.import_chunk(cursor, ['', '']), [3, 4])
+        self.assertEqual(len(cursor.tickets), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+# test_deletes.py
+# Unit tests for the bulk delete planning of deletes.py
+# Functionality includes:
+# - A RESTRICT dependent blocks its parent key however the key was typed (case, trailing spaces)
+# - Pasted keys differing only in case are listed once
+#
+# Usage: python -m unittest test_deletes   (or pytest)
+
+import unittest
+
+from deletes import BulkDeleteImpact, parse_key_list, rules_for
+
+
+class BulkDeleteImpactTest(unittest.TestCase):
+
+    def test_blocked_key_matches_like_the_collation(self):
+        impact = BulkDeleteImpact('Venue', [('arena ',), ('Stadium',)])
+        events = next(rule for rule in rules_for('Venue') if rule.table == 'Events')
+        # The server reports the parent value as stored in Events
+        impact.dependents[events] = {'Arena': 3}
+        self.assertEqual(impact.deletable, [('Stadium',)])
+
+    def test_repeated_keys_in_another_case_are_skipped(self):
+        self.assertEqual(parse_key_list('Groups', "The Band\nthe band \nOther"), [('The Band',), ('Other',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
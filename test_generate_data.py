@@ -0,0 +1,47 @@
+# test_generate_data.py
+# Unit tests for the ticket planning of generate_data.py
+# Functionality includes:
+# - The planned ticket total matches --tickets whenever the venues have the seats
+# - No event is planned more tickets than its venue's capacity
+# - A request larger than every seat put together is refused
+#
+# Usage: python -m unittest test_generate_data   (or pytest)
+
+import unittest
+
+from generate_data import DEFAULT_CONFIG, SyntheticData
+
+
+class PlanTicketCountsTest(unittest.TestCase):
+
+    def assert_plan_fits(self, data):
+        capacity = {venue_name: capacity for venue_name, _, capacity in data.venues()}
+        for (_, venue_name, _, _), (count, _) in zip(data.events(), data._ticket_counts):
+            self.assertLessEqual(count, capacity[venue_name])
+
+    def test_planned_tickets_equal_request(self):
+        # The sizes where capping at capacity used to drop tickets
+        for tickets, events in [(1000, 20), (1000000, 1000), (5000000, 2000), (20000000, 1000)]:
+            with self.subTest(tickets=tickets, events=events):
+                data = SyntheticData(DEFAULT_CONFIG._replace(tickets=tickets, events=events))
+                self.assertEqual(data.planned_tickets(), tickets)
+                self.assert_plan_fits(data)
+
+    def test_every_seat_filled(self):
+        config = DEFAULT_CONFIG._replace(events=50, venues=20, tickets=0)
+        empty = SyntheticData(config)
+        capacity = {venue_name: capacity for venue_name, _, capacity in empty.venues()}
+        seats = sum(capacity[venue_name] for _, venue_name, _, _ in empty.events())
+
+        data = SyntheticData(config._replace(tickets=seats))
+        self.assertEqual(data.planned_tickets(), seats)
+        self.assert_plan_fits(data)
+
+    def test_more_tickets_than_seats_is_refused(self):
+        config = DEFAULT_CONFIG._replace(events=5, venues=5, tickets=10 ** 9)
+        with self.assertRaises(ValueError):
+            SyntheticData(config)
+
+
+if __name__ == '__main__':
+    unittest.main()
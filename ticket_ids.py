@@ -0,0 +1,254 @@
+# ticket_ids.py
+# This file contains the per-event ticket ID allocator for the Ticket Apprentice application
+# Functionality includes:
+# - A TicketSequences table holding the next free ticket ID of every event
+# - Atomic allocation with a single UPDATE ... LAST_INSERT_ID(...) statement
+# - Reserving a contiguous block of IDs at once for bulk ticket generation
+# - Caching a small block per event in the client so most sales need no round trip
+#
+# IDs are reserved on their own short transaction, so concurrent sellers never wait on each
+# other's sale and never receive the same ID. An ID whose sale is rolled back is not reused,
+# which leaves gaps in the numbering; ticket IDs only have to be unique within their event.
+
+import threading
+
+from db_pool import get_connection
+
+
+DEFAULT_BLOCK_SIZE = 10
+
+# Also created by populate_tables.sql
+CREATE_SEQUENCE_TABLE = '''
+CREATE TABLE IF NOT EXISTS TicketSequences (
+    event_name VARCHAR(100),
+    next_id INT NOT NULL,
+    PRIMARY KEY (event_name)
+)
+'''
+
+# Advance the counter and remember the new value for this connection only
+advance_sequence_query = "UPDATE TicketSequences SET next_id = LAST_INSERT_ID(next_id + %s) WHERE event_name = %s"
+
+# First allocation for an event: start after the tickets that already exist. If another
+# client created the row in the meantime the duplicate key turns this into the advance above
+create_sequence_query = '''
+INSERT INTO TicketSequences (event_name, next_id)
+SELECT %s, LAST_INSERT_ID(COALESCE(MAX(id), 0) + 1 + %s) FROM Tickets WHERE event_name = %s
+ON DUPLICATE KEY UPDATE next_id = LAST_INSERT_ID(next_id + %s)
+'''
+
+
+# Skip past IDs that were inserted without going through the sequence
+sync_sequence_query = '''
+UPDATE TicketSequences
+SET next_id = GREATEST(next_id, (SELECT COALESCE(MAX(id), 0) + 1 FROM Tickets WHERE event_name = %s))
+WHERE event_name = %s
+'''
+
+
+def _last_insert_id(cursor):
+    # The connector reads LAST_INSERT_ID() from the OK packet; ask explicitly if it did not
+    if cursor.lastrowid:
+        return cursor.lastrowid
+    cursor.execute("SELECT LAST_INSERT_ID()")
+    return cursor.fetchone()[0]
+
+
+def _advance_sequence(cursor, event_name, count):
+    cursor.execute(advance_sequence_query, (count, event_name))
+    if cursor.rowcount == 0:
+        cursor.execute(create_sequence_query, (event_name, count, event_name, count))
+    end = _last_insert_id(cursor)
+    return range(end - count, end)
+
+
+def reserve_block(conn, event_name, count):
+    """
+    Reserve count consecutive ticket IDs for an event and commit the reservation.
+
+    Args:
+        conn: Database connection; it is committed, so do not pass one with pending work.
+        event_name (str): The event the tickets belong to.
+        count (int): Number of IDs to reserve.
+
+    Returns:
+        range: The reserved IDs.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+
+    cursor = conn.cursor()
+    try:
+        reserved = _advance_sequence(cursor, event_name, count)
+        conn.commit()
+        return reserved
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def sync_ticket_sequences(cursor, event_names):
+    """
+    Move the sequences of the given events past tickets that were inserted with explicit IDs
+    (ex. by bulk_import.py). Events without a sequence yet start after MAX(id) anyway.
+
+    Args:
+        cursor: Cursor of the connection that inserted the tickets.
+        event_names (iterable): Events whose tickets were inserted.
+
+    Returns:
+        None
+    """
+    cursor.executemany(sync_sequence_query, [(event_name, event_name) for event_name in event_names])
+
+
+def reserve_ticket_ids_in(cursor, event_name, count):
+    """
+    Reserve count consecutive ticket IDs for an event inside the caller's transaction, ex. a
+    bulk_import.py chunk that has just inserted tickets with explicit IDs and synced the sequence
+    past them. A sequence created here starts after those uncommitted tickets too. The sequence
+    row stays locked until the caller commits, so other sellers of the event wait for the chunk.
+
+    Args:
+        cursor: Cursor of the connection inserting the tickets (TicketSequences must already exist).
+        event_name (str): The event the tickets belong to.
+        count (int): Number of IDs to reserve.
+
+    Returns:
+        range: The reserved IDs.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    return _advance_sequence(cursor, event_name, count)
+
+
+def rebuild_ticket_sequences(cursor):
+    """
+    Start every event's sequence after its highest ticket ID, creating missing sequences.
+    Used after loading tickets in bulk outside the allocator (ex. generate_data.py).
+
+    Args:
+        cursor: Database cursor.
+
+    Returns:
+        None
+    """
+    cursor.execute(CREATE_SEQUENCE_TABLE)
+    cursor.execute('''
+        INSERT INTO TicketSequences (event_name, next_id)
+        SELECT event_name, MAX(id) + 1 FROM Tickets GROUP BY event_name
+        ON DUPLICATE KEY UPDATE next_id = GREATEST(next_id, VALUES(next_id))
+    ''')
+
+
+class TicketIdAllocator:
+    """
+    Hands out ticket IDs per event, reserving them from TicketSequences block_size at a time.
+
+    Each process keeps the unused part of its last block per event, so with several box-office
+    clients the IDs of one event interleave between clients but are never duplicated.
+    """
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self._blocks = {}  # event_name -> iterator over the cached IDs
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+        self._allocations = 0
+        self._reservations = 0
+
+    def _reserve(self, event_name, count):
+        conn = get_connection()
+        try:
+            if not self._table_ready:
+                cursor = conn.cursor()
+                cursor.execute(CREATE_SEQUENCE_TABLE)
+                cursor.close()
+                self._table_ready = True
+            self._reservations += 1
+            return reserve_block(conn, event_name, count)
+        finally:
+            conn.close()
+
+    def next_id(self, event_name):
+        """
+        Allocate one ticket ID for an event.
+
+        Args:
+            event_name (str): The event the ticket belongs to.
+
+        Returns:
+            int: An ID no other client has been or will be given for this event.
+        """
+        with self._lock:
+            self._allocations += 1
+            block = self._blocks.get(event_name)
+            new_id = next(block, None) if block is not None else None
+            if new_id is None:
+                block = iter(self._reserve(event_name, self.block_size))
+                self._blocks[event_name] = block
+                new_id = next(block)
+            return new_id
+
+    def reserve(self, event_name, count):
+        """
+        Reserve count consecutive IDs for an event in one round trip, bypassing the cache.
+        Used by bulk ticket generation.
+
+        Returns:
+            range: The reserved IDs.
+        """
+        with self._lock:
+            self._allocations += count
+            return self._reserve(event_name, count)
+
+    def forget(self, event_name=None):
+        """
+        Drop the cached IDs of one event (or of all events). The dropped IDs are never handed out.
+        """
+        with self._lock:
+            if event_name is None:
+                self._blocks.clear()
+            else:
+                self._blocks.pop(event_name, None)
+
+    def stats(self):
+        """
+        Returns:
+            dict: allocations (IDs handed out), reservations (round trips to TicketSequences)
+                  and cached_events.
+        """
+        with self._lock:
+            return {
+                'allocations': self._allocations,
+                'reservations': self._reservations,
+                'cached_events': len(self._blocks),
+            }
+
+
+# Process-wide allocator used by the ticket insert paths
+ticket_ids = TicketIdAllocator()
+
+
+def configure_ticket_ids(block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Set how many IDs are reserved per round trip for single ticket sales.
+    """
+    ticket_ids.block_size = max(1, block_size)
+
+
+def allocate_ticket_id(event_name):
+    """
+    Allocate one ticket ID for an event (see TicketIdAllocator.next_id).
+    """
+    return ticket_ids.next_id(event_name)
+
+
+def reserve_ticket_ids(event_name, count):
+    """
+    Reserve a block of consecutive ticket IDs for an event (see TicketIdAllocator.reserve).
+    """
+    return ticket_ids.reserve(event_name, count)
@@ -0,0 +1,286 @@
+# ticket_index.py
+# This file contains the optional in-memory columnar ticket index for the Ticket Apprentice application
+# Functionality includes:
+# - A NumPy snapshot of every ticket: id, event code, purchased_by, price, plus each event's city code
+# - Running the Search Tickets filters as vectorized masks instead of a 3-way join on the server
+# - Incremental refresh of the events the app itself changed, and a periodic full rebuild
+#   to pick up changes made by other clients
+#
+# NumPy is optional. Without it (or with [ticket_index] enabled = false) searches go to the database.
+
+import threading
+import time
+
+from streaming import QueryStream
+
+try:
+    import numpy as np
+except ImportError:  # The index is optional
+    np = None
+
+
+DEFAULT_MAX_AGE_SECONDS = 300
+
+# Sentinel stored for purchased_by IS NULL
+NOT_PURCHASED = -1
+
+# Same inner joins as the Search Tickets query, so a ticket is indexed exactly when it can be found
+index_tickets_query = '''
+SELECT t.id, t.event_name, t.purchased_by, t.price, v.city
+FROM Tickets t JOIN Events e USING (event_name) JOIN Venue v USING (venue_name)
+'''
+
+
+def numpy_available():
+    return np is not None
+
+
+class TicketSnapshot:
+    """
+    Immutable column arrays for every ticket, sorted by price.
+    Searches read one snapshot while a refresh builds the next.
+    """
+
+    def __init__(self, ids, event_codes, purchased_by, prices, event_names, event_cities, cities):
+        self.ids = ids                    # int64
+        self.event_codes = event_codes    # int32, index into event_names
+        self.purchased_by = purchased_by  # int64, NOT_PURCHASED for NULL
+        self.prices = prices              # float64
+        self.event_names = event_names    # list, code -> event name
+        self.event_cities = event_cities  # int32 array, event code -> city code (-1 once an event is gone)
+        self.cities = cities              # list, code -> city
+
+    def __len__(self):
+        return len(self.ids)
+
+    def matches(self, min_price, max_price, not_purchased, cities):
+        """
+        Positions of the tickets matching the Search Tickets filters
+        (same arguments as queries.build_ticket_search_query).
+
+        Tickets are kept sorted by price, so the price range is two binary searches and
+        the remaining filters only mask the tickets inside it.
+        """
+        start = int(np.searchsorted(self.prices, float(min_price), side='left')) if min_price else 0
+        end = int(np.searchsorted(self.prices, float(max_price), side='right')) if max_price else len(self.prices)
+        if start >= end:
+            return np.empty(0, dtype=np.int64)
+
+        mask = np.ones(end - start, dtype=bool)
+        if not_purchased:
+            mask &= self.purchased_by[start:end] == NOT_PURCHASED
+        if cities:
+            wanted = {_fold(city) for city in cities}
+            city_codes = [code for code, city in enumerate(self.cities) if _fold(city) in wanted]
+            selected_events = np.isin(self.event_cities, city_codes)
+            mask &= selected_events[self.event_codes[start:end]]
+        return np.flatnonzero(mask) + start
+
+    def rows(self, positions):
+        """
+        Turn positions from a mask into (id, event_name, purchased_by, price) rows.
+        """
+        event_names = self.event_names
+        return [(int(ticket_id), event_names[code], None if buyer == NOT_PURCHASED else int(buyer), float(price))
+                for ticket_id, code, buyer, price in zip(self.ids[positions], self.event_codes[positions],
+                                                         self.purchased_by[positions], self.prices[positions])]
+
+
+def _fold(value):
+    # Compare names like the default collation does
+    return value.rstrip().casefold()
+
+
+class _SnapshotBuilder:
+    """
+    Accumulates rows into growing column chunks, reusing the event and city codes of a base snapshot.
+    """
+
+    def __init__(self, base=None):
+        self.event_names = list(base.event_names) if base is not None else []
+        self.event_cities = list(base.event_cities) if base is not None else []
+        self.cities = list(base.cities) if base is not None else []
+        self._event_codes = {_fold(name): code for code, name in enumerate(self.event_names)}
+        self._city_codes = {_fold(city): code for code, city in enumerate(self.cities)}
+        self._chunks = []
+
+    def event_code(self, event_name, city=None):
+        key = _fold(event_name)
+        code = self._event_codes.get(key)
+        if code is None:
+            code = len(self.event_names)
+            self._event_codes[key] = code
+            self.event_names.append(event_name)
+            self.event_cities.append(-1)
+        if city is not None:
+            self.event_cities[code] = self.city_code(city)
+        return code
+
+    def city_code(self, city):
+        key = _fold(city)
+        code = self._city_codes.get(key)
+        if code is None:
+            code = len(self.cities)
+            self._city_codes[key] = code
+            self.cities.append(city)
+        return code
+
+    def add_rows(self, rows):
+        ids = np.empty(len(rows), dtype=np.int64)
+        event_codes = np.empty(len(rows), dtype=np.int32)
+        purchased_by = np.empty(len(rows), dtype=np.int64)
+        prices = np.empty(len(rows), dtype=np.float64)
+        for i, (ticket_id, event_name, buyer, price, city) in enumerate(rows):
+            ids[i] = ticket_id
+            event_codes[i] = self.event_code(event_name, city)
+            purchased_by[i] = NOT_PURCHASED if buyer is None else buyer
+            prices[i] = price
+        self._chunks.append((ids, event_codes, purchased_by, prices))
+
+    def add_columns(self, ids, event_codes, purchased_by, prices):
+        self._chunks.append((ids, event_codes, purchased_by, prices))
+
+    def build(self):
+        if self._chunks:
+            columns = [np.concatenate(parts) for parts in zip(*self._chunks)]
+            order = np.argsort(columns[3], kind='stable')  # by price, see TicketSnapshot.matches
+            columns = [column[order] for column in columns]
+        else:
+            columns = [np.empty(0, dtype=dtype) for dtype in (np.int64, np.int32, np.int64, np.float64)]
+        return TicketSnapshot(*columns, self.event_names, np.array(self.event_cities, dtype=np.int32), self.cities)
+
+
+class TicketIndex:
+    """
+    The current TicketSnapshot plus what has changed since it was built.
+
+    The app's ticket writes call mark_events_changed() after committing; refresh() then reloads
+    only those events' tickets. Anything that can move many events between cities (a venue
+    update, a bulk import) calls mark_all_changed() for a full rebuild, as does a snapshot older
+    than max_age, which is how writes from other clients are picked up.
+    """
+
+    def __init__(self, max_age=DEFAULT_MAX_AGE_SECONDS, batch_size=10000):
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.enabled = False
+        self._snapshot = None
+        self._built_at = 0.0
+        self._dirty_events = set()
+        self._dirty_all = True
+        self._lock = threading.Lock()          # guards the dirty state and the snapshot reference
+        self._refresh_lock = threading.Lock()  # one refresh at a time
+
+    @property
+    def ready(self):
+        return self.enabled and self._snapshot is not None
+
+    def mark_events_changed(self, *event_names):
+        with self._lock:
+            self._dirty_events.update(event_names)
+
+    def mark_all_changed(self):
+        with self._lock:
+            self._dirty_all = True
+
+    def _load(self, builder, query, values=()):
+        with QueryStream(query, values, self.batch_size) as stream:
+            for rows in stream.batches():
+                builder.add_rows(rows)
+
+    def refresh(self):
+        """
+        Bring the snapshot up to date: a full rebuild if needed, otherwise reload the changed events.
+        Runs on a worker thread.
+
+        Returns:
+            TicketSnapshot: The current snapshot.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                full = self._dirty_all or self._snapshot is None or time.monotonic() - self._built_at > self.max_age
+                dirty = set(self._dirty_events)
+                self._dirty_events.clear()
+                self._dirty_all = False
+                base = self._snapshot
+
+            try:
+                if full:
+                    started = time.monotonic()
+                    builder = _SnapshotBuilder()
+                    self._load(builder, index_tickets_query)
+                elif dirty:
+                    started = self._built_at
+                    builder = _SnapshotBuilder(base)
+                    codes = [builder.event_code(name) for name in dirty]
+                    for code in codes:
+                        builder.event_cities[code] = -1  # set again below if the event still exists
+
+                    keep = ~np.isin(base.event_codes, codes)
+                    builder.add_columns(base.ids[keep], base.event_codes[keep], base.purchased_by[keep], base.prices[keep])
+                    placeholders = ', '.join(['%s'] * len(dirty))
+                    self._load(builder, index_tickets_query + f" WHERE t.event_name IN ({placeholders})", list(dirty))
+                else:
+                    return base
+            except Exception:
+                # Try the same work again next time
+                with self._lock:
+                    self._dirty_events.update(dirty)
+                    self._dirty_all = self._dirty_all or full
+                raise
+
+            snapshot = builder.build()
+            with self._lock:
+                self._snapshot = snapshot
+                self._built_at = started
+            return snapshot
+
+    def search(self, min_price, max_price, not_purchased, cities):
+        """
+        Refresh if needed, then return the positions matching the filters and the snapshot they index.
+
+        Returns:
+            tuple: (TicketSnapshot, array of positions)
+        """
+        snapshot = self.refresh()
+        return snapshot, snapshot.matches(min_price, max_price, not_purchased, cities)
+
+    def search_batches(self, filters, batch_size):
+        """
+        Rows matching the Search Tickets filters, batch_size rows at a time (for streaming.stream_into_tree).
+
+        Args:
+            filters (tuple): (min_price, max_price, not_purchased, cities).
+            batch_size (int): Rows per batch.
+        """
+        snapshot, positions = self.search(*filters)
+        for start in range(0, len(positions), batch_size):
+            yield snapshot.rows(positions[start:start + batch_size])
+
+
+# Process-wide index used by the Search Tickets tab
+ticket_index = TicketIndex()
+
+
+def configure_ticket_index(enabled=False, max_age=DEFAULT_MAX_AGE_SECONDS):
+    """
+    Turn the index on or off. It stays off when NumPy is not installed.
+
+    Returns:
+        bool: Whether the index is enabled.
+    """
+    if enabled and not numpy_available():
+        print("Ticket index disabled: NumPy is not installed")
+    ticket_index.enabled = enabled and numpy_available()
+    ticket_index.max_age = max_age
+    return ticket_index.enabled
+
+
+def tickets_changed(*event_names):
+    """
+    Tell the index that tickets of these events were written (all events if none are given).
+    """
+    if event_names:
+        ticket_index.mark_events_changed(*event_names)
+    else:
+        ticket_index.mark_all_changed()
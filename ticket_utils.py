@@ -7,72 +7,196 @@
 # - Search functionality
 # - Result display in treeviews
 
-# Function to populate result tree
-def populate_result_tree(tree, query, columns):
-    
+import os
+import time
+from tkinter import filedialog
+
+from db_pool import get_connection
+from db_executor import run_in_background, show_background_error
+from pagination import KeysetPager, DEFAULT_PAGE_SIZE, TABLE_PRIMARY_KEYS
+from streaming import stream_into_tree, stop_stream
+from inventory import CapacityExceeded
+from query_cache import dashboard_cache, invalidate_dashboard, MISS, FRESH, STALE
+from bulk_tickets import parse_price_points, generate_tickets
+from bulk_import import import_files, TABLE_SPECS, IMPORT_ORDER
+from export import export_table, export_ticket_search
+from ticket_index import ticket_index, tickets_changed
+from validation import is_valid_date_format, keys_exist, first_known_problem
+from key_cache import reference_keys
+from autocomplete import KeyCombobox
+from profiler import profiler, profiled
+from deletes import (DeleteBlocked, DELETE_KEYS, load_delete_preview, delete_previewed, describe_dependents,
+                     parse_key_list, load_bulk_delete_impact, bulk_delete, rules_for)
+from queries import build_ticket_search_query, city_list_query, ticket_info_query
+from writes import (insert_lookups, update_lookups, insert_entry, insert_ticket_entry, load_entry, update_entry,
+                    update_ticket_entry)
+from dashboard import DASHBOARD_METRICS, DASHBOARD_TABLES, dashboard_query, split_dashboard_rows
+
+
+def fetch_query_results(query, values=()):
+    """
+    Run a read query on a pooled connection and return every row.
+    Safe to call from a background worker thread.
+
+    Args:
+        query (str): The SQL query to run.
+        values (tuple or list): Parameters for the query.
+
+    Returns:
+        list: The rows returned by the query.
+    """
+    conn = get_connection()
     try:
-        conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
         cursor = conn.cursor()
-
-        cursor.execute(query)
+        cursor.execute(query, values)
         results = cursor.fetchall()
+        cursor.close()
+        return results
+    finally:
+        conn.close()
 
-        # Clear existing data in the result tree
-        for item in tree.get_children():
-            tree.delete(item)
 
-        # Populate the result tree with the query results
-        for result in results:
-            tree.insert("", "end", values=result)
+# Function to populate result tree
+def populate_result_tree(tree, query, columns):
 
-    except mariadb.Error as e:
-        print(f"Error: {e}")
+    # Rows are streamed in batches on a worker thread; a newer request for the same tree supersedes this one
+    stream_into_tree(f"populate_result_tree:{tree}", tree, query, on_error=lambda e: print(f"Error: {e}"))
 
-    finally:
-        try:
-            # Close the connection and cursor in the 'finally' block
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
-        except Exception as close_error:
-            print(f"Error during closing: {close_error}")
-            
 
-# function to check date format to be used throughout
-def is_valid_date_format(date_str):
+# Function to fill every dashboard report from one query
+def populate_dashboard_trees(reports, metrics=DASHBOARD_METRICS, cache=dashboard_cache):
     """
-    Check if a given date string is in the format 'YYYY-MM-DD' and has valid components.
+    Fill the Admin Dashboard trees from a single query computing every report (see dashboard.py).
+
+    The combined rows go through the query cache: fresh results are shown without touching the
+    database, stale ones are shown and refreshed in the background, and misses are fetched in the
+    background. A fresh dashboard costs no round trip and a stale or missing one costs exactly one.
 
     Args:
-        date_str (str): The date string to be validated.
+        reports (list): (tree, metric name, timing label or None) for every report shown.
+        metrics (list): The DashboardMetric entries the query computes.
+        cache (QueryCache): The cache to read from.
 
     Returns:
-        bool: True if the date string is in the correct format and has valid components,
-              False otherwise.
-    """ 
-    
-    try:
-        # Check if the date string has the format YYYY-MM-DD
-        year, month, day = map(int, date_str.split('-'))
+        None
+    """
+    query = dashboard_query(metrics)
+    key = cache.make_key(query)
+    state, rows = cache.lookup(key)
+    generation = cache.generation()
+
+    def set_timing(text):
+        for _, _, timing_label in reports:
+            if timing_label is not None:
+                timing_label.config(text=text)
+
+    def show_results(results):
+        split = split_dashboard_rows(results, metrics)
+        for tree, name, _ in reports:
+            for item in tree.get_children():
+                tree.delete(item)
+            for result in split[name]:
+                tree.insert("", "end", values=result)
+
+    def store_and_show(outcome):
+        results, elapsed = outcome
+        cache.store(key, results, DASHBOARD_TABLES, generation)
+        show_results(results)
+        set_timing(f"Dashboard query took {elapsed * 1000:.0f} ms ({len(results)} rows, all reports)")
+
+    def timed_fetch(task):
+        started = time.perf_counter()
+        results = fetch_query_results(query)
+        return results, time.perf_counter() - started
+
+    def refresh_failed(e):
+        print(f"Error: {e}")
+        cache.abandon_refresh(key)
 
-        # Check if the year is prior to 2023
-        if year >= 2023 or year <= 1800:
-            return False
+    if state != MISS:
+        show_results(rows)
+    if state == FRESH:
+        set_timing("From cache")
+        return
+    if state == STALE and not cache.begin_refresh(key):
+        return
 
-        # Check if the month is between 1 and 12
-        if not 1 <= month <= 12:
-            return False
+    if state == MISS:
+        set_timing("Loading...")
+    run_in_background("populate_dashboard", timed_fetch, on_success=store_and_show, on_error=refresh_failed)
 
-        # Check if the day is between 1 and 31
-        if not 1 <= day <= 31:
-            return False
 
-        return True
-    except ValueError:
-        return False
+def show_hot_paths(limit=25):
+    """
+    Open a window with the profiled actions (where their time went: database, Tk or Python)
+    and the top functions by cumulative time across all of them.
+
+    Args:
+        limit (int): Number of functions to list.
+
+    Returns:
+        None
+    """
+    actions = profiler.actions()
+    if not actions:
+        MessageBox.showinfo("Hot Paths", "Nothing has been profiled yet. Turn on profiling, use the app, then look again.")
+        return
+
+    window = tk.Toplevel()
+    window.title("Hot Paths")
+    window.geometry('1000x600')
+
+    action_tree = ttk.Treeview(window, columns=("Action", "Runs", "Wall ms", "Database ms", "Tk ms", "Python ms"),
+                               show="headings", height=8)
+    for column in ("Action", "Runs", "Wall ms", "Database ms", "Tk ms", "Python ms"):
+        action_tree.heading(column, text=column)
+    action_tree.column("Action", width=300)
+    for action in actions:
+        action_tree.insert("", "end", values=(action['action'], action['runs'], f"{action['wall_ms']:.1f}",
+                                              f"{action['database_ms']:.1f}", f"{action['tk_ms']:.1f}",
+                                              f"{action['python_ms']:.1f}"))
+    action_tree.pack(fill='x', padx=10, pady=10)
+
+    function_tree = ttk.Treeview(window, columns=("Function", "Kind", "Calls", "Own ms", "Cumulative ms"),
+                                 show="headings", height=16)
+    for column in ("Function", "Kind", "Calls", "Own ms", "Cumulative ms"):
+        function_tree.heading(column, text=column)
+    function_tree.column("Function", width=500)
+
+    def show_functions(action=None):
+        for item in function_tree.get_children():
+            function_tree.delete(item)
+        for function in profiler.top_functions(action, limit):
+            function_tree.insert("", "end", values=(function['function'], function['category'], function['calls'],
+                                                    f"{function['tottime_ms']:.1f}", f"{function['cumtime_ms']:.1f}"))
+
+    # Selecting an action narrows the function list to it
+    action_tree.bind("<<TreeviewSelect>>",
+                     lambda event: show_functions(action_tree.item(action_tree.selection()[0])['values'][0])
+                     if action_tree.selection() else show_functions())
+    show_functions()
+    function_tree.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+
+
+def dump_profiles():
+    """
+    Ask for a directory and write one .pstats file per profiled action into it.
+
+    Returns:
+        None
+    """
+    directory = filedialog.askdirectory(title="Save pstats files to")
+    if not directory:
+        return
+    try:
+        paths = profiler.dump(directory)
+        MessageBox.showinfo("Profiler", f"Wrote {len(paths)} pstats files to {directory}")
+    except OSError as e:
+        print(f"Error: {e}")
+        MessageBox.showerror("Error", f"Error: {e}")
 
 
+@profiled
 def insert_pick_table(event):
     
     # function definitions to only be used within the insert pick table function
@@ -101,15 +225,19 @@ def insert_pick_table(event):
         phone = phone_entry.get()
         dob = dob_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([('Users', id, False, f"ID {id} already exists. Please select a new ID.")])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         # Database connection and validation
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
             
             # Check if ID already exists to prevent duplicates
-            check_query = "SELECT id FROM Users WHERE id = %s"
-            cursor.execute(check_query, (id,))
-            existing_id = cursor.fetchone()
+            existing_id, = keys_exist(cursor, insert_lookups('Users', {'id': id}))
 
             # Validation checks for form inputs
             if existing_id:
@@ -122,9 +250,9 @@ def insert_pick_table(event):
             
             else:                                                              
                 # Insert the new user if all validations pass
-                insert_query = "INSERT INTO Users (id, user_name, phone_number, date_of_birth) VALUES (%s, %s, %s, %s)"
-                cursor.execute(insert_query, (id, name, phone, dob))
+                insert_entry(cursor, 'Users', (id, name, phone, dob))
                 conn.commit()  # need to commit for insert delete etc. 
+                reference_keys.added('Users', id)
                 
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
                 
@@ -146,6 +274,7 @@ def insert_pick_table(event):
             conn.close()
             return False
 
+    @profiled
     def insert_user_and_destroy(id_entry, name_entry, phone_entry, dob_entry, labels, insert_button):
         """
         Insert a new user into the 'Users' table and destroy specified widgets upon success.
@@ -191,13 +320,17 @@ def insert_pick_table(event):
         city = city_entry.get()
         capacity = capacity_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([('Venue', venue_name, False, f"Venue name {venue_name} already exists. Please select a new name.")])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            check_query = "SELECT venue_name FROM Venue WHERE venue_name = %s"
-            cursor.execute(check_query, (venue_name,))
-            existing_venue_name = cursor.fetchone()
+            existing_venue_name, = keys_exist(cursor, insert_lookups('Venue', {'venue_name': venue_name}))
 
             if existing_venue_name:
                 MessageBox.showinfo("Insert Status:", f"Venue name {venue_name} already exists. Please select a new name.")
@@ -205,9 +338,9 @@ def insert_pick_table(event):
                 MessageBox.showinfo("Insert Status:", "All Fields are required")
             else:
                 # Execute the insert query
-                insert_query = "INSERT INTO Venue (venue_name, city, capacity) VALUES (%s, %s, %s)"
-                cursor.execute(insert_query, (venue_name, city, capacity))
+                insert_entry(cursor, 'Venue', (venue_name, city, capacity))
                 conn.commit()
+                reference_keys.added('Venue', venue_name)
 
                 # Show success message
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
@@ -227,6 +360,7 @@ def insert_pick_table(event):
             conn.close()
             return False
 
+    @profiled
     def insert_venue_and_destroy(venue_name_entry, city_entry, capacity_entry, labels, insert_button):
         """
         Wrapper function for insert_venue, destroying the insert button afterward.
@@ -274,22 +408,27 @@ def insert_pick_table(event):
         event_date = event_date_entry.get()
         start_time = start_time_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([('Venue', venue_name, True, f"Venue name {venue_name} does not exist. Please select a valid venue. You may have to create a venue first in 'Venue'")])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            check_venue_query = "SELECT venue_name FROM Venue WHERE venue_name = %s"
-            cursor.execute(check_venue_query, (venue_name,))
-            existing_venue_name = cursor.fetchone()
+            existing_venue_name, = keys_exist(cursor, insert_lookups('Events', {'venue_name': venue_name}))
 
             if not existing_venue_name:
                 MessageBox.showinfo("Insert Status:", f"Venue name {venue_name} does not exist. Please select a valid venue. You may have to create a venue first in 'Venue'")
             elif event_name == '' or venue_name == '' or event_date == '' or start_time == '':
                 MessageBox.showinfo("Insert Status:", "All Fields are required")
             else:
-                insert_query = "INSERT INTO Events (event_name, venue_name, event_date, start_time) VALUES (%s, %s, %s, %s)"
-                cursor.execute(insert_query, (event_name, venue_name, event_date, start_time))
+                # The event starts with no tickets issued against its venue's capacity
+                insert_entry(cursor, 'Events', (event_name, venue_name, event_date, start_time))
                 conn.commit()
+                reference_keys.added('Events', event_name)
 
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
 
@@ -310,6 +449,7 @@ def insert_pick_table(event):
             conn.close()
             return False
 
+    @profiled
     def insert_event_and_destroy(event_name_entry, venue_name_entry, event_date_entry, start_time_entry, labels, insert_button):
         """
         Wrapper function for insert_event, destroying the insert button afterward.
@@ -355,13 +495,17 @@ def insert_pick_table(event):
         individual_name = individual_name_entry.get()
         age = age_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([('IndividualPerformers', stage_name, False, f"Stage name {stage_name} already exists. Please select a new name.")])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            check_stage_query = "SELECT stage_name FROM IndividualPerformers WHERE stage_name = %s"
-            cursor.execute(check_stage_query, (stage_name,))
-            existing_stage_name = cursor.fetchone()
+            existing_stage_name, = keys_exist(cursor, insert_lookups('IndividualPerformers', {'stage_name': stage_name}))
 
             # Validate age as an integer between 0 and 120
             try:
@@ -377,9 +521,9 @@ def insert_pick_table(event):
             elif stage_name == '' or individual_name == '' or age == '':
                 MessageBox.showinfo("Insert Status:", "All Fields are required")
             else:
-                insert_query = "INSERT INTO IndividualPerformers (stage_name, individual_name, age) VALUES (%s, %s, %s)"
-                cursor.execute(insert_query, (stage_name, individual_name, age))
+                insert_entry(cursor, 'IndividualPerformers', (stage_name, individual_name, age))
                 conn.commit()
+                reference_keys.added('IndividualPerformers', stage_name)
 
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
 
@@ -402,6 +546,7 @@ def insert_pick_table(event):
 
         return False
 
+    @profiled
     def insert_individual_performer_and_destroy(stage_name_entry, individual_name_entry, age_entry, labels, insert_button):
         """
         Wrapper function for insert_individual_performer, destroying the insert button afterward.
@@ -442,13 +587,17 @@ def insert_pick_table(event):
         group_name = group_name_entry.get()
         founded = founded_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([('Groups', group_name, False, f"Group name {group_name} already exists. Please select a new name.")])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            check_group_query = "SELECT group_name FROM Groups WHERE group_name = %s"
-            cursor.execute(check_group_query, (group_name,))
-            existing_group_name = cursor.fetchone()
+            existing_group_name, = keys_exist(cursor, insert_lookups('Groups', {'group_name': group_name}))
 
             # Validate founded as a valid date format
             if not is_valid_date_format(founded):
@@ -460,9 +609,9 @@ def insert_pick_table(event):
             elif group_name == '' or founded == '':
                 MessageBox.showinfo("Insert Status:", "All Fields are required")
             else:
-                insert_query = "INSERT INTO Groups (group_name, founded) VALUES (%s, %s)"
-                cursor.execute(insert_query, (group_name, founded))
+                insert_entry(cursor, 'Groups', (group_name, founded))
                 conn.commit()
+                reference_keys.added('Groups', group_name)
 
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
 
@@ -484,6 +633,7 @@ def insert_pick_table(event):
 
         return False
 
+    @profiled
     def insert_group_and_destroy(group_name_entry, founded_entry, labels, insert_button):
         """
         Wrapper function for insert_group, destroying the insert button afterward.
@@ -524,22 +674,22 @@ def insert_pick_table(event):
         stage_name = stage_name_entry.get()
         group_name = group_name_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([
+            ('IndividualPerformers', stage_name, True, f"Stage name {stage_name} does not exist. Please select a valid stage name. You may have to create a performer in 'IndividualPerformers'"),
+            ('Groups', group_name, True, f"Group name {group_name} does not exist. Please select a valid group name. You may have to create a group in 'Groups'"),
+        ])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            check_stage_query = "SELECT stage_name FROM IndividualPerformers WHERE stage_name = %s"
-            cursor.execute(check_stage_query, (stage_name,))
-            existing_stage_name = cursor.fetchone()
-
-            check_group_query = "SELECT group_name FROM Groups WHERE group_name = %s"
-            cursor.execute(check_group_query, (group_name,))
-            existing_group_name = cursor.fetchone()
-            
-            check_membership_query = "SELECT * FROM Memberships WHERE stage_name = %s AND group_name = %s"
-            cursor.execute(check_membership_query, (stage_name, group_name))
-            existing_membership = cursor.fetchone()
-
+            # Both references and the duplicate check in one query
+            existing_stage_name, existing_group_name, existing_membership = keys_exist(
+                cursor, insert_lookups('Memberships', {'stage_name': stage_name, 'group_name': group_name}))
 
             if existing_membership:
                 MessageBox.showinfo("Insert Status:", f"Membership for {stage_name} and {group_name} already exists.")
@@ -548,8 +698,7 @@ def insert_pick_table(event):
             elif not existing_group_name:
                 MessageBox.showinfo("Insert Status:", f"Group name {group_name} does not exist. Please select a valid group name. You may have to create a group in 'Groups'")
             else:
-                insert_query = "INSERT INTO Memberships (stage_name, group_name) VALUES (%s, %s)"
-                cursor.execute(insert_query, (stage_name, group_name))
+                insert_entry(cursor, 'Memberships', (stage_name, group_name))
                 conn.commit()
 
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
@@ -572,6 +721,7 @@ def insert_pick_table(event):
 
         return False
 
+    @profiled
     def insert_membership_and_destroy(stage_name_entry, group_name_entry, labels, insert_button):
         """
         Wrapper function for insert_membership, destroying the insert button afterward.
@@ -611,35 +761,33 @@ def insert_pick_table(event):
         event_name = event_name_entry.get()
         group_name = group_name_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        problem = first_known_problem([
+            ('Events', event_name, True, f"Event name {event_name} does not exist. Please select a valid event. You may have to create an Event first in 'Events'"),
+            ('Groups', group_name, True, f"Group name {group_name} does not exist. Please select a valid group. You may have to create a Group first in 'Groups'"),
+        ])
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
-            
-            
-            check_entry_query = "SELECT * FROM PerformanceList WHERE event_name = %s AND group_name = %s"
-            cursor.execute(check_entry_query, (event_name, group_name))
-            existing_entry = cursor.fetchone()
+
+            # The duplicate check and both references in one query
+            existing_entry, existing_event_name, existing_group_name = keys_exist(
+                cursor, insert_lookups('PerformanceList', {'event_name': event_name, 'group_name': group_name}))
 
             if existing_entry:
                 MessageBox.showinfo("Insert Status:", "Entry already exists. Please provide unique Event and Group names.")
                 return False
 
-            
-            check_event_query = "SELECT event_name FROM Events WHERE event_name = %s"
-            cursor.execute(check_event_query, (event_name,))
-            existing_event_name = cursor.fetchone()
-
-            check_group_query = "SELECT group_name FROM Groups WHERE group_name = %s"
-            cursor.execute(check_group_query, (group_name,))
-            existing_group_name = cursor.fetchone()
-
             if not existing_event_name:
                 MessageBox.showinfo("Insert Status:", f"Event name {event_name} does not exist. Please select a valid event. You may have to create an Event first in 'Events'")
             elif not existing_group_name:
                 MessageBox.showinfo("Insert Status:", f"Group name {group_name} does not exist. Please select a valid group. You may have to create a Group first in 'Groups'")
             else:
-                insert_query = "INSERT INTO PerformanceList (event_name, group_name) VALUES (%s, %s)"
-                cursor.execute(insert_query, (event_name, group_name))
+                insert_entry(cursor, 'PerformanceList', (event_name, group_name))
                 conn.commit()
 
                 MessageBox.showinfo("Insert Status", "Inserted Successfully")
@@ -662,6 +810,7 @@ def insert_pick_table(event):
 
         return False
 
+    @profiled
     def insert_performance_and_destroy(event_name_entry, group_name_entry, labels, insert_button):
         """
         Wrapper function for insert_performance_list, destroying the insert button afterward.
@@ -704,22 +853,27 @@ def insert_pick_table(event):
         purchased_by = purchased_by_entry.get()
         price = price_entry.get()
 
+        # Input the reference key cache already knows is wrong is rejected without a round trip
+        checks = [('Events', event_name, True, f"Event name {event_name} does not exist. Please select a valid event.")]
+        if purchased_by.upper() != 'N/A':
+            checks.insert(0, ('Users', purchased_by, True, f"User with ID {purchased_by} does not exist. Please select a valid user."))
+        problem = first_known_problem(checks)
+        if problem:
+            MessageBox.showinfo("Insert Status:", problem)
+            return False
+
         try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            check_event_query = "SELECT event_name FROM Events WHERE event_name = %s"
-            cursor.execute(check_event_query, (event_name,))
-            existing_event_name = cursor.fetchone()
-
-            if purchased_by.upper() != 'N/A':
-                check_user_query = "SELECT id FROM Users WHERE id = %s"
-                cursor.execute(check_user_query, (purchased_by,))
-                existing_user_id = cursor.fetchone()
+            # The event and the buyer in one query (or none, when the reference key cache knows both)
+            buyer = purchased_by if purchased_by.upper() != 'N/A' else None
+            found = keys_exist(cursor, insert_lookups('Tickets', {'event_name': event_name, 'purchased_by': buyer}))
+            existing_event_name = found[0]
 
-                if not existing_user_id:
-                    MessageBox.showinfo("Insert Status:", f"User with ID {purchased_by} does not exist. Please select a valid user.")
-                    return False
+            if purchased_by.upper() != 'N/A' and not found[1]:
+                MessageBox.showinfo("Insert Status:", f"User with ID {purchased_by} does not exist. Please select a valid user.")
+                return False
 
             # Validate price as a positive float
             try:
@@ -735,18 +889,11 @@ def insert_pick_table(event):
             elif event_name == '' or price == '':
                 MessageBox.showinfo("Insert Status:", "All Fields are required")
             else:
-                # Get the maximum ID for the specified event
-                max_id_query = "SELECT MAX(id) FROM Tickets WHERE event_name = %s"
-                cursor.execute(max_id_query, (event_name,))
-                max_id_result = cursor.fetchone()
-                max_id = max_id_result[0] if max_id_result[0] is not None else 0
-
-                # Generate a new ID
-                new_id = max_id + 1
-
-                insert_query = "INSERT INTO Tickets (id, event_name, purchased_by, price) VALUES (%s, %s, %s, %s)"
-                cursor.execute(insert_query, (new_id, event_name, purchased_by if purchased_by.upper() != 'N/A' else None, price))
+                # A seat, the next ID of the event and the dashboard summary tables, in one transaction
+                new_id = insert_ticket_entry(cursor, event_name, buyer, price)
                 conn.commit()
+                invalidate_dashboard('Tickets')
+                tickets_changed(event_name)
 
                 MessageBox.showinfo("Insert Status", f"Inserted Successfully. Generated Ticket ID: {new_id}")
 
@@ -759,6 +906,10 @@ def insert_pick_table(event):
 
                 return True
 
+        except CapacityExceeded as e:
+            MessageBox.showinfo("Insert Status:", f"{e}.")
+            return False
+
         except Exception as e:
             print(f"Error: {e}")
             MessageBox.showerror("Error", f"Error: {e}")
@@ -767,6 +918,7 @@ def insert_pick_table(event):
             cursor.close()
             conn.close()
 
+    @profiled
     def insert_ticket_and_destroy(event_name_entry, purchased_by_entry, price_entry, labels, insert_button):
         """
         Wrapper function for insert_ticket, destroying the insert button afterward.
@@ -869,7 +1021,7 @@ def insert_pick_table(event):
                 event_name_entry = Entry(tab2)
                 event_name_entry.place(x=250, y=60)
 
-                venue_name_entry = Entry(tab2)
+                venue_name_entry = KeyCombobox(tab2, 'Venue')
                 venue_name_entry.place(x=250, y=90)
 
 
@@ -938,10 +1090,10 @@ def insert_pick_table(event):
                 group_name_label = Label(tab2, text='Enter Group Name (str)', font=('bold', 10))
                 group_name_label.place(x=20, y=90)
 
-                stage_name_entry = Entry(tab2)
+                stage_name_entry = KeyCombobox(tab2, 'IndividualPerformers')
                 stage_name_entry.place(x=250, y=60)
 
-                group_name_entry = Entry(tab2)
+                group_name_entry = KeyCombobox(tab2, 'Groups')
                 group_name_entry.place(x=250, y=90)
 
                 label_list = [top_label, stage_name_label, group_name_label]
@@ -958,10 +1110,10 @@ def insert_pick_table(event):
                 group_name_label = Label(tab2, text='Enter Group Name (str)', font=('bold', 10))
                 group_name_label.place(x=20, y=90)
 
-                event_name_entry = Entry(tab2)
+                event_name_entry = KeyCombobox(tab2, 'Events')
                 event_name_entry.place(x=250, y=60)
 
-                group_name_entry = Entry(tab2)
+                group_name_entry = KeyCombobox(tab2, 'Groups')
                 group_name_entry.place(x=250, y=90)
 
                 label_list = [top_label, event_name_label, group_name_label]
@@ -980,10 +1132,10 @@ def insert_pick_table(event):
                 price_label = Label(tab2, text='Enter Ticket Price', font=('bold', 10))
                 price_label.place(x=20, y=120)
 
-                event_name_entry = Entry(tab2)
+                event_name_entry = KeyCombobox(tab2, 'Events')
                 event_name_entry.place(x=250, y=60)
 
-                purchased_by_entry = Entry(tab2)
+                purchased_by_entry = KeyCombobox(tab2, 'Users')
                 purchased_by_entry.place(x=250, y=90)
 
                 price_entry = Entry(tab2)
@@ -999,503 +1151,486 @@ def insert_pick_table(event):
                                        command=lambda: insert_ticket_and_destroy(event_name_entry, purchased_by_entry,
                                                                                 price_entry, label_list, insert_button))
                 insert_button.place(x=20, y=250)
+
+                # Bulk inventory for one event, see bulk_tickets.py
+                bulk_label = Label(tab2, text='Or Generate Unsold Tickets in Bulk', font=('bold', 15))
+                bulk_label.place(x=80, y=300)
+                bulk_event_label = Label(tab2, text='Enter Event Name', font=('bold', 10))
+                bulk_event_label.place(x=20, y=330)
+                bulk_count_label = Label(tab2, text='Number of Tickets (blank fills the venue)', font=('bold', 10))
+                bulk_count_label.place(x=20, y=360)
+                bulk_prices_label = Label(tab2, text='Price Points (ex. 250:1000, 120:5000, 60)', font=('bold', 10))
+                bulk_prices_label.place(x=20, y=390)
+
+                bulk_event_entry = KeyCombobox(tab2, 'Events')
+                bulk_event_entry.place(x=250, y=330)
+
+                bulk_count_entry = Entry(tab2)
+                bulk_count_entry.place(x=250, y=360)
+
+                bulk_prices_entry = Entry(tab2)
+                bulk_prices_entry.place(x=250, y=390)
+
+                bulk_status_label = Label(tab2, text='', font=('italic', 10), fg='gray')
+                bulk_status_label.place(x=100, y=430)
+
+                bulk_button = Button(tab2, text="generate", font=("italic", 10), bg="white",
+                                     command=lambda: bulk_generate_tickets(bulk_event_entry.get(), bulk_count_entry.get(),
+                                                                           bulk_prices_entry.get(), bulk_status_label))
+                bulk_button.place(x=20, y=430)
                 
     return
 
 
-def delete_pick_table(event):
-      
-    def delete_user_and_destroy(user_id, labels, delete_button):
-        """
-        Wrapper function for delete_user_by_id, destroying the delete button afterward.
+@profiled
+def bulk_generate_tickets(event_name, count, prices, status_label=None):
+    """
+    Create unsold tickets for an event in the background and report the result.
 
-        Args:
-            user_id (int): The user ID for the user to be deleted.
-            labels (list): List of labels to be destroyed at the end of the function.
-            delete_button (Button): The delete button widget to be destroyed.
+    Args:
+        event_name (str): The event to create tickets for.
+        count (str): Number of tickets, blank to fill the venue to capacity.
+        prices (str): Price points as "price[:quantity], ...".
+        status_label (Label): Optional label showing the progress.
 
-        Returns:
-            True or False (depending on whether deletion was successful)
-        """
-        # Inner function for handling the actual deletion
-        def delete_user(user_id, labels, delete_button):
-            """
-            Delete a user from the 'Users' table based on the user ID.
+    Returns:
+        None
+    """
+    try:
+        price_points = parse_price_points(prices)
+        count = int(count) if count.strip() else None
+        if count is not None and count <= 0:
+            raise ValueError("Number of tickets must be a positive whole number")
+    except ValueError as e:
+        MessageBox.showinfo("Insert Status:", str(e))
+        return
 
-            Args:
-                user_id (int): The user ID for the user to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
+    def show_progress(created, total):
+        if status_label is not None:
+            status_label.config(text=f"{created} of {total} tickets inserted")
 
-            Returns:
-                None
-            """
-            # Extract the user ID from the entry widget
-            id = user_id.get()
+    def generate(task):
+        conn = get_connection()
+        try:
+            return generate_tickets(conn, event_name, price_points, count,
+                                    progress=lambda created, total: task.post(show_progress, created, total))
+        finally:
+            conn.close()
 
-            try:
-                # Establish database connection
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
+    def done(created):
+        invalidate_dashboard('Tickets')
+        tickets_changed(event_name)
+        if status_label is not None:
+            status_label.config(text='')
+        MessageBox.showinfo("Insert Status", f"Inserted Successfully. Generated {created} tickets for {event_name}")
+
+    def failed(error):
+        if status_label is not None:
+            status_label.config(text='')
+        if isinstance(error, ValueError):
+            MessageBox.showinfo("Insert Status:", str(error))
+        else:
+            show_background_error(error)
 
-                # Check if the user exists before attempting deletion
-                check_query = "SELECT id FROM Users WHERE id = %s"
-                cursor.execute(check_query, (id,))
-                existing_id = cursor.fetchone()
+    if status_label is not None:
+        status_label.config(text='Generating tickets...')
+    run_in_background("bulk_generate_tickets", generate, on_success=done, on_error=failed)
 
-                if user_info:
-                    check_tickets_query = "SELECT * FROM Tickets WHERE purchased_by = %s"
-                    cursor.execute(check_tickets_query, (user_id,))
-                    tickets_info = cursor.fetchone()
-                    
-                    if tickets_info:
-                        MessageBox.showinfo("Delete Status", f"Cannot delete user with ID {user_id} because they have entries in the 'Tickets' table.\nYou must delete all tickets associated with the user prior to deletion")
-                        cursor.close()
-                        conn.close()
-                        return False
-                    
-                    # Display user information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                    f"Do you want to delete the following user?\n{user_info}")
 
-                    if confirmation:
-                        # Execute the delete query
-                        delete_query = "DELETE FROM Users WHERE id = %s"
-                        cursor.execute(delete_query, (user_id, ))
-                        conn.commit()
+@profiled
+def import_csv_files(paths, status_label=None):
+    """
+    Bulk import CSV files in the background, one file per table named after it (ex. Venue.csv).
+    Rejected rows are written to rejected_rows.csv next to the first file.
 
-                        MessageBox.showinfo("Delete Status", "User deleted successfully.")
+    Args:
+        paths (tuple): Paths chosen in the file dialog.
+        status_label (Label): Optional label showing the progress.
 
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"User with ID {user_id} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        success = delete_user(user_id, labels, delete_button)
-        if success:
-            delete_button.destroy()
-            return
-        else:
+    Returns:
+        None
+    """
+    if not paths:
+        return
+
+    files = {}
+    for path in paths:
+        table = os.path.splitext(os.path.basename(path))[0]
+        if table not in TABLE_SPECS:
+            MessageBox.showinfo("Insert Status:", f"{os.path.basename(path)} does not match a table name. Expected one of {', '.join(IMPORT_ORDER)}")
             return
+        files[table] = path
+    report_path = os.path.join(os.path.dirname(paths[0]), "rejected_rows.csv")
 
-    def delete_event_and_destroy(event_name, labels, delete_button):
-        """
-        Wrapper function for delete_event, destroying the delete button afterward.
+    def show_progress(table, read, inserted, rejected):
+        if status_label is not None:
+            status_label.config(text=f"{table}: {read} read, {inserted} inserted, {rejected} rejected")
 
-        Args:
-            event_name (str): The event name for the event to be deleted.
-            labels (list): List of labels to be destroyed at the end of the function.
-            delete_button (Button): The delete button widget to be destroyed.
+    def run_import(task):
+        conn = get_connection()
+        try:
+            results, report = import_files(conn, files,
+                                           progress=lambda *counts: task.post(show_progress, *counts))
+        finally:
+            conn.close()
+        if len(report):
+            report.write(report_path)
+        return results, len(report)
+
+    def done(outcome):
+        results, rejected = outcome
+        invalidate_dashboard(*files)
+        reference_keys.invalidate(*files)
+        if 'Tickets' in files:
+            tickets_changed()
+        if status_label is not None:
+            status_label.config(text='')
+        summary = "\n".join(f"{r.table}: {r.inserted} of {r.read} rows inserted" for r in results)
+        if rejected:
+            summary += f"\n\n{rejected} rows rejected, see {report_path}"
+        MessageBox.showinfo("Insert Status", summary)
+
+    def failed(error):
+        if status_label is not None:
+            status_label.config(text='')
+        show_background_error(error)
+
+    if status_label is not None:
+        status_label.config(text='Importing...')
+    run_in_background("import_csv_files", run_import, on_success=done, on_error=failed)
+
+
+def bulk_delete_entries(table_name, keys, status_label=None, on_deleted=None):
+    """
+    Delete many entries of one table: the impact is computed in the background with one grouped
+    query per chunk of keys, confirmed once, then deleted with chunked DELETE ... IN statements
+    in a single transaction.
 
-        Returns:
-            None
-        """
-        
-        def delete_event(event_name, labels, delete_button):
-            """
-            Delete an event from the 'Events' table based on the event name.
+    Args:
+        table_name (str): The table to delete from.
+        keys (list): Key tuples (see deletes.parse_key_list).
+        status_label (Label): Optional label showing the progress.
+        on_deleted (function): Called on the main thread with the keys that were deleted.
 
-            Args:
-                event_name (str): The event name for the event to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
+    Returns:
+        None
+    """
+    if not keys:
+        MessageBox.showinfo("Delete Status", "No entries selected.")
+        return
 
-            Returns:
-                True or False (depending on whether deletion was successful)
-            """
-            
+    def set_status(text):
+        if status_label is not None:
+            status_label.config(text=text)
+
+    def load_impact(task):
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            impact = load_bulk_delete_impact(cursor, table_name, keys)
+            cursor.close()
+            return impact
+        finally:
+            conn.close()
+
+    def confirm(impact):
+        set_status('')
+        deletable = impact.deletable
+        if not impact.found or not deletable:
+            MessageBox.showinfo("Delete Status", impact.describe())
+            return
+        if not MessageBox.askyesno("Delete Confirmation", f"{impact.describe()}\n\nDelete {len(deletable)} {table_name} entries?"):
+            return
+
+        def delete_all(task):
+            conn = get_connection()
             try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
                 cursor = conn.cursor()
+                deleted = bulk_delete(cursor, table_name, deletable,
+                                      progress=lambda done: task.post(set_status, f"Deleted {done} of {len(deletable)}..."))
+                conn.commit()
+                cursor.close()
+                return deleted
+            finally:
+                # An unfinished transaction is rolled back when the connection goes back to the pool
+                conn.close()
 
-                check_event_query = "SELECT * FROM Events WHERE event_name = %s"
-                cursor.execute(check_event_query, (event_name,))
-                event_info = cursor.fetchone()
+        def done(deleted):
+            set_status('')
+            reference_keys.removed(table_name, *(key[0] for key in deletable))
+            invalidate_dashboard(table_name, *(rule.table for rule in rules_for(table_name) if rule.action == 'CASCADE'))
+            if table_name == 'Tickets':
+                tickets_changed(*{key[1] for key in deletable})
+            elif table_name == 'Events':
+                tickets_changed(*(key[0] for key in deletable))
+            MessageBox.showinfo("Delete Status", f"{deleted} {table_name} entries deleted successfully.")
+            if on_deleted is not None:
+                on_deleted(deletable)
+
+        run_in_background("bulk_delete_entries", delete_all, on_success=done, on_error=failed)
+
+    def failed(error):
+        set_status('')
+        if isinstance(error, DeleteBlocked):
+            MessageBox.showinfo("Delete Status", str(error))
+        else:
+            show_background_error(error)
 
-                if event_info:
-                    # Display event information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                    f"Do you want to delete the following event?\n\n{event_info}\n\nWILL DELETE ALL ASSOCIATED PerformanceList AND Tickets ENTRIES")
+    set_status(f"Checking {len(keys)} entries...")
+    run_in_background("bulk_delete_entries", load_impact, on_success=confirm, on_error=failed)
 
-                    if confirmation:
-                        # Execute the delete query
-                        # Before deleting, also delete related entries in PerformanceList and Tickets
-                        delete_performance_query = "DELETE FROM PerformanceList WHERE event_name = %s"
-                        cursor.execute(delete_performance_query, (event_name,))
-                        
-                        delete_tickets_query = "DELETE FROM Tickets WHERE event_name = %s"
-                        cursor.execute(delete_tickets_query, (event_name,))
-                        
-                        delete_query = "DELETE FROM Events WHERE event_name = %s"
-                        cursor.execute(delete_query, (event_name,))
-                        conn.commit()
 
-                        MessageBox.showinfo("Delete Status", "Event deleted successfully.")
+def show_bulk_delete_dialog(table_name):
+    """
+    Open a window to paste the keys of many entries to delete, one per line.
 
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Event with name {event_name} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        success = delete_event(event_name, labels, delete_button)
-        if success:
-            delete_button.destroy()
-            return
-        else:
-            return
+    Args:
+        table_name (str): The table to delete from.
 
-    def delete_group_and_destroy(group_name, labels, delete_button):
-        """
-        Wrapper function for delete_group, destroying the delete button afterward.
+    Returns:
+        None
+    """
+    columns = DELETE_KEYS[table_name]
+    window = tk.Toplevel()
+    window.title(f"Bulk Delete: {table_name}")
+    window.geometry('500x450')
 
-        Args:
-            group_name (str): The group name for the group to be deleted.
-            labels (list): List of labels to be destroyed at the end of the function.
-            delete_button (Button): The delete button widget to be destroyed.
+    Label(window, text=f"One entry per line: {', '.join(columns)}", font=('bold', 10)).pack(pady=10)
+    keys_text = tk.Text(window, height=18, width=55)
+    keys_text.pack(padx=10)
+    status_label = Label(window, text="")
 
-        Returns:
-            None
-        """
-        
-        def delete_group(group_name, labels, delete_button):
-            """
-            Delete a group from the 'Groups' table based on the group name.
+    def delete_pasted():
+        try:
+            keys = parse_key_list(table_name, keys_text.get("1.0", "end"))
+        except ValueError as e:
+            MessageBox.showerror("Error", f"Error: {e}")
+            return
+        bulk_delete_entries(table_name, keys, status_label, on_deleted=lambda deleted: window.destroy())
 
-            Args:
-                group_name (str): The group name for the group to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
+    Button(window, text="Delete", font=("italic", 10), bg="white", command=delete_pasted).pack(pady=10)
+    status_label.pack()
 
-            Returns:
-                True or False (depending on whether deletion was successful)
-            """
-            
-            try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
 
-                check_group_query = "SELECT * FROM Groups WHERE group_name = %s"
-                cursor.execute(check_group_query, (group_name,))
-                group_info = cursor.fetchone()
+@profiled
+def delete_search_all_selection(result_tree, status_label=None):
+    """
+    Delete the rows selected in the Search All results (ctrl/shift click to select several).
 
-                if group_info:
-                    # Check if there are any events that the group is/has performed at and if so, cannot delete 
-                    check_performance_query = "SELECT * FROM PerformanceList WHERE group_name = %s"
-                    cursor.execute(check_performance_query, (group_name,))
-                    performance_info = cursor.fetchone()
+    Args:
+        result_tree (ttk.Treeview): The Search All Treeview.
+        status_label (Label): Optional label showing the progress.
 
-                    if performance_info:
-                        # Retrieve events associated with the group_name in PerformanceList
-                        events_query = "SELECT DISTINCT event_name FROM PerformanceList WHERE group_name = %s"
-                        cursor.execute(events_query, (group_name,))
-                        events_info = cursor.fetchall()
+    Returns:
+        None
+    """
+    pager = search_all_state['pager']
+    selection = result_tree.selection()
+    if pager is None or not selection:
+        MessageBox.showinfo("Delete Status", "Select the rows to delete first.")
+        return
 
-                        event_names = ', '.join(event[0] for event in events_info)
+    table_name = pager.table_name
+    positions = [pager.columns.index(column) for column in DELETE_KEYS[table_name]]
+    items = {}
+    for item in selection:
+        values = result_tree.item(item, 'values')
+        # Treeview hands values back as strings
+        key = tuple(int(values[i]) if column == 'id' else values[i] for i, column in zip(positions, DELETE_KEYS[table_name]))
+        items[key] = item
 
-                        MessageBox.showinfo("Delete Status", f"Cannot delete group with name {group_name} because it has entries in the 'PerformanceList' table.\nYou must delete the following associated events first: {event_names}")
-                        cursor.close()
-                        conn.close()
-                        return False            
-                    
-                    # Display group information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                    f"Do you want to delete the following group?\n\n{group_info}\n\nWILL DELETE ALL ASSOCIATED Memberships ENTRIES")
+    def remove_rows(deleted):
+        for key in deleted:
+            if key in items and result_tree.exists(items[key]):
+                result_tree.delete(items[key])
 
-                    if confirmation:
-                        # Execute the delete query
-                        delete_memberships_query = "DELETE FROM Memberships WHERE group_name = %s"
-                        cursor.execute(delete_memberships_query, (group_name,))
-                        
-                        delete_query = "DELETE FROM Groups WHERE group_name = %s"
-                        cursor.execute(delete_query, (group_name,))
-                        conn.commit()
+    bulk_delete_entries(table_name, list(items), status_label, on_deleted=remove_rows)
 
-                        MessageBox.showinfo("Delete Status", "Group deleted successfully.")
 
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        print('post destroy')
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Group with name {group_name} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        
-        success = delete_group(group_name, labels, delete_button)
-
-        if success:
-            delete_button.destroy()
-            return
-        else:
-            return
-
-    def delete_individual_performer_and_destroy(stage_name, labels, delete_button):
+@profiled
+def delete_pick_table(event):
+      
+    def delete_row(table, keys, description, not_found_message, blocked_message, labels, delete_button, on_deleted=None):
         """
-        Wrapper function for delete_individual_performer, destroying the delete button afterward.
+        Delete one row with its dependency report, a confirmation and a single DELETE (see deletes.py).
 
         Args:
-            stage_name (str): The stage name for the individual performer to be deleted.
+            table (str): Table to delete from.
+            keys (tuple): Values of the table's key columns.
+            description (str): What the row is, for the confirmation (ex. 'user').
+            not_found_message (str): Shown when no row has these keys.
+            blocked_message (function): Called with the names of the blocking rows, returns the message
+                                        shown when a RESTRICT rule prevents the delete.
             labels (list): List of labels to be destroyed at the end of the function.
             delete_button (Button): The delete button widget to be destroyed.
+            on_deleted (function): Called after the commit (dashboard and index invalidation).
 
         Returns:
-            None
+            True or False (depending on whether deletion was successful)
         """
-        
-        def delete_individual_performer(stage_name, labels, delete_button):
-            """
-            Delete an individual performer from the 'IndividualPerformers' table based on the stage name.
-
-            Args:
-                stage_name (str): The stage name for the individual performer to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
-
-            Returns:
-                True or False (depending on whether deletion was successful)
-            """
-            try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
+        conn = None
+        try:
+            # One query returns the row and the counts of everything depending on it
+            conn = get_connection()
+            cursor = conn.cursor()
+            preview = load_delete_preview(cursor, table, keys)
 
-                check_individual_performer_query = "SELECT * FROM IndividualPerformers WHERE stage_name = %s"
-                cursor.execute(check_individual_performer_query, (stage_name,))
-                individual_performer_info = cursor.fetchone()
+            if preview is None:
+                MessageBox.showinfo("Delete Status", not_found_message)
+                return False
 
-                if individual_performer_info:
-                    # Display individual performer information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                        f"Do you want to delete the following individual performer?\n\n{individual_performer_info}\n\nWILL DELETE ALL ASSOCIATED Memberships ENTRIES")
+            if preview.blocked_by:
+                names = ', '.join(dependent.names for dependent in preview.blocked_by)
+                MessageBox.showinfo("Delete Status", blocked_message(names))
+                return False
 
-                    if confirmation:
-                        # Execute the delete query
-                        # Before deleting, also delete related entries in Memberships
-                        delete_memberships_query = "DELETE FROM Memberships WHERE stage_name = %s"
-                        cursor.execute(delete_memberships_query, (stage_name,))
+            message = f"Do you want to delete the following {description}?\n\n{preview.row}"
+            if preview.cascades_to:
+                message += f"\n\nWILL ALSO DELETE THESE ASSOCIATED ENTRIES:\n{describe_dependents(preview.cascades_to)}"
+            if not MessageBox.askyesno("Delete Confirmation", message):
+                return False
 
-                        delete_query = "DELETE FROM IndividualPerformers WHERE stage_name = %s"
-                        cursor.execute(delete_query, (stage_name,))
-                        conn.commit()
+            # The foreign keys cascade to the dependents, one DELETE removes everything
+            delete_previewed(cursor, preview)
+            conn.commit()
+            cursor.close()
+            reference_keys.removed(table, keys[0])
+            if on_deleted is not None:
+                on_deleted()
 
-                        MessageBox.showinfo("Delete Status", "Individual performer deleted successfully.")
+            MessageBox.showinfo("Delete Status", f"{description[0].upper()}{description[1:]} deleted successfully.")
 
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Individual performer with stage name {stage_name} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        success = delete_individual_performer(stage_name, labels, delete_button)
-        if success:
+            # Destroy old widgets
+            for label in labels:
+                label.destroy()
             delete_button.destroy()
-            return
-        else:
-            return
+            return True
+        except DeleteBlocked as e:
+            MessageBox.showinfo("Delete Status", str(e))
+            return False
+        except Exception as e:
+            print(f"Error: {e}")
+            MessageBox.showerror("Error", f"Error: {e}")
+            return False
+        finally:
+            if conn is not None:
+                conn.close()
 
-    def delete_membership_and_destroy(stage_name, group_name, labels, delete_button):
+    @profiled
+    def delete_user_and_destroy(user_id, labels, delete_button):
         """
-        Wrapper function for delete_membership, destroying the delete button afterward.
+        Delete a user from the 'Users' table based on the user ID. Users with tickets cannot be deleted.
 
         Args:
-            stage_name (str): The stage name for the membership to be deleted.
-            group_name (str): The group name for the membership to be deleted.
+            user_id (int): The user ID for the user to be deleted.
             labels (list): List of labels to be destroyed at the end of the function.
             delete_button (Button): The delete button widget to be destroyed.
 
         Returns:
             None
         """
-        
-        def delete_membership(stage_name, group_name, labels, delete_button):
-            """
-            Delete a membership from the 'Memberships' table based on the stage name and group name.
+        delete_row('Users', (user_id,), "user", f"User with ID {user_id} not found.",
+                   lambda names: f"Cannot delete user with ID {user_id} because they have entries in the 'Tickets' table.\n"
+                                 f"You must delete all tickets associated with the user prior to deletion (events: {names})",
+                   labels, delete_button, on_deleted=lambda: invalidate_dashboard('Users'))
 
-            Args:
-                stage_name (str): The stage name for the membership to be deleted.
-                group_name (str): The group name for the membership to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
+    @profiled
+    def delete_event_and_destroy(event_name, labels, delete_button):
+        """
+        Delete an event from the 'Events' table based on the event name.
+        Its PerformanceList and Tickets entries are deleted with it (ON DELETE CASCADE).
 
-            Returns:
-                True or False (depending on whether deletion was successful)
-            """
-            try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
+        Args:
+            event_name (str): The event name for the event to be deleted.
+            labels (list): List of labels to be destroyed at the end of the function.
+            delete_button (Button): The delete button widget to be destroyed.
 
-                check_membership_query = "SELECT * FROM Memberships WHERE stage_name = %s AND group_name = %s"
-                cursor.execute(check_membership_query, (stage_name, group_name))
-                membership_info = cursor.fetchone()
+        Returns:
+            None
+        """
+        def deleted():
+            invalidate_dashboard('Tickets', 'Events')
+            tickets_changed(event_name)
 
-                if membership_info:
-                    # Display membership information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                        f"Do you want to delete the following membership?\n\n{membership_info}")
+        delete_row('Events', (event_name,), "event", f"Event with name {event_name} not found.",
+                   None, labels, delete_button, on_deleted=deleted)
 
-                    if confirmation:
-                        # Execute the delete query
-                        delete_query = "DELETE FROM Memberships WHERE stage_name = %s AND group_name = %s"
-                        cursor.execute(delete_query, (stage_name, group_name))
-                        conn.commit()
+    @profiled
+    def delete_group_and_destroy(group_name, labels, delete_button):
+        """
+        Delete a group from the 'Groups' table based on the group name.
+        Its Memberships entries are deleted with it; groups in the PerformanceList cannot be deleted.
 
-                        MessageBox.showinfo("Delete Status", "Membership deleted successfully.")
+        Args:
+            group_name (str): The group name for the group to be deleted.
+            labels (list): List of labels to be destroyed at the end of the function.
+            delete_button (Button): The delete button widget to be destroyed.
 
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Membership with stage name {stage_name} and group name {group_name} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        success = delete_membership(stage_name, group_name, labels, delete_button)
-        if success:
-            delete_button.destroy()
-            return
-        else:
-            return
+        Returns:
+            None
+        """
+        delete_row('Groups', (group_name,), "group", f"Group with name {group_name} not found.",
+                   lambda names: f"Cannot delete group with name {group_name} because it has entries in the 'PerformanceList' table.\n"
+                                 f"You must delete the following associated events first: {names}",
+                   labels, delete_button)
 
-    def delete_performance_and_destroy(event_name, group_name, labels, delete_button):
+    @profiled
+    def delete_individual_performer_and_destroy(stage_name, labels, delete_button):
         """
-        Wrapper function for delete_performance, destroying the delete button afterward.
+        Delete an individual performer from the 'IndividualPerformers' table based on the stage name.
+        Their Memberships entries are deleted with them.
 
         Args:
-            event_name (str): The event name for the performance to be deleted.
-            group_name (str): The group name for the performance to be deleted.
+            stage_name (str): The stage name for the individual performer to be deleted.
             labels (list): List of labels to be destroyed at the end of the function.
             delete_button (Button): The delete button widget to be destroyed.
 
         Returns:
             None
         """
-        
-        def delete_performance(event_name, group_name, labels, delete_button):
-            """
-            Delete a performance from the 'PerformanceList' table based on event name and group name.
-
-            Args:
-                event_name (str): The event name for the performance to be deleted.
-                group_name (str): The group name for the performance to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
+        delete_row('IndividualPerformers', (stage_name,), "individual performer",
+                   f"Individual performer with stage name {stage_name} not found.", None, labels, delete_button)
 
-            Returns:
-                True or False (depending on whether deletion was successful)
-            """
-            try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
+    @profiled
+    def delete_membership_and_destroy(stage_name, group_name, labels, delete_button):
+        """
+        Delete a membership from the 'Memberships' table based on the stage name and group name.
 
-                check_performance_query = "SELECT * FROM PerformanceList WHERE event_name = %s AND group_name = %s"
-                cursor.execute(check_performance_query, (event_name, group_name))
-                performance_info = cursor.fetchone()
+        Args:
+            stage_name (str): The stage name for the membership to be deleted.
+            group_name (str): The group name for the membership to be deleted.
+            labels (list): List of labels to be destroyed at the end of the function.
+            delete_button (Button): The delete button widget to be destroyed.
 
-                if performance_info:
-                    # Display performance information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                    f"Do you want to delete the following performance?\n\n{performance_info}")
+        Returns:
+            None
+        """
+        delete_row('Memberships', (stage_name, group_name), "membership",
+                   f"Membership with stage name {stage_name} and group name {group_name} not found.",
+                   None, labels, delete_button)
 
-                    if confirmation:
-                        # Execute the delete query
-                        delete_query = "DELETE FROM PerformanceList WHERE event_name = %s AND group_name = %s"
-                        cursor.execute(delete_query, (event_name, group_name))
-                        conn.commit()
+    @profiled
+    def delete_performance_and_destroy(event_name, group_name, labels, delete_button):
+        """
+        Delete a performance from the 'PerformanceList' table based on event name and group name.
 
-                        MessageBox.showinfo("Delete Status", "Performance deleted successfully.")
+        Args:
+            event_name (str): The event name for the performance to be deleted.
+            group_name (str): The group name for the performance to be deleted.
+            labels (list): List of labels to be destroyed at the end of the function.
+            delete_button (Button): The delete button widget to be destroyed.
 
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Performance with event name '{event_name}' and group name '{group_name}' not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        success = delete_performance(event_name, group_name, labels, delete_button)
-        if success:
-            delete_button.destroy()
-            return
-        else:
-            return
+        Returns:
+            None
+        """
+        delete_row('PerformanceList', (event_name, group_name), "performance",
+                   f"Performance with event name '{event_name}' and group name '{group_name}' not found.",
+                   None, labels, delete_button)
 
+    @profiled
     def delete_ticket_and_destroy(ticket_id, event_name, labels, delete_button):
         """
-        Wrapper function for delete_ticket, destroying the delete button afterward.
+        Delete a ticket from the 'Tickets' table based on the ticket ID and event name.
 
         Args:
             ticket_id (int): The ticket ID for the ticket to be deleted.
@@ -1506,71 +1641,18 @@ def delete_pick_table(event):
         Returns:
             None
         """
-        
-        def delete_ticket(ticket_id, event_name, labels, delete_button):
-            """
-            Delete a ticket from the 'Tickets' table based on the ticket ID and event name.
+        def deleted():
+            invalidate_dashboard('Tickets')
+            tickets_changed(event_name)
 
-            Args:
-                ticket_id (int): The ticket ID for the ticket to be deleted.
-                event_name (str): The event name for the ticket to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
-
-            Returns:
-                None
-            """
-            try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
-
-                check_ticket_query = "SELECT * FROM Tickets WHERE id = %s AND event_name = %s"
-                cursor.execute(check_ticket_query, (ticket_id, event_name))
-                ticket_info = cursor.fetchone()
-
-                if ticket_info:
-                    # Display ticket information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                    f"Do you want to delete the following ticket?\n\n{ticket_info}")
-
-                    if confirmation:
-                        # Execute the delete query
-                        delete_query = "DELETE FROM Tickets WHERE id = %s AND event_name = %s"
-                        cursor.execute(delete_query, (ticket_id, event_name))
-                        conn.commit()
-
-                        MessageBox.showinfo("Delete Status", "Ticket deleted successfully.")
-
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Ticket with ID {ticket_id} and event name {event_name} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        
-        success = delete_ticket(ticket_id, event_name, labels, delete_button)
-        if success:
-            delete_button.destroy()
-            return
-        else:
-            return
+        delete_row('Tickets', (ticket_id, event_name), "ticket",
+                   f"Ticket with ID {ticket_id} and event name {event_name} not found.",
+                   None, labels, delete_button, on_deleted=deleted)
 
+    @profiled
     def delete_venue_and_destroy(venue_name, labels, delete_button):
         """
-        Wrapper function for delete_venue, destroying the delete button afterward.
+        Delete a venue from the 'Venue' table based on the venue name. Venues with events cannot be deleted.
 
         Args:
             venue_name (str): The venue name for the venue to be deleted.
@@ -1580,79 +1662,10 @@ def delete_pick_table(event):
         Returns:
             None
         """
-        
-        def delete_venue(venue_name, labels, delete_button):
-            """
-            Delete a venue from the 'Venue' table based on the venue name.
-
-            Args:
-                venue_name (str): The venue name for the venue to be deleted.
-                labels (list): List of labels to be destroyed at the end of the function.
-                delete_button (Button): The delete button widget to be destroyed.
-
-            Returns:
-                True or False (depending on whether deletion was successful)
-            """
-            try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-                cursor = conn.cursor()
-
-                check_venue_query = "SELECT * FROM Venue WHERE venue_name = %s"
-                cursor.execute(check_venue_query, (venue_name,))
-                venue_info = cursor.fetchone()
-
-                if venue_info:
-                    # Check if there are associated events
-                    check_events_query = "SELECT * FROM Events WHERE venue_name = %s"
-                    cursor.execute(check_events_query, (venue_name,))
-                    events_info = cursor.fetchone()
-
-                    if events_info:
-                        # Display associated events information
-                        events_str = "\n".join([f"{event}" for event in events_info])
-                        MessageBox.showinfo("Associated Events",
-                                            f"The venue {venue_name} is associated with the following events:\n\n{events_str}\n\nYou must delete these events prior to venue deletion.")
-                        cursor.close()
-                        conn.close()
-                        return False
-                    
-                    # Display venue information for confirmation
-                    confirmation = MessageBox.askyesno("Delete Confirmation",
-                                                        f"Do you want to delete the following venue?\n\n{venue_info}")
-
-                    if confirmation:
-                        # Execute the delete query
-                        delete_query = "DELETE FROM Venue WHERE venue_name = %s"
-                        cursor.execute(delete_query, (venue_name,))
-                        conn.commit()
-
-                        MessageBox.showinfo("Delete Status", "Venue deleted successfully.")
-
-                        # Destroy old widgets
-                        for label in labels:
-                            label.destroy()
-                        delete_button.destroy()
-                        cursor.close()
-                        conn.close()
-                        return True
-                else:
-                    MessageBox.showinfo("Delete Status", f"Venue with name {venue_name} not found.")
-                    cursor.close()
-                    conn.close()
-                    return False
-            except Exception as e:
-                print(f"Error: {e}")
-                MessageBox.showerror("Error", f"Error: {e}")
-                cursor.close()
-                conn.close()
-                return False
-        
-        success = delete_venue(venue_name, labels, delete_button)
-        if success:
-            delete_button.destroy()
-            return
-        else:
-            return
+        delete_row('Venue', (venue_name,), "venue", f"Venue with name {venue_name} not found.",
+                   lambda names: f"The venue {venue_name} is associated with the following events:\n\n{names}\n\n"
+                                 f"You must delete these events prior to venue deletion.",
+                   labels, delete_button)
     
     
     
@@ -1669,7 +1682,7 @@ def delete_pick_table(event):
         primary_key_label = Label(tab3, text=f'Enter User ID for deletion:', font=('bold', 10))
         primary_key_label.place(x=20, y=90)
 
-        primary_key_entry = Entry(tab3)
+        primary_key_entry = KeyCombobox(tab3, 'Users')
         primary_key_entry.place(x=250, y=90)
         
         destroy_labels = [primary_key_entry, primary_key_label]
@@ -1682,7 +1695,7 @@ def delete_pick_table(event):
         event_name_label = Label(tab3, text=f'Enter Event Name for deletion:', font=('bold', 10))
         event_name_label.place(x=20, y=90)
 
-        event_name_entry = Entry(tab3)
+        event_name_entry = KeyCombobox(tab3, 'Events')
         event_name_entry.place(x=250, y=90)
 
         destroy_labels = [event_name_entry, event_name_label]
@@ -1695,7 +1708,7 @@ def delete_pick_table(event):
         group_name_label = Label(tab3, text=f'Enter Group Name for deletion:', font=('bold', 10))
         group_name_label.place(x=20, y=90)
 
-        group_name_entry = Entry(tab3)
+        group_name_entry = KeyCombobox(tab3, 'Groups')
         group_name_entry.place(x=250, y=90)
 
         destroy_labels = [group_name_entry, group_name_label]
@@ -1708,7 +1721,7 @@ def delete_pick_table(event):
         stage_name_label = Label(tab3, text=f'Enter Stage Name for deletion:', font=('bold', 10))
         stage_name_label.place(x=20, y=90)
 
-        stage_name_entry = Entry(tab3)
+        stage_name_entry = KeyCombobox(tab3, 'IndividualPerformers')
         stage_name_entry.place(x=250, y=90)
 
         destroy_labels = [stage_name_entry, stage_name_label]
@@ -1721,13 +1734,13 @@ def delete_pick_table(event):
         stage_name_label = Label(tab3, text='Enter Stage Name for deletion:', font=('bold', 10))
         stage_name_label.place(x=20, y=90)
 
-        stage_name_entry = Entry(tab3)
+        stage_name_entry = KeyCombobox(tab3, 'IndividualPerformers')
         stage_name_entry.place(x=250, y=90)
 
         group_name_label = Label(tab3, text='Enter Group Name for deletion:', font=('bold', 10))
         group_name_label.place(x=20, y=120)
 
-        group_name_entry = Entry(tab3)
+        group_name_entry = KeyCombobox(tab3, 'Groups')
         group_name_entry.place(x=250, y=120)
 
         destroy_labels = [stage_name_entry, stage_name_label, group_name_entry, group_name_label]
@@ -1743,10 +1756,10 @@ def delete_pick_table(event):
         group_name_label = Label(tab3, text=f'Enter Group Name for deletion:', font=('bold', 10))
         group_name_label.place(x=20, y=120)
 
-        event_name_entry = Entry(tab3)
+        event_name_entry = KeyCombobox(tab3, 'Events')
         event_name_entry.place(x=250, y=90)
 
-        group_name_entry = Entry(tab3)
+        group_name_entry = KeyCombobox(tab3, 'Groups')
         group_name_entry.place(x=250, y=120)
 
         destroy_labels = [event_name_entry, event_name_label, group_name_entry, group_name_label]
@@ -1765,7 +1778,7 @@ def delete_pick_table(event):
         event_name_label = Label(tab3, text=f'Enter Event Name for deletion:', font=('bold', 10))
         event_name_label.place(x=20, y=120)
 
-        event_name_entry = Entry(tab3)
+        event_name_entry = KeyCombobox(tab3, 'Events')
         event_name_entry.place(x=250, y=120)
 
         destroy_labels = [ticket_id_entry, ticket_id_label, event_name_entry, event_name_label]
@@ -1778,7 +1791,7 @@ def delete_pick_table(event):
         venue_name_label = Label(tab3, text=f'Enter Venue Name for deletion:', font=('bold', 10))
         venue_name_label.place(x=20, y=90)
 
-        venue_name_entry = Entry(tab3)
+        venue_name_entry = KeyCombobox(tab3, 'Venue')
         venue_name_entry.place(x=250, y=90)
 
         destroy_labels = [venue_name_entry, venue_name_label]
@@ -1787,22 +1800,34 @@ def delete_pick_table(event):
                                command=lambda: delete_venue_and_destroy(venue_name_entry.get(), destroy_labels, delete_button))
         delete_button.place(x=20, y=150)
 
+    # Many entries at once: pasted keys, one impact check, one confirmation, one transaction
+    if selected_table in DELETE_KEYS:
+        bulk_delete_button = Button(tab3, text="Bulk Delete...", font=("italic", 10), bg="white",
+                                    command=lambda: show_bulk_delete_dialog(selected_table))
+        bulk_delete_button.place(x=20, y=230)
+
+@profiled
 def update_pick_table(event):
     
     # Helper function for updating individual performer records
     # Provides a wrapper that handles both the database update and UI cleanup
+    @profiled
     def update_individual_performer_and_destroy(stage_name, individual_name, age, labels, update_button):
         # Inner function that handles the actual database update operation
         def update_individual_performer(stage_name, individual_name, age):
+            # A record the reference key cache knows is missing is reported without a round trip
+            problem = first_known_problem([('IndividualPerformers', stage_name, True, f"Individual performer with stage name {stage_name} not found.")])
+            if problem:
+                MessageBox.showinfo("Update Status", problem)
+                return False
+
             try:
                 # Establish database connection
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+                conn = get_connection()
                 cursor = conn.cursor()
 
                 # Check if the individual performer with the specified stage name exists
-                check_individual_query = "SELECT * FROM IndividualPerformers WHERE stage_name = %s"
-                cursor.execute(check_individual_query, (stage_name,))
-                performer_info = cursor.fetchone()
+                performer_info = load_entry(cursor, 'IndividualPerformers', (stage_name,))
 
                 if performer_info:
                     # Request confirmation from the user before updating
@@ -1825,8 +1850,7 @@ def update_pick_table(event):
                             return False
 
                         # Execute the update query
-                        update_query = "UPDATE IndividualPerformers SET individual_name = %s, age = %s WHERE stage_name = %s"
-                        cursor.execute(update_query, (individual_name, age, stage_name))
+                        update_entry(cursor, 'IndividualPerformers', (stage_name,), (individual_name, age))
                         conn.commit()
 
                         MessageBox.showinfo("Update Status", "Individual performer updated successfully.")
@@ -1857,6 +1881,7 @@ def update_pick_table(event):
 
     # Helper function for updating user records
     # Provides a wrapper that handles both the database update and UI cleanup
+    @profiled
     def update_user_and_destroy(user_id, user_name, phone_number, date_of_birth, labels, update_button):
         """
         Wrapper function for update_user_info, destroying the update button afterward.
@@ -1886,15 +1911,19 @@ def update_pick_table(event):
             Returns:
                 None
             """
+            # A record the reference key cache knows is missing is reported without a round trip
+            problem = first_known_problem([('Users', user_id, True, f"User with ID {user_id} not found.")])
+            if problem:
+                MessageBox.showinfo("Update Status", problem)
+                return False
+
             try:
                 # Establish database connection
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+                conn = get_connection()
                 cursor = conn.cursor()
 
                 # Check if the user with the specified ID exists
-                check_user_query = "SELECT * FROM Users WHERE id = %s"
-                cursor.execute(check_user_query, (user_id,))
-                user_info = cursor.fetchone()
+                user_info = load_entry(cursor, 'Users', (user_id,))
 
                 if user_info:
                     # Get confirmation from user before proceeding with update
@@ -1924,9 +1953,9 @@ def update_pick_table(event):
                             return False
 
                         # Execute the update query
-                        update_query = "UPDATE Users SET user_name = %s, phone_number = %s, date_of_birth = %s WHERE id = %s"
-                        cursor.execute(update_query, (user_name, phone_number, date_of_birth, user_id))
+                        update_entry(cursor, 'Users', (user_id,), (user_name, phone_number, date_of_birth))
                         conn.commit()
+                        invalidate_dashboard('Users')
 
                         # Notify user of success
                         MessageBox.showinfo("Update Status", "User updated successfully.")
@@ -1959,16 +1988,21 @@ def update_pick_table(event):
         else:
             return
 
+    @profiled
     def update_event_and_destroy(event_name, venue_name, event_date, start_time, labels, update_button):
         def update_event(event_name, venue_name, event_date, start_time):
+            # A record the reference key cache knows is missing is reported without a round trip
+            problem = first_known_problem([('Events', event_name, True, f"Event with name {event_name} not found.")])
+            if problem:
+                MessageBox.showinfo("Update Status", problem)
+                return False
+
             try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+                conn = get_connection()
                 cursor = conn.cursor()
 
                 # Check if the event with the specified name exists
-                check_event_query = "SELECT * FROM Events WHERE event_name = %s"
-                cursor.execute(check_event_query, (event_name,))
-                event_info = cursor.fetchone()
+                event_info = load_entry(cursor, 'Events', (event_name,))
 
                 if event_info:
                     confirmation = MessageBox.askyesno("Update Confirmation",
@@ -1988,10 +2022,8 @@ def update_pick_table(event):
                             conn.close()
                             return False
 
-                        # Check if the venue with the specified name exists 
-                        check_venue_query = "SELECT * FROM Venue WHERE venue_name = %s"
-                        cursor.execute(check_venue_query, (venue_name,))
-                        venue_info = cursor.fetchone()
+                        # Check if the venue with the specified name exists (answered by the reference key cache when it can)
+                        venue_info, = keys_exist(cursor, update_lookups('Events', {'venue_name': venue_name}))
 
                         if not venue_info:
                             MessageBox.showerror("Foreign Key Error", f"Venue with name {venue_name} not found.")
@@ -1999,9 +2031,16 @@ def update_pick_table(event):
                             conn.close()
                             return False
 
-                        update_query = "UPDATE Events SET venue_name = %s, event_date = %s, start_time = %s WHERE event_name = %s"
-                        cursor.execute(update_query, (venue_name, event_date, start_time, event_name))
+                        # The tickets already issued have to fit in the new venue
+                        problem = update_entry(cursor, 'Events', (event_name,), (venue_name, event_date, start_time))
+                        if problem:
+                            MessageBox.showerror("Capacity Error", problem)
+                            cursor.close()
+                            conn.close()
+                            return False
                         conn.commit()
+                        # The event may now be in another city
+                        tickets_changed(event_name)
 
                         MessageBox.showinfo("Update Status", "Event updated successfully.")
 
@@ -2029,15 +2068,20 @@ def update_pick_table(event):
             update_button.destroy()
         return success
 
+    @profiled
     def update_group_and_destroy(group_name, founded, labels, update_button):
         def update_group(group_name, founded):
+            # A record the reference key cache knows is missing is reported without a round trip
+            problem = first_known_problem([('Groups', group_name, True, f"Group with name {group_name} not found.")])
+            if problem:
+                MessageBox.showinfo("Update Status", problem)
+                return False
+
             try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+                conn = get_connection()
                 cursor = conn.cursor()
 
-                check_group_query = "SELECT * FROM Groups WHERE group_name = %s"
-                cursor.execute(check_group_query, (group_name,))
-                group_info = cursor.fetchone()
+                group_info = load_entry(cursor, 'Groups', (group_name,))
 
                 if group_info:
                     confirmation = MessageBox.askyesno("Update Confirmation",
@@ -2058,8 +2102,7 @@ def update_pick_table(event):
                             conn.close()
                             return False
 
-                        update_query = "UPDATE Groups SET founded = %s WHERE group_name = %s"
-                        cursor.execute(update_query, (founded, group_name))
+                        update_entry(cursor, 'Groups', (group_name,), (founded,))
                         conn.commit()
 
                         MessageBox.showinfo("Update Status", "Group updated successfully.")
@@ -2088,16 +2131,15 @@ def update_pick_table(event):
             update_button.destroy()
         return success
 
+    @profiled
     def update_ticket_and_destroy(ticket_id, event_name, purchased_by, price, labels, update_button):
         def update_ticket(ticket_id, event_name, purchased_by, price):
             try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+                conn = get_connection()
                 cursor = conn.cursor()
 
                 # Check if the ticket with the specified ID and event name exists
-                check_ticket_query = "SELECT * FROM Tickets WHERE id = %s AND event_name = %s"
-                cursor.execute(check_ticket_query, (ticket_id, event_name))
-                ticket_info = cursor.fetchone()
+                ticket_info = load_entry(cursor, 'Tickets', (ticket_id, event_name))
 
                 if ticket_info:
                     # Display ticket information for confirmation
@@ -2105,13 +2147,15 @@ def update_pick_table(event):
                                                         f"Do you want to update the following ticket?\n{ticket_info}")
 
                     if confirmation:
+                        # 'NULL' (or 'N/A' like the insert form) marks the ticket as not purchased
+                        if purchased_by.strip().upper() in ('', 'NULL', 'N/A'):
+                            purchased_by = None
+
                         # Validate purchased_by (check if the user with the specified ID exists)
                         if purchased_by is not None:
-                            check_user_query = "SELECT * FROM Users WHERE id = %s"
-                            cursor.execute(check_user_query, (purchased_by,))
-                            user_info = cursor.fetchone()
+                            user_info, = keys_exist(cursor, update_lookups('Tickets', {'purchased_by': purchased_by}))
                             
-                            if not user_info and purchased_by != 'NULL':
+                            if not user_info:
                                 MessageBox.showerror("Validation Error", f"User with ID {purchased_by} not found.")
                                 cursor.close()
                                 conn.close()
@@ -2128,9 +2172,15 @@ def update_pick_table(event):
                             conn.close()
                             return False
 
-                        update_query = "UPDATE Tickets SET event_name = %s, purchased_by = %s, price = %s WHERE id = %s AND event_name = %s"
-                        cursor.execute(update_query, (event_name, purchased_by, price, ticket_id, event_name))
+                        # Also moves the ticket's contribution in the dashboard summary tables and the event's sold count
+                        if not update_ticket_entry(cursor, ticket_info, purchased_by, price):
+                            MessageBox.showinfo("Update Status", f"Ticket {ticket_id} was changed by someone else since it was shown. Please try again.")
+                            cursor.close()
+                            conn.close()
+                            return False
                         conn.commit()
+                        invalidate_dashboard('Tickets')
+                        tickets_changed(event_name)
 
                         MessageBox.showinfo("Update Status", "Ticket updated successfully.")
 
@@ -2158,15 +2208,20 @@ def update_pick_table(event):
             update_button.destroy()
         return success
 
+    @profiled
     def update_venue_and_destroy(venue_name, city, capacity, labels, update_button):
         def update_venue_info(venue_name, city, capacity):
+            # A record the reference key cache knows is missing is reported without a round trip
+            problem = first_known_problem([('Venue', venue_name, True, f"Venue with name {venue_name} not found.")])
+            if problem:
+                MessageBox.showinfo("Update Status", problem)
+                return False
+
             try:
-                conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
+                conn = get_connection()
                 cursor = conn.cursor()
 
-                check_venue_query = "SELECT * FROM Venue WHERE venue_name = %s"
-                cursor.execute(check_venue_query, (venue_name,))
-                venue_info = cursor.fetchone()
+                venue_info = load_entry(cursor, 'Venue', (venue_name,))
 
                 if venue_info:
                     confirmation = MessageBox.askyesno("Update Confirmation",
@@ -2189,9 +2244,16 @@ def update_pick_table(event):
                             conn.close()
                             return False
 
-                        update_query = "UPDATE Venue SET city = %s, capacity = %s WHERE venue_name = %s"
-                        cursor.execute(update_query, (city, capacity, venue_name))
+                        # Every event at the venue has to keep fitting its issued tickets
+                        problem = update_entry(cursor, 'Venue', (venue_name,), (city, capacity))
+                        if problem:
+                            MessageBox.showerror("Capacity Error", problem)
+                            cursor.close()
+                            conn.close()
+                            return False
                         conn.commit()
+                        # Every event at the venue may have moved city
+                        tickets_changed()
 
                         MessageBox.showinfo("Update Status", "Venue updated successfully.")
 
@@ -2237,7 +2299,7 @@ def update_pick_table(event):
         stage_name_label = Label(tab4, text='Enter Stage Name for update:', font=('bold', 10))
         stage_name_label.place(x=20, y=90)
 
-        stage_name_entry = Entry(tab4)
+        stage_name_entry = KeyCombobox(tab4, 'IndividualPerformers')
         stage_name_entry.place(x=250, y=90)
 
         individual_name_label = Label(tab4, text='Enter New Individual Name:', font=('bold', 10))
@@ -2271,7 +2333,7 @@ def update_pick_table(event):
         venue_name_label = Label(tab4, text='Enter User Id for update:', font=('bold', 10))
         venue_name_label.place(x=20, y=90)
 
-        venue_name_entry = Entry(tab4)
+        venue_name_entry = KeyCombobox(tab4, 'Users')
         venue_name_entry.place(x=250, y=90)
 
         user_name_label = Label(tab4, text='Enter New User Name:', font=('bold', 10))
@@ -2311,13 +2373,13 @@ def update_pick_table(event):
         event_name_label = Label(tab4, text='Enter Event Name for update:', font=('bold', 10))
         event_name_label.place(x=20, y=90)
 
-        event_name_entry = Entry(tab4)
+        event_name_entry = KeyCombobox(tab4, 'Events')
         event_name_entry.place(x=250, y=90)
 
         venue_name_label = Label(tab4, text='Enter New Venue Name:', font=('bold', 10))
         venue_name_label.place(x=20, y=120)
 
-        venue_name_entry = Entry(tab4)
+        venue_name_entry = KeyCombobox(tab4, 'Venue')
         venue_name_entry.place(x=250, y=120)
 
         event_date_label = Label(tab4, text='Enter New Event Date (YYYY-MM-DD):', font=('bold', 10))
@@ -2349,7 +2411,7 @@ def update_pick_table(event):
         group_name_label = Label(tab4, text='Enter Group Name for update:', font=('bold', 10))
         group_name_label.place(x=20, y=90)
 
-        group_name_entry = Entry(tab4)
+        group_name_entry = KeyCombobox(tab4, 'Groups')
         group_name_entry.place(x=300, y=90)
 
         founded_label = Label(tab4, text='Enter New Founded Date (YYYY-MM-DD):', font=('bold', 10))
@@ -2377,13 +2439,13 @@ def update_pick_table(event):
         event_name_label = Label(tab4, text='Enter Event Name for update:', font=('bold', 10))
         event_name_label.place(x=20, y=120)
 
-        event_name_entry = Entry(tab4)
+        event_name_entry = KeyCombobox(tab4, 'Events')
         event_name_entry.place(x=300, y=120)
 
         purchased_by_label = Label(tab4, text='Enter New Purchased By (User ID):', font=('bold', 10))
         purchased_by_label.place(x=20, y=150)
 
-        purchased_by_entry = Entry(tab4)
+        purchased_by_entry = KeyCombobox(tab4, 'Users')
         purchased_by_entry.place(x=300, y=150)
 
         price_label = Label(tab4, text='Enter New Price:', font=('bold', 10))
@@ -2408,7 +2470,7 @@ def update_pick_table(event):
         venue_name_label = Label(tab4, text='Enter Venue Name for update:', font=('bold', 10))
         venue_name_label.place(x=20, y=90)
 
-        venue_name_entry = Entry(tab4)
+        venue_name_entry = KeyCombobox(tab4, 'Venue')
         venue_name_entry.place(x=300, y=90)
 
         city_label = Label(tab4, text='Enter New City:', font=('bold', 10))
@@ -2434,8 +2496,19 @@ def update_pick_table(event):
         update_button.place(x=20, y=210)
 
 
-def search_tickets():
+def read_ticket_search_filters(min_price_entry, max_price_entry, purchased_by_var, city_listbox):
+    """
+    Read and validate the Search Tickets filter widgets.
 
+    Args:
+        min_price_entry (Entry): Minimum price entry.
+        max_price_entry (Entry): Maximum price entry.
+        purchased_by_var (IntVar): 'Not Purchased' checkbox variable.
+        city_listbox (Listbox): Multi-select list of cities.
+
+    Returns:
+        tuple: (min_price, max_price, not_purchased, cities), or None if an entry is invalid.
+    """
     min_price = min_price_entry.get() or 0  # Auto fill min price when empty on generating entry box
     max_price = max_price_entry.get()
     purchased_by_null = purchased_by_var.get()
@@ -2445,82 +2518,51 @@ def search_tickets():
         min_price = int(min_price)
     except ValueError:
         MessageBox.showerror("Error", "Min price must be a valid integer.")
-        return
+        return None
 
     if max_price:
         try:
             max_price = int(max_price)
         except ValueError:
             MessageBox.showerror("Error", "Max price must be a valid integer.")
-            return
+            return None
 
+    return min_price, max_price, purchased_by_null, selected_cities
 
 
-    # Construct the SQL query based on the selected filters
-    search_query = "SELECT id, event_name, purchased_by, price FROM Tickets JOIN Events USING (event_name) JOIN Venue USING (venue_name) WHERE "
-    
-    # Add conditions based on user input
-    conditions = []
-    values = []
-
-    if min_price:
-        conditions.append("price >= %s")
-        values.append(float(min_price))
+def run_ticket_search(filters, tree, status_label=None):
+    """
+    Stream the tickets matching the filters into a Treeview, from the in-memory ticket index
+    when it is enabled, otherwise from the database.
 
-    if max_price:
-        conditions.append("price <= %s")
-        values.append(float(max_price))
+    Args:
+        filters (tuple): (min_price, max_price, not_purchased, cities) from read_ticket_search_filters.
+        tree (ttk.Treeview): The Treeview to fill.
+        status_label (Label): Optional label showing how many rows have loaded.
 
-    if purchased_by_null:
-        conditions.append("purchased_by IS NULL")
+    Returns:
+        None
+    """
+    if ticket_index.enabled:
+        stream_into_tree("search_tickets", tree, None, status_label=status_label,
+                         source=lambda batch_size: ticket_index.search_batches(filters, batch_size))
+        return
 
-    if selected_cities:
-        if len(selected_cities) == 1:
-            input_string = selected_cities[0]
-            conditions.append("event_name IN (SELECT event_name FROM Events WHERE city = %s)")
-            values.append(input_string)
-        else:
-            # creates string to append to command
-            append_string = ''
-            append_string += "event_name IN (SELECT event_name FROM Events WHERE city IN ("
-            for i in range(len(selected_cities)):
-                append_string += '%s'
-                if i < len(selected_cities) - 1:
-                    append_string += ', '
-            append_string += '))'
-            conditions.append(append_string)
-            for city in selected_cities:
-                values.append(city)
-
-    # Combine conditions into the final query
-    if conditions:
-        search_query += " AND ".join(conditions)
-    else:
-        search_query += "1"  # To avoid syntax error if no conditions are specified
-    
-    try:
-        conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-        cursor = conn.cursor()
-        
-        cursor.execute(search_query, values)
-        results = cursor.fetchall()
+    search_query, values = build_ticket_search_query(*filters)
+    stream_into_tree("search_tickets", tree, search_query, values, status_label=status_label)
 
-        # Clear previous results
-        for row in result_tree.get_children():
-            result_tree.delete(row)
 
-        # Display the search results in a table
-        for result in results:
-            result_tree.insert("", "end", values=result)
+@profiled
+def search_tickets():
 
-    except Exception as e:
-        print(f"Error: {e}")
-        MessageBox.showerror("Error", f"Error: {e}")
+    filters = read_ticket_search_filters(min_price_entry, max_price_entry, purchased_by_var, city_listbox)
+    if filters is None:
+        return
 
-    finally:
-        cursor.close()
-        conn.close()
+    # Stream the results into the table off the main thread; clicking Search again cancels the previous search
+    run_ticket_search(filters, result_tree, search_status_label)
 
+@profiled
 def show_ticket_info(treeview):
     selected_item = treeview.selection()
     if selected_item:
@@ -2532,29 +2574,42 @@ def show_ticket_info(treeview):
         ticket_id, event_name, purchased_by, price = values
         
         # Query the database for additional event information using the associated ticket ID
-        try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-            cursor = conn.cursor()
-
-            # Customize this query based on your database schema
-            query = "SELECT e.venue_name, e.event_date, e.start_time FROM Events e JOIN Tickets t USING (event_name) WHERE t.id = %s"
-            
-            cursor.execute(query, (ticket_id,))
-            event_info = cursor.fetchone()
-            if event_info:
+        def show_info(results):
+            if results:
                 # Assuming event_info is a tuple or list containing the event information
-                venue_name, event_date, start_time = event_info
+                venue_name, event_date, start_time = results[0]
                 MessageBox.showinfo("Ticket Information", f"ID: {ticket_id}\nEvent Name: {event_name}\nPurchased By: {purchased_by}\nPrice: {price}\n\nAdditional Event Information:\nVenue: {venue_name}\nDate: {event_date}\nStart Time: {start_time}")
             else:
                 MessageBox.showinfo("Error", "Event information not found.")
 
-        except Exception as e:
-            print(f"Error: {e}")
-            MessageBox.showerror("Error", f"Error: {e}")
+        run_in_background("show_ticket_info", lambda task: fetch_query_results(ticket_info_query, (ticket_id,)), on_success=show_info)
 
-        finally:
-            cursor.close()
-            conn.close()
+
+def load_city_listbox(city_listbox):
+    """
+    Fill the Search Tickets city listbox from a background query, showing a placeholder meanwhile.
+
+    Args:
+        city_listbox (Listbox): The listbox to fill; it is disabled until the cities arrive.
+
+    Returns:
+        None
+    """
+    city_listbox.insert(tk.END, "Loading cities...")
+    city_listbox.config(state=tk.DISABLED)
+
+    def show_cities(rows):
+        city_listbox.config(state=tk.NORMAL)
+        city_listbox.delete(0, tk.END)
+        for row in rows:
+            city_listbox.insert(tk.END, row[0])
+
+    def failed(e):
+        city_listbox.config(state=tk.NORMAL)
+        city_listbox.delete(0, tk.END)
+        show_background_error(e)
+
+    run_in_background("city_list", lambda task: fetch_query_results(city_list_query), on_success=show_cities, on_error=failed)
 
 
 def refresh_tab5(widgets_to_destroy):
@@ -2565,87 +2620,16 @@ def refresh_tab5(widgets_to_destroy):
 
     # Nested function that performs the actual search operation based on user inputs
     # This function is called when the search button is clicked
+    @profiled
     def search_tickets_refresh():
 
         # Get search parameters from input widgets
-        min_price = min_price_entry.get() or 0  # Default to 0 if empty
-        max_price = max_price_entry.get()
-        purchased_by_null = purchased_by_var.get()
-        selected_cities = [city_listbox.get(idx) for idx in city_listbox.curselection()]
-
-        # Construct the SQL query based on the selected filters
-        search_query = "SELECT id, event_name, purchased_by, price FROM Tickets JOIN Events USING (event_name) JOIN Venue USING (venue_name) WHERE "
-        
-        # Add conditions based on user input
-        conditions = []
-        values = []
-
-        # Add price minimum filter if provided
-        if min_price:
-            conditions.append("price >= %s")
-            values.append(float(min_price))
-
-        # Add price maximum filter if provided
-        if max_price:
-            conditions.append("price <= %s")
-            values.append(float(max_price))
-
-        # Add filter for tickets that haven't been purchased yet
-        if purchased_by_null:
-            conditions.append("purchased_by IS NULL")
-
-        # Add city filter if cities are selected
-        if selected_cities:
-            if len(selected_cities) == 1:
-                # Simple case - only one city selected
-                input_string = selected_cities[0]
-                conditions.append("event_name IN (SELECT event_name FROM Events WHERE city = %s)")
-                values.append(input_string)
-            else:
-                # Complex case - multiple cities selected
-                # Build a parameterized IN clause for multiple cities
-                append_string = ''
-                append_string += "event_name IN (SELECT event_name FROM Events WHERE city IN ("
-                for i in range(len(selected_cities)):
-                    append_string += '%s'
-                    if i < len(selected_cities) - 1:
-                        append_string += ', '
-                append_string += '))'
-                conditions.append(append_string)
-                # Add each city as a separate parameter value
-                for city in selected_cities:
-                    values.append(city)
-
-        # Combine conditions into the final query
-        if conditions:
-            search_query += " AND ".join(conditions)
-        else:
-            search_query += "1"  # To avoid syntax error if no conditions are specified
-        
-        try:
-            conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-            cursor = conn.cursor()
-            
-            # Execute the search query with the parameter values
-            cursor.execute(search_query, values)
-            results = cursor.fetchall()
-
-            # Clear previous results
-            for row in result_tree.get_children():
-                result_tree.delete(row)
-
-            # Display the search results in a table
-            for result in results:
-                result_tree.insert("", "end", values=result)
-
-        except Exception as e:
-            print(f"Error: {e}")
-            MessageBox.showerror("Error", f"Error: {e}")
+        filters = read_ticket_search_filters(min_price_entry, max_price_entry, purchased_by_var, city_listbox)
+        if filters is None:
+            return
 
-        finally:
-            # Ensure database connections are properly closed
-            cursor.close()
-            conn.close()
+        # Stream the search results in batches on a worker thread, superseding any search still running
+        run_ticket_search(filters, result_tree, search_status_label)
 
 
     # widget list for destruction on refresh
@@ -2681,27 +2665,9 @@ def refresh_tab5(widgets_to_destroy):
     city_label.pack(pady=10)
     widgets_to_destroy.append(city_label)
 
-    # Create a listbox for cities based on tickets' event's cities
-    try:
-        conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-        cursor = conn.cursor()
-
-        # Get unique cities that have events with tickets
-        cursor.execute("SELECT DISTINCT city FROM Venue JOIN (Tickets JOIN Events USING (event_name)) USING (venue_name)")
-        cities = [row[0] for row in cursor.fetchall()]
-
-    except Exception as e:
-        print(f"Error: {e}")
-        MessageBox.showerror("Error", f"Error: {e}")
-
-    finally:
-        cursor.close()
-        conn.close()
-
-    # Generate cities to be selected from 
+    # Create a listbox for cities based on tickets' event's cities, filled in the background
     city_listbox = tk.Listbox(tab5, selectmode=tk.MULTIPLE, exportselection=0)
-    for city in cities:
-        city_listbox.insert(tk.END, city)
+    load_city_listbox(city_listbox)
     city_listbox.pack(pady=10)
     widgets_to_destroy.append(city_listbox)
 
@@ -2710,6 +2676,22 @@ def refresh_tab5(widgets_to_destroy):
     search_button.pack(pady=10)
     widgets_to_destroy.append(search_button)
 
+    # Stop a long search partway through, keeping the rows already shown
+    stop_search_button = tk.Button(tab5, text="Stop", command=lambda: stop_stream("search_tickets"))
+    stop_search_button.pack()
+    widgets_to_destroy.append(stop_search_button)
+
+    # Stream the current filters' result straight to a file
+    export_search_button = tk.Button(tab5, text="Export...",
+                                     command=lambda: export_ticket_search_results(min_price_entry, max_price_entry, purchased_by_var,
+                                                                                  city_listbox, search_status_label))
+    export_search_button.pack(pady=5)
+    widgets_to_destroy.append(export_search_button)
+
+    search_status_label = tk.Label(tab5, text="")
+    search_status_label.pack()
+    widgets_to_destroy.append(search_status_label)
+
     # Create a Treeview for displaying results in tabular format
     result_tree = ttk.Treeview(tab5, columns=("ID", "Event Name", "Purchased By", "Price"), show="headings", selectmode='browse')
     result_tree.heading("ID", text="ID")
@@ -2729,48 +2711,180 @@ def refresh_tab5(widgets_to_destroy):
     widgets_to_destroy.append(refresh_button)
 
 
-def search_all_entries(table_name, result_tree):
+def ask_export_path(default_name):
+    """
+    Ask where to save an export.
+
+    Returns:
+        str: The chosen path, or '' if the dialog was cancelled.
+    """
+    return filedialog.asksaveasfilename(title="Export", initialfile=default_name, defaultextension=".csv",
+                                        filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet")])
+
+
+def run_export(export, path, status_label=None):
     """
-    Search and display all entries from the specified table.
+    Run an export on the background executor, showing progress in status_label.
 
     Args:
-        table_name (str): The name of the table to search for all entries.
-        result_tree (ttk.Treeview): The Treeview widget to display the results.
+        export (callable): export(path, progress=..., cancelled=...) from export.py.
+        path (str): Output file.
+        status_label (Label): Optional label showing how many rows were written.
 
     Returns:
         None
     """
-    try:
-        conn = mariadb.connect(host=serv, user=usern, password=passw, database=db)
-        cursor = conn.cursor()
+    def show_progress(written):
+        if status_label is not None:
+            status_label.config(text=f"Exporting... {written:,} rows")
+
+    def done(written):
+        if status_label is not None:
+            status_label.config(text='' if written is None else f"Exported {written:,} rows")
+        if written is not None:
+            MessageBox.showinfo("Export", f"Exported {written:,} rows to {path}")
+
+    def failed(error):
+        if status_label is not None:
+            status_label.config(text='')
+        show_background_error(error)
+
+    if status_label is not None:
+        status_label.config(text="Exporting...")
+    run_in_background("export", lambda task: export(path, progress=lambda written: task.post(show_progress, written),
+                                                    cancelled=lambda: task.cancelled),
+                      on_success=done, on_error=failed)
+
+
+@profiled
+def export_ticket_search_results(min_price_entry, max_price_entry, purchased_by_var, city_listbox, status_label=None):
+    """
+    Export the tickets matching the Search Tickets filters to CSV or Parquet.
 
-        # Fetch the column names for the selected table
-        cursor.execute(f"SHOW COLUMNS FROM {table_name}")
-        columns = [column[0] for column in cursor.fetchall()]
+    Returns:
+        None
+    """
+    filters = read_ticket_search_filters(min_price_entry, max_price_entry, purchased_by_var, city_listbox)
+    if filters is None:
+        return
+    path = ask_export_path("tickets.csv")
+    if path:
+        run_export(lambda path, **kwargs: export_ticket_search(filters, path, **kwargs), path, status_label)
 
-        search_all_query = f"SELECT * FROM {table_name}"
-        cursor.execute(search_all_query)
-        results = cursor.fetchall()
 
-        # Clear existing data in the result tree and dynamically create columns
-        result_tree["columns"] = columns
-        for col in columns:
+@profiled
+def export_search_all(table_name, status_label=None):
+    """
+    Export every row of the selected Search All table to CSV or Parquet.
+
+    Returns:
+        None
+    """
+    if table_name not in TABLE_PRIMARY_KEYS:
+        MessageBox.showerror("Error", "Please select a table to export.")
+        return
+    path = ask_export_path(f"{table_name}.csv")
+    if path:
+        run_export(lambda path, **kwargs: export_table(table_name, path, **kwargs), path, status_label)
+
+
+# Pager for the Search All tab, replaced every time a table is searched
+search_all_state = {'pager': None}
+
+
+def show_search_all_page(pager, page, result_tree, status_label=None):
+    """
+    Display one page of a Search All result in the Treeview (main thread only).
+
+    Args:
+        pager (KeysetPager): The pager the page was fetched with.
+        page (Page): The page to display, or None to keep the current page.
+        result_tree (ttk.Treeview): The Treeview widget to display the results.
+        status_label (Label): Optional label showing the page number and row estimate.
+
+    Returns:
+        None
+    """
+    if page is None:
+        return
+    pager.show(page)
+
+    # Rebuild the columns only when the table changed
+    if tuple(result_tree["columns"]) != tuple(pager.columns):
+        result_tree["columns"] = pager.columns
+        for col in pager.columns:
             result_tree.heading(col, text=col)
             result_tree.column(col, anchor="center", width=100)
 
-        for item in result_tree.get_children():
-            result_tree.delete(item)
+    for item in result_tree.get_children():
+        result_tree.delete(item)
 
-        # Populate the result tree with the query results
-        for result in results:
-            result_tree.insert("", "end", values=result)
+    # Populate the result tree with the query results
+    for result in page.rows:
+        result_tree.insert("", "end", values=result)
 
-    except Exception as e:
-        print(f"Error: {e}")
+    if status_label is not None:
+        status_label.config(text=pager.describe())
+
+
+@profiled
+def search_all_entries(table_name, result_tree, page_size=DEFAULT_PAGE_SIZE, status_label=None):
+    """
+    Search and display the first page of entries from the specified table.
+
+    Args:
+        table_name (str): The name of the table to search for all entries.
+        result_tree (ttk.Treeview): The Treeview widget to display the results.
+        page_size (int): Number of rows per page.
+        status_label (Label): Optional label showing the page number and row estimate.
+
+    Returns:
+        None
+    """
+    try:
+        pager = KeysetPager(table_name, int(page_size))
+    except ValueError as e:
         MessageBox.showerror("Error", f"Error: {e}")
+        return
 
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+    search_all_state['pager'] = pager
+    run_in_background("search_all_entries", lambda task: pager.first_page(),
+                      on_success=lambda page: show_search_all_page(pager, page, result_tree, status_label))
+
+
+@profiled
+def search_all_next_page(result_tree, status_label=None):
+    """
+    Display the page after the current Search All page.
+
+    Args:
+        result_tree (ttk.Treeview): The Treeview widget to display the results.
+        status_label (Label): Optional label showing the page number and row estimate.
+
+    Returns:
+        None
+    """
+    pager = search_all_state['pager']
+    if pager is None or pager.current is None or not pager.current.has_next:
+        return
+    run_in_background("search_all_entries", lambda task: pager.next_page(),
+                      on_success=lambda page: show_search_all_page(pager, page, result_tree, status_label))
+
+
+@profiled
+def search_all_previous_page(result_tree, status_label=None):
+    """
+    Display the page before the current Search All page.
+
+    Args:
+        result_tree (ttk.Treeview): The Treeview widget to display the results.
+        status_label (Label): Optional label showing the page number and row estimate.
+
+    Returns:
+        None
+    """
+    pager = search_all_state['pager']
+    if pager is None or pager.current is None or not pager.current.has_previous:
+        return
+    run_in_background("search_all_entries", lambda task: pager.previous_page(),
+                      on_success=lambda page: show_search_all_page(pager, page, result_tree, status_label))
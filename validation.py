@@ -0,0 +1,116 @@
+# validation.py
+# This file contains the input validation rules shared by the Ticket Apprentice forms and importers
+# Functionality includes:
+# - Date format checks for birth and founded dates
+# - Existence and uniqueness checks of an insert resolved together in one query
+# - Answering those checks from the reference key cache when it can
+
+from key_cache import reference_keys, REFERENCE_KEYS
+
+
+# function to check date format to be used throughout
+def is_valid_date_format(date_str):
+    """
+    Check if a given date string is in the format 'YYYY-MM-DD' and has valid components.
+
+    Args:
+        date_str (str): The date string to be validated.
+
+    Returns:
+        bool: True if the date string is in the correct format and has valid components,
+              False otherwise.
+    """ 
+    
+    try:
+        # Check if the date string has the format YYYY-MM-DD
+        year, month, day = map(int, date_str.split('-'))
+
+        # Check if the year is prior to 2023
+        if year >= 2023 or year <= 1800:
+            return False
+
+        # Check if the month is between 1 and 12
+        if not 1 <= month <= 12:
+            return False
+
+        # Check if the day is between 1 and 31
+        if not 1 <= day <= 31:
+            return False
+
+        return True
+    except ValueError:
+        return False
+
+
+def keys_exist_query(lookups):
+    """
+    Build the query of keys_exist: one EXISTS column per lookup.
+
+    Args:
+        lookups (list): (table, columns, values) for every key to check.
+
+    Returns:
+        tuple: (query, values)
+    """
+    checks = []
+    values = []
+    for table, columns, key in lookups:
+        condition = " AND ".join(f"{column} = %s" for column in columns)
+        checks.append(f"EXISTS (SELECT 1 FROM {table} WHERE {condition})")
+        values.extend(key)
+    return f"SELECT {', '.join(checks)}", tuple(values)
+
+
+def cached_keys_exist(lookups):
+    """
+    Answer lookups from the reference key cache (see key_cache.py), without a round trip.
+
+    Args:
+        lookups (list): (table, columns, values) for every key to check.
+
+    Returns:
+        list: True for every key the cache holds, False for input that can never be a key, None for the others.
+    """
+    return [reference_keys.lookup(table, key[0]) if len(columns) == 1 and REFERENCE_KEYS.get(table) == columns[0] else None
+            for table, columns, key in lookups]
+
+
+def keys_exist(cursor, lookups):
+    """
+    Check several keys with at most one round trip. Keys the reference key cache knows are
+    answered from it, the rest with one EXISTS per lookup.
+
+    Args:
+        cursor: Database cursor.
+        lookups (list): (table, columns, values) for every key to check,
+                        ex. ('Memberships', ('stage_name', 'group_name'), (stage_name, group_name)).
+
+    Returns:
+        list: True or False for every lookup, in order.
+    """
+    found = cached_keys_exist(lookups)
+    unknown = [index for index, known in enumerate(found) if known is None]
+    if unknown:
+        cursor.execute(*keys_exist_query([lookups[index] for index in unknown]))
+        for index, exists in zip(unknown, cursor.fetchone()):
+            found[index] = bool(exists)
+    return found
+
+
+def first_known_problem(checks):
+    """
+    The message of the first check the reference key cache already knows fails, so obviously
+    bad input is rejected before a connection is even checked out. The cache only knows that a
+    key exists, or that the input can never be a key; a key it does not hold is left to the server.
+
+    Args:
+        checks (list): (table, value, should_exist, message) tuples.
+
+    Returns:
+        str: The message, or None if the cache knows of no problem.
+    """
+    for table, value, should_exist, message in checks:
+        exists = reference_keys.lookup(table, value)
+        if exists is not None and exists != should_exist:
+            return message
+    return None
@@ -0,0 +1,225 @@
+# writes.py
+# This file contains the insert and update layer of the Ticket Apprentice application
+# Functionality includes:
+# - The existence checks of every Add Entries and Update Entries form, as validation.keys_exist lookups
+# - Inserting a row of any table, starting a new event's inventory counters with it
+# - Selling a ticket: a seat from the inventory counters, the next ID of the event and the dashboard
+#   summary tables in the same transaction as the INSERT
+# - Updating a row of any table, refusing venue and capacity changes its issued tickets do not fit
+#
+# Every function takes the cursor of the caller's connection and never commits or shows a message,
+# so the UI forms and benchmark.py run exactly the same statements.
+
+from aggregates import record_ticket_change
+from inventory import create_event_inventory, record_inventory_change, venue_capacity_problem, event_venue_problem
+from bulk_import import TABLE_SPECS
+from pagination import TABLE_PRIMARY_KEYS
+from ticket_ids import allocate_ticket_id
+
+
+# Existence checks of the insert forms, in the order the forms unpack them:
+# (table looked up, its key columns, the columns of the new row holding the key)
+INSERT_LOOKUPS = {
+    'Users': [('Users', ('id',), ('id',))],
+    'Venue': [('Venue', ('venue_name',), ('venue_name',))],
+    'Events': [('Venue', ('venue_name',), ('venue_name',))],
+    'IndividualPerformers': [('IndividualPerformers', ('stage_name',), ('stage_name',))],
+    'Groups': [('Groups', ('group_name',), ('group_name',))],
+    'Memberships': [('IndividualPerformers', ('stage_name',), ('stage_name',)),
+                    ('Groups', ('group_name',), ('group_name',)),
+                    ('Memberships', ('stage_name', 'group_name'), ('stage_name', 'group_name'))],
+    'PerformanceList': [('PerformanceList', ('event_name', 'group_name'), ('event_name', 'group_name')),
+                        ('Events', ('event_name',), ('event_name',)),
+                        ('Groups', ('group_name',), ('group_name',))],
+    'Tickets': [('Events', ('event_name',), ('event_name',)),
+                ('Users', ('id',), ('purchased_by',))],
+}
+
+# References checked by the update forms once the user confirmed
+UPDATE_LOOKUPS = {
+    'Events': [('Venue', ('venue_name',), ('venue_name',))],
+    'Tickets': [('Users', ('id',), ('purchased_by',))],
+}
+
+# Columns the Update Entries forms can change (the key columns stay)
+UPDATE_COLUMNS = {
+    'Users': ('user_name', 'phone_number', 'date_of_birth'),
+    'Venue': ('city', 'capacity'),
+    'Events': ('venue_name', 'event_date', 'start_time'),
+    'Groups': ('founded',),
+    'IndividualPerformers': ('individual_name', 'age'),
+}
+
+
+def _where(keys):
+    return " AND ".join(f"{column} = %s" for column in keys)
+
+
+def _lookups(checks, row):
+    # A reference left empty (ex. a ticket without a buyer) is not looked up
+    lookups = []
+    for table, columns, row_columns in checks:
+        values = tuple(row[column] for column in row_columns)
+        if all(value is not None for value in values):
+            lookups.append((table, columns, values))
+    return lookups
+
+
+def insert_lookups(table, row):
+    """
+    The existence checks an insert form runs before inserting a row.
+
+    Args:
+        table (str): The table the row is inserted into.
+        row (dict): Column name to value of the new row (at least the columns the checks read).
+
+    Returns:
+        list: (table, columns, values) lookups for validation.keys_exist.
+    """
+    return _lookups(INSERT_LOOKUPS[table], row)
+
+
+def update_lookups(table, row):
+    """
+    The existence checks an update form runs before updating a row.
+
+    Args:
+        table (str): The table of the updated row.
+        row (dict): Column name to new value.
+
+    Returns:
+        list: (table, columns, values) lookups for validation.keys_exist, empty if the table has none.
+    """
+    return _lookups(UPDATE_LOOKUPS.get(table, []), row)
+
+
+def insert_entry(cursor, table, values):
+    """
+    Insert one row. A new event also gets its inventory counters, starting at zero.
+    Tickets go through insert_ticket_entry instead, which picks the ID.
+
+    Args:
+        cursor: Cursor of the connection performing the insert.
+        table (str): The table to insert into.
+        values (tuple): The row, in the column order of bulk_import.TABLE_SPECS.
+
+    Returns:
+        None
+    """
+    columns = TABLE_SPECS[table].columns
+    cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                   tuple(values))
+    if table == 'Events':
+        create_event_inventory(cursor, values[0])
+
+
+def insert_ticket_entry(cursor, event_name, purchased_by, price):
+    """
+    Sell (or just issue, without a buyer) one ticket of an event.
+
+    Args:
+        cursor: Cursor of the connection performing the insert.
+        event_name (str): The event of the ticket.
+        purchased_by: ID of the buyer, or None.
+        price (float): Price of the ticket.
+
+    Returns:
+        int: The ID given to the ticket.
+
+    Raises:
+        inventory.CapacityExceeded: The venue has no seat left; no ID was used.
+    """
+    ticket = (event_name, purchased_by, price)
+
+    # Take a seat from the event's counters first: a full venue is refused before an ID is used
+    record_inventory_change(cursor, None, ticket)
+
+    # Take the next ID from the event's sequence (safe with several clients selling at once)
+    new_id = allocate_ticket_id(event_name)
+    cursor.execute("INSERT INTO Tickets (id, event_name, purchased_by, price) VALUES (%s, %s, %s, %s)",
+                   (new_id, event_name, purchased_by, price))
+
+    # Keep the dashboard summary tables in the same transaction as the ticket
+    record_ticket_change(cursor, None, ticket)
+    return new_id
+
+
+def load_entry(cursor, table, keys):
+    """
+    Read the row an update form shows for confirmation.
+
+    Args:
+        cursor: Cursor of the connection performing the update.
+        table (str): The table of the row.
+        keys (tuple): Primary key values, in the order of pagination.TABLE_PRIMARY_KEYS.
+
+    Returns:
+        tuple: The row, or None if it does not exist.
+    """
+    cursor.execute(f"SELECT * FROM {table} WHERE {_where(TABLE_PRIMARY_KEYS[table])}", tuple(keys))
+    return cursor.fetchone()
+
+
+def update_entry(cursor, table, keys, values):
+    """
+    Update the columns of UPDATE_COLUMNS of one row. A venue's new capacity, or an event's new venue,
+    has to keep fitting the tickets already issued; the counters stay locked until the commit.
+
+    Args:
+        cursor: Cursor of the connection performing the update.
+        table (str): The table of the row (not Tickets, see update_ticket_entry).
+        keys (tuple): Primary key values, in the order of pagination.TABLE_PRIMARY_KEYS.
+        values (tuple): New values, in the order of UPDATE_COLUMNS[table].
+
+    Returns:
+        str: Why the update was refused (nothing was written), or None once the row is updated.
+    """
+    columns = UPDATE_COLUMNS[table]
+    row = dict(zip(columns, values))
+    if table == 'Venue':
+        problem = venue_capacity_problem(cursor, keys[0], row['capacity'])
+    elif table == 'Events':
+        problem = event_venue_problem(cursor, keys[0], row['venue_name'])
+    else:
+        problem = None
+    if problem:
+        return problem
+
+    assignments = ", ".join(f"{column} = %s" for column in columns)
+    cursor.execute(f"UPDATE {table} SET {assignments} WHERE {_where(TABLE_PRIMARY_KEYS[table])}",
+                   tuple(values) + tuple(keys))
+    return None
+
+
+def update_ticket_entry(cursor, ticket_info, purchased_by, price):
+    """
+    Change the buyer and price of a ticket, moving its contribution in the dashboard summary tables
+    and the event's sold count.
+
+    Args:
+        cursor: Cursor of the connection performing the update.
+        ticket_info (tuple): The ticket as shown for confirmation, (id, event_name, purchased_by, price).
+        purchased_by: ID of the new buyer, or None for an unsold ticket.
+        price (float): The new price.
+
+    Returns:
+        bool: True once updated, False if the ticket was changed by someone else since it was shown.
+    """
+    ticket_id, event_name = ticket_info[0], ticket_info[1]
+
+    # Lock the ticket and check the buyer is still the one shown in the confirmation: another seller
+    # may have sold it meanwhile, and the sold counter must not count one sale twice. (The UPDATE's
+    # rowcount cannot tell: the server reports changed rows, so resubmitting the same values gives 0.)
+    cursor.execute("SELECT event_name, purchased_by, price FROM Tickets WHERE id = %s AND event_name = %s FOR UPDATE",
+                   (ticket_id, event_name))
+    old_ticket = cursor.fetchone()
+    if old_ticket is None or old_ticket[1] != ticket_info[2]:
+        return False
+
+    cursor.execute("UPDATE Tickets SET purchased_by = %s, price = %s WHERE id = %s AND event_name = %s",
+                   (purchased_by, price, ticket_id, event_name))
+
+    new_ticket = (event_name, int(purchased_by) if purchased_by is not None else None, price)
+    record_ticket_change(cursor, old_ticket, new_ticket)
+    record_inventory_change(cursor, old_ticket, new_ticket)
+    return True